@@ -0,0 +1,52 @@
+# bench/common.py
+"""Shared helpers for the benchmark scripts - fake desktop setup, quiet output, timing summaries"""
+
+import contextlib
+import io
+import sys
+import time
+from typing import Callable, Dict, List
+
+from core.input_replay import FakeDesktop, parse_monitors
+
+
+def install_desktop(monitors: str = '2560x1440,1920x1080', windows: int = 2) -> FakeDesktop:
+    """Fake desktop in place of the Win32 modules (call before importing the app modules)"""
+    desktop = FakeDesktop(parse_monitors(monitors), windows)
+    desktop.install()
+    return desktop
+
+
+def quiet():
+    """Swallow the app's console output"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def time_calls(fn: Callable[[int], None], count: int) -> List[float]:
+    """Run fn(i) count times; per-call durations in microseconds"""
+    samples = []
+    clock = time.perf_counter_ns
+    for i in range(count):
+        start = clock()
+        fn(i)
+        samples.append((clock() - start) / 1000.0)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p99/max/mean of microsecond samples"""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        'count': count,
+        'p50_us': ordered[count // 2],
+        'p99_us': ordered[min(count - 1, count * 99 // 100)],
+        'max_us': ordered[-1],
+        'mean_us': sum(ordered) / count,
+    }
+
+
+def report(label: str, samples: List[float]) -> None:
+    s = summarize(samples)
+    print(f"{label:<32} n={s['count']:<7} p50 {s['p50_us']:9.1f} us  p99 {s['p99_us']:9.1f} us  "
+          f"max {s['max_us']:9.1f} us", file=sys.stdout)
@@ -0,0 +1,113 @@
+# bench/layout_switch.py
+"""
+Layout switch latency - per-monitor and global switches against the
+precompiled (layout, monitor) table, next to the one-time compile at load,
+then snapshot switches over synthetic tables of growing size.
+
+    python -m bench.layout_switch --monitors 2560x1440,1920x1080,1920x1080 --switches 20000
+    python -m bench.layout_switch --sweep-layouts 3,100,1000 --sweep-monitors 2,8
+"""
+
+import argparse
+import time
+
+from bench.common import install_desktop, quiet, report, summarize, time_calls
+
+
+def synthetic_snapshot(layout_count: int, monitor_count: int):
+    """GeometrySnapshot over layout_count x monitor_count compiled entries (halves on 1920x1080 monitors)"""
+    from core.input_replay import parse_monitors
+    from core.zone_geometry import GeometrySnapshot, build_compiled_zones, build_monitor_index
+
+    monitors = parse_monitors(','.join(['1920x1080'] * monitor_count))
+    layouts = [f"layout{i}" for i in range(layout_count)]
+    compiled = {}
+    for mon in monitors:
+        w, h = mon['work_width'], mon['work_height']
+        zones = {
+            'left': {'x': mon['work_x'], 'y': mon['work_y'], 'width': w // 2, 'height': h},
+            'right': {'x': mon['work_x'] + w // 2, 'y': mon['work_y'], 'width': w - w // 2, 'height': h},
+        }
+        for name in layouts:
+            compiled[(name, mon['id'])] = build_compiled_zones(name, mon, zones)
+    snapshot = GeometrySnapshot(0, monitors, build_monitor_index(monitors), compiled,
+                                layout_order=layouts, active_layout=layouts[0], per_monitor_layouts={})
+    return snapshot, [mon['id'] for mon in monitors], layouts
+
+
+def sweep(layout_counts, monitor_counts, switches: int) -> None:
+    """
+    Per-switch evolve() cost as the table grows - a layout switch must not
+    depend on its size. Each sequence runs twice from the same snapshot:
+    first visits derive the selection's views, revisits reuse them.
+    """
+    print(f"\nGeometrySnapshot.evolve per switch, p50 (us), {switches} switches each")
+    print(f"{'layouts':>8} {'monitors':>9} {'entries':>8}  {'per-monitor first/again':>24}  {'global first/again':>19}")
+    for layout_count in layout_counts:
+        for monitor_count in monitor_counts:
+            snapshot, mon_ids, layouts = synthetic_snapshot(layout_count, monitor_count)
+            state = {}
+
+            def per_monitor(i):
+                current = state['snapshot']
+                selection = dict(current.per_monitor_layouts)
+                selection[mon_ids[i % len(mon_ids)]] = layouts[(i * 7) % len(layouts)]
+                state['snapshot'] = current.evolve(per_monitor_layouts=selection)
+
+            def global_switch(i):
+                state['snapshot'] = state['snapshot'].evolve(active_layout=layouts[(i * 7) % len(layouts)])
+
+            p50 = []
+            for fn in (per_monitor, global_switch):
+                for _ in range(2):
+                    state['snapshot'] = snapshot
+                    p50.append(summarize(time_calls(fn, switches))['p50_us'])
+            print(f"{layout_count:>8} {monitor_count:>9} {layout_count * monitor_count:>8}  "
+                  f"{p50[0]:>14.1f} / {p50[1]:>7.1f}  {p50[2]:>9.1f} / {p50[3]:>7.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', default='config', help="Config directory (hotkeys.yaml, layouts/)")
+    parser.add_argument('--monitors', default='2560x1440,1920x1080,1920x1080', help="Fake monitors, left to right")
+    parser.add_argument('--switches', type=int, default=20000, help="Switches to time per kind")
+    parser.add_argument('--sweep-layouts', default='3,100,1000', help="Synthetic layout counts to sweep")
+    parser.add_argument('--sweep-monitors', default='2,8', help="Synthetic monitor counts to sweep")
+    args = parser.parse_args()
+
+    desktop = install_desktop(args.monitors)
+    from core.zone_manager import ZoneManager
+    from core.input_replay import ReplayConfigManager
+
+    with quiet():
+        zm = ZoneManager(args.config, config_manager=ReplayConfigManager(args.config))
+        layouts = list(zm.layouts)
+        mon_ids = [mon['id'] for mon in desktop.monitors]
+
+        start = time.perf_counter()
+        zm.load_config()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        per_monitor = time_calls(
+            lambda i: zm.switch_layout_for_monitor(mon_ids[i % len(mon_ids)], layouts[i % len(layouts)]),
+            args.switches)
+        global_switch = time_calls(lambda i: zm.switch_layout(layouts[i % len(layouts)]), args.switches)
+        scroll = time_calls(
+            lambda i: zm.switch_layout_for_monitor(
+                mon_ids[0], zm.get_adjacent_layout(zm.get_layout_for_monitor(mon_ids[0]), 1)),
+            args.switches)
+
+    print(f"{len(layouts)} layouts x {len(mon_ids)} monitors, load_config (compile all) {load_ms:.2f} ms")
+    report("switch_layout_for_monitor", per_monitor)
+    report("switch_layout", global_switch)
+    report("scroll step (adjacent layout)", scroll)
+
+    with quiet():
+        layout_counts = [int(n) for n in args.sweep_layouts.split(',')]
+        monitor_counts = [int(n) for n in args.sweep_monitors.split(',')]
+    sweep(layout_counts, monitor_counts, min(args.switches, 5000))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
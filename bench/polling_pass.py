@@ -0,0 +1,65 @@
+# bench/polling_pass.py
+"""
+Cost of one auto-restore polling pass over N snapped windows: the
+vectorized _check_all_snapped() next to checking each window on its own
+(the pass it replaced), on the fake desktop.
+
+    python -m bench.polling_pass --counts 10,100,1000,5000
+"""
+
+import argparse
+
+from bench.common import install_desktop, quiet, summarize, time_calls
+
+
+class NullDispatcher:
+    def submit(self, key, fn, *args):
+        pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', default='10,100,1000,5000', help="Snapped window counts to measure")
+    parser.add_argument('--passes', type=int, default=200, help="Passes to time per count")
+    args = parser.parse_args()
+    counts = [int(c) for c in args.counts.split(',')]
+
+    desktop = install_desktop('1920x1080', windows=max(counts))
+    from core import window_state_tracker
+    from core.window_state_tracker import WindowStateTracker
+    window_state_tracker.get_dispatcher = lambda: NullDispatcher()
+    original = dict(desktop.rects)
+
+    print(f"{'windows':>8} {'per-window p50':>16} {'vectorized p50':>16} {'speedup':>8}  (drifted windows, under threshold)")
+    for count in counts:
+        tracker = WindowStateTracker()
+        hwnds = desktop.app_windows[:count]
+        for hwnd in hwnds:
+            desktop.rects[hwnd] = original[hwnd]
+        with quiet():
+            for hwnd in hwnds:
+                tracker.mark_as_snapped(hwnd)
+
+        def per_window(_):
+            for hwnd in tracker.snapped_windows.keys():
+                tracker._check_snapped_window(hwnd, check_drag=True)
+
+        def vectorized(_):
+            tracker._check_all_snapped()
+
+        rows = []
+        for drift in (0, 3):
+            for hwnd in hwnds:
+                x, y, w, h = tracker.snapped_windows[hwnd]
+                desktop.rects[hwnd] = (x + drift, y, w, h)
+            old = summarize(time_calls(per_window, args.passes))['p50_us']
+            new = summarize(time_calls(vectorized, args.passes))['p50_us']
+            rows.append((old, new))
+        (old, new), (old_drift, new_drift) = rows
+        print(f"{count:>8} {old:>13.1f} us {new:>13.1f} us {old / new:>7.1f}x"
+              f"  ({old_drift:.1f} -> {new_drift:.1f} us, {old_drift / new_drift:.1f}x)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+# bench/snap_bindings.py
+"""
+Drag snap-key cost per frame - the compiled binding table against a
+per-zone walk that re-parses every key string, by zone count.
+
+    python -m bench.snap_bindings --zones 8,32,128,512 --checks 5000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+from bench.common import install_desktop, quiet, summarize, time_calls
+
+ZONE_KEYS = 'QWERTYUIOPASDFGHJKLZXCVBNM'
+
+
+def write_grid_config(config_dir: str, dest: str, side: int) -> None:
+    """Config dir whose only layout is a side x side grid, each zone bound to a letter"""
+    os.makedirs(os.path.join(dest, 'layouts'))
+    shutil.copy(os.path.join(config_dir, 'hotkeys.yaml'), dest)
+    step = 100 / side
+    lines = ['name: "grid"', 'zones:']
+    for i in range(side * side):
+        row, col = divmod(i, side)
+        lines += [
+            f'  - name: "z{i}"',
+            f'    x_percent: {col * step}',
+            f'    y_percent: {row * step}',
+            f'    width_percent: {step}',
+            f'    height_percent: {step}',
+            f'    key: "{ZONE_KEYS[i % len(ZONE_KEYS)]}"',
+        ]
+    with open(os.path.join(dest, 'layouts', 'grid.yaml'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def timed(fn, count):
+    """time_calls after an untimed warm-up, so the first zone count is not paying for cold caches"""
+    time_calls(fn, min(count, 500))
+    return time_calls(fn, count)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', default='config', help="Config directory (hotkeys.yaml is reused)")
+    parser.add_argument('--monitors', default='1920x1080,1920x1080', help="Fake monitors, left to right")
+    parser.add_argument('--zones', default='8,32,128,512', help="Total zone counts (square grid per monitor)")
+    parser.add_argument('--checks', type=int, default=5000, help="Checks to time per kind")
+    args = parser.parse_args()
+
+    desktop = install_desktop(args.monitors)
+    from core.drag_listener import DragZoneListener
+    from core.input_events import MOVE, InputEvent, SimulatedInputSource
+    from core.input_replay import InlineDispatcher, ReplayConfigManager, ReplayOverlay
+    from core.keycodes import parse_key_to_vk
+    from core.zone_manager import ZoneManager
+
+    monitors = len(desktop.monitors)
+    bound_vk, _ = parse_key_to_vk(ZONE_KEYS[0])
+    unbound_vk = 0x7B  # F12
+    print(f"{monitors} monitors, per-check p50 (us); frame = one MOVE tick with the overlay up")
+    print(f"{'zones':>6} {'per-zone walk':>14} {'probe all':>10} {'event VK':>9} {'unbound VK':>11} "
+          f"{'drag frame':>11} {'compile':>9}")
+
+    for total in (int(z) for z in args.zones.split(',')):
+        side = max(1, round((total / monitors) ** 0.5))
+        work = tempfile.mkdtemp(prefix='snap_bindings_')
+        try:
+            config_dir = os.path.join(work, 'config')
+            write_grid_config(args.config, config_dir, side)
+            with quiet():
+                zm = ZoneManager(config_dir, config_manager=ReplayConfigManager(config_dir))
+                zm.dispatcher = InlineDispatcher()
+                drag = DragZoneListener(zm, ReplayOverlay(), zm.config_manager, input_source=SimulatedInputSource())
+                geometry = zm.geometry
+                zones = sum(len(z) for z in geometry.monitors.values())
+
+                def walk(i):
+                    # What every check did before the table: parse and probe each zone's key
+                    for mon_id, zone_map in geometry.monitors.items():
+                        for zone_name, zone_data in zone_map.items():
+                            drag.input.is_zone_key_pressed(zone_data['key'])
+
+                def compile_once(i):
+                    drag._bindings_geometry = None
+                    drag._get_bindings(geometry)
+
+                def in_tick(fn):
+                    def run(i):
+                        drag.input.begin_tick()
+                        try:
+                            fn()
+                        finally:
+                            drag.input.end_tick()
+                    return run
+
+                walked = timed(in_tick(lambda: walk(0)), args.checks)
+                compiled = timed(compile_once, max(1, args.checks // 10))
+                probe_all = timed(in_tick(drag._check_for_snap_input), args.checks)
+                event_vk = timed(in_tick(lambda: drag._check_for_snap_input(bound_vk)), args.checks)
+                unbound = timed(in_tick(lambda: drag._check_for_snap_input(unbound_vk)), args.checks)
+
+                drag.overlay_shown = True
+                frame = timed(
+                    lambda i: drag._run_tick(InputEvent(MOVE, (i * 37) % 3840, (i * 53) % 1080)), args.checks)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+        p50 = [summarize(s)['p50_us'] for s in (walked, probe_all, event_vk, unbound, frame, compiled)]
+        print(f"{zones:>6} {p50[0]:>14.1f} {p50[1]:>10.1f} {p50[2]:>9.2f} {p50[3]:>11.2f} "
+              f"{p50[4]:>11.2f} {p50[5]:>9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
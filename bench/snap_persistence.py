@@ -0,0 +1,79 @@
+# bench/snap_persistence.py
+"""
+Snap latency with saved-state persistence off, write-behind (as shipped)
+and write-through (flush after every save), on the fake desktop.
+
+    python -m bench.snap_persistence --snaps 2000
+"""
+
+import argparse
+import os
+import tempfile
+
+from bench.common import install_desktop, quiet, report, time_calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--config', default='config', help="Config directory (hotkeys.yaml, layouts/)")
+    parser.add_argument('--snaps', type=int, default=2000, help="Snaps to time per mode")
+    parser.add_argument('--windows', type=int, default=8, help="Fake app windows per monitor")
+    args = parser.parse_args()
+
+    desktop = install_desktop(windows=args.windows)
+    from core.input_replay import InlineDispatcher, ReplayConfigManager
+    from core.state_persistence import WindowStatePersistence
+    from core.zone_manager import ZoneManager
+
+    with quiet():
+        zm = ZoneManager(args.config, config_manager=ReplayConfigManager(args.config))
+    zm.dispatcher = InlineDispatcher()
+    tracker = zm.state_tracker
+    windows = desktop.app_windows
+    targets = [(mon_id, zone_name) for mon_id, zones in zm.monitors.items() for zone_name in zones]
+
+    def snap(i):
+        hwnd = windows[i % len(windows)]
+        mon_id, zone_name = targets[i % len(targets)]
+        zm.move_window_to_zone(mon_id, zone_name, hwnd=hwnd)
+        if write_through:
+            tracker.persistence.flush()
+
+    def reset():
+        # Every timed snap is a first snap, so it saves (and persists) a state
+        for hwnd in windows:
+            tracker.forget_snapped(hwnd)
+            tracker._drop_state(hwnd)
+        if tracker.persistence is not None:
+            tracker.persistence.flush()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, persist, write_through in (("persistence off", False, False),
+                                              ("write-behind (shipped)", True, False),
+                                              ("write-through (flush per save)", True, True)):
+            if persist:
+                tracker.persistence = WindowStatePersistence(
+                    os.path.join(tmp, f"{len(results)}.db"), flush_interval=1.0,
+                    identify=lambda hwnd: (4242, 'ReplayWindow', 'C:\\Apps\\replay.exe'))
+                tracker.persistence.open(lambda hwnd, state: None)
+            else:
+                tracker.persistence = None
+
+            samples = []
+            with quiet():
+                for batch in range(0, args.snaps, len(windows)):
+                    reset()
+                    samples += time_calls(lambda i: snap(batch + i), min(len(windows), args.snaps - batch))
+                if tracker.persistence is not None:
+                    tracker.persistence.close()
+            results.append((label, samples))
+
+    print(f"{args.snaps} snaps, {len(windows)} windows, {len(targets)} zones")
+    for label, samples in results:
+        report(label, samples)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
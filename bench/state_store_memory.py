@@ -0,0 +1,97 @@
+# bench/state_store_memory.py
+"""
+Per-window memory of the state stores at many tracked windows, next to
+the plain dict-of-dicts layout they replaced, plus sweep cost.
+
+    python -m bench.state_store_memory --windows 10000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from core.window_state_store import SavedWindowState, WindowStateStore
+
+HWND_BASE = 0x10000
+
+
+def measure(build) -> int:
+    """Bytes still allocated by build() (its return value is kept alive while measuring)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return after - before
+
+
+def legacy_states(count: int):
+    # The pre-store layout: hwnd -> {'x', 'y', 'width', 'height', 'timestamp'}
+    now = time.time()
+    return {HWND_BASE + 4 * i: {'x': i, 'y': i + 1, 'width': 800 + i, 'height': 600 + i, 'timestamp': now}
+            for i in range(count)}
+
+
+def bare_states(count: int):
+    # Just the value records, to split a store's size into values and its own overhead
+    now = time.time()
+    return [SavedWindowState(i, i + 1, 800 + i, 600 + i, now) for i in range(count)]
+
+
+def store_states(count: int):
+    store = WindowStateStore('window state', max_size=count, ttl=86400)
+    now = time.time()
+    for i in range(count):
+        store[HWND_BASE + 4 * i] = SavedWindowState(i, i + 1, 800 + i, 600 + i, now)
+    return store
+
+
+def store_snapped(count: int):
+    store = WindowStateStore('snapped window', max_size=count)
+    for i in range(count):
+        store[HWND_BASE + 4 * i] = (i, i + 1, 800 + i, 600 + i)
+    return store
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--windows', type=int, default=10000, help="Tracked windows")
+    args = parser.parse_args()
+    count = args.windows
+
+    legacy = measure(lambda: legacy_states(count))
+    bare = measure(lambda: bare_states(count))
+    states = measure(lambda: store_states(count))
+    snapped = measure(lambda: store_snapped(count))
+    print(f"{count} windows")
+    print(f"  saved states, dict of dicts (old)   {legacy / count:7.1f} B/window  {legacy / 1e6:6.2f} MB")
+    print(f"  saved states, WindowStateStore      {states / count:7.1f} B/window  {states / 1e6:6.2f} MB"
+          f"  (store overhead {(states - bare) / count:.1f} B beyond the records)")
+    print(f"  snapped rects, WindowStateStore     {snapped / count:7.1f} B/window  {snapped / 1e6:6.2f} MB")
+
+    store = store_states(count)
+    store.is_alive = lambda hwnd: True
+    start = time.perf_counter()
+    store.sweep()
+    sweep_ms = (time.perf_counter() - start) * 1000
+    print(f"  sweep (nothing expired, {count} liveness checks) {sweep_ms:.2f} ms")
+
+    hwnds = [HWND_BASE + 4 * ((i * 7919) % count) for i in range(count)]
+    start = time.perf_counter()
+    for hwnd in hwnds:
+        store[hwnd]
+    get_us = (time.perf_counter() - start) / count * 1e6
+    print(f"  read (moves the entry to the LRU back) {get_us:.2f} us/read")
+
+    overflow = store_states(count)
+    start = time.perf_counter()
+    for i in range(count):
+        overflow[HWND_BASE + 4 * (count + i)] = SavedWindowState(0, 0, 1, 1, 0.0)
+    evict_us = (time.perf_counter() - start) / count * 1e6
+    print(f"  insert with LRU eviction at the cap {evict_us:.2f} us/insert ({overflow.evictions} evicted)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
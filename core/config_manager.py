@@ -31,7 +31,11 @@ class ConfigManager:
             'cycle_next_hotkey': 'ctrl+alt+]',
             'cycle_prev_hotkey': 'ctrl+alt+[',
             'cycle_all_next_hotkey': 'ctrl+alt+shift+]',
-            'cycle_all_prev_hotkey': 'ctrl+alt+shift+['
+            'cycle_all_prev_hotkey': 'ctrl+alt+shift+[',
+            'zone_windows_next_hotkey': 'ctrl+alt+.',
+            'zone_windows_prev_hotkey': 'ctrl+alt+,',
+            'undo_hotkey': 'ctrl+alt+z',
+            'redo_hotkey': 'ctrl+alt+y'
         },
         'drag_behavior': {
             'show_zones_key': 'shift',  # shift, ctrl, or alt
@@ -39,13 +43,33 @@ class ConfigManager:
             'scroll_cooldown_seconds': 0.30,
             'number_snap_cooldown_seconds': 0.5,
             'zone_hover_margin_pixels': 6,
-            'ignore_fullscreen_zone': True
+            'ignore_fullscreen_zone': True,
+            'ignored_window_classes': [
+                "Progman", "WorkerW", "Shell_TrayWnd", "Shell_SecondaryTrayWnd",
+                "Windows.UI.Core.CoreWindow", "ApplicationFrameWindow",
+                "Windows.UI.Input.InputSite.WindowClass", "SysListView32",
+                "ToolbarWindow32", "ReBarWindow32", "MSTaskSwWClass",
+                "TaskListThumbnailWnd", "Button",
+            ]
         },
         'state_tracking': {
             'auto_restore_enabled': True,
+            'monitoring_mode': 'events',  # events (WinEvent hooks) or polling
             'movement_threshold_pixels': 10,
             'monitoring_interval_seconds': 0.1,
-            'operation_exempt_delay_seconds': 2.0
+            'max_monitoring_interval_seconds': 2.0,
+            'operation_exempt_delay_seconds': 2.0,
+            'max_tracked_windows': 1024,
+            'state_ttl_seconds': 86400,
+            'sweep_interval_seconds': 30.0,
+            'persist_window_states': True,
+            'state_db_file': 'window_states.db',  # relative to the config folder
+            'persist_flush_interval_seconds': 1.0,
+            'history_depth': 16
+        },
+        'diagnostics': {
+            'latency_tracing': False,  # per-stage input-to-snap timings (tray: Show Latency Stats)
+            'input_trace_file': ''  # record input to this file (relative to the config folder); empty = off
         }
     }
     
@@ -58,7 +82,7 @@ class ConfigManager:
     def load_all(self) -> None:
         """Load all configuration files"""
         self._load_hotkeys()
-        self._load_layouts()
+        self.load_layouts()
         
     def _load_hotkeys(self) -> None:
         """Load hotkey configuration"""
@@ -66,8 +90,8 @@ class ConfigManager:
         with open(hotkeys_path, 'r') as f:
             self.hotkeys_config = yaml.safe_load(f) or {}
             
-    def _load_layouts(self) -> None:
-        """Load all layout configurations"""
+    def load_layouts(self) -> None:
+        """Load all layout configurations (layouts/*.yaml only - hotkeys.yaml is not needed)"""
         layouts_dir = os.path.join(self.config_dir, 'layouts')
         self.layouts.clear()
         
@@ -111,7 +135,11 @@ class ConfigManager:
             'cycle_next': self.hotkeys_config.get('cycle_next_hotkey', defaults['cycle_next_hotkey']),
             'cycle_prev': self.hotkeys_config.get('cycle_prev_hotkey', defaults['cycle_prev_hotkey']),
             'cycle_all_next': self.hotkeys_config.get('cycle_all_next_hotkey', defaults['cycle_all_next_hotkey']),
-            'cycle_all_prev': self.hotkeys_config.get('cycle_all_prev_hotkey', defaults['cycle_all_prev_hotkey'])
+            'cycle_all_prev': self.hotkeys_config.get('cycle_all_prev_hotkey', defaults['cycle_all_prev_hotkey']),
+            'zone_windows_next': self.hotkeys_config.get('zone_windows_next_hotkey', defaults['zone_windows_next_hotkey']),
+            'zone_windows_prev': self.hotkeys_config.get('zone_windows_prev_hotkey', defaults['zone_windows_prev_hotkey']),
+            'undo': self.hotkeys_config.get('undo_hotkey', defaults['undo_hotkey']),
+            'redo': self.hotkeys_config.get('redo_hotkey', defaults['redo_hotkey'])
         }
     
     def get_drag_config(self) -> Dict[str, Any]:
@@ -131,7 +159,9 @@ class ConfigManager:
             'hover_margin': drag_cfg.get('zone_hover_margin_pixels', 
                 defaults['zone_hover_margin_pixels']),
             'ignore_fullscreen': drag_cfg.get('ignore_fullscreen_zone', 
-                defaults['ignore_fullscreen_zone'])
+                defaults['ignore_fullscreen_zone']),
+            'ignored_classes': drag_cfg.get('ignored_window_classes',
+                defaults['ignored_window_classes'])
         }
     
     def get_state_tracking_config(self) -> Dict[str, Any]:
@@ -141,9 +171,30 @@ class ConfigManager:
         
         return {
             'enabled': state_cfg.get('auto_restore_enabled', defaults['auto_restore_enabled']),
+            'mode': state_cfg.get('monitoring_mode', defaults['monitoring_mode']),
             'threshold': state_cfg.get('movement_threshold_pixels', defaults['movement_threshold_pixels']),
             'interval': state_cfg.get('monitoring_interval_seconds', defaults['monitoring_interval_seconds']),
-            'exempt_delay': state_cfg.get('operation_exempt_delay_seconds', defaults['operation_exempt_delay_seconds'])
+            'max_interval': state_cfg.get('max_monitoring_interval_seconds', defaults['max_monitoring_interval_seconds']),
+            'exempt_delay': state_cfg.get('operation_exempt_delay_seconds', defaults['operation_exempt_delay_seconds']),
+            'max_windows': state_cfg.get('max_tracked_windows', defaults['max_tracked_windows']),
+            'ttl': state_cfg.get('state_ttl_seconds', defaults['state_ttl_seconds']),
+            'sweep_interval': state_cfg.get('sweep_interval_seconds', defaults['sweep_interval_seconds']),
+            'persist': state_cfg.get('persist_window_states', defaults['persist_window_states']),
+            'db_path': os.path.join(self.config_dir, state_cfg.get('state_db_file', defaults['state_db_file'])),
+            'flush_interval': state_cfg.get('persist_flush_interval_seconds', defaults['persist_flush_interval_seconds']),
+            'history_depth': max(2, state_cfg.get('history_depth', defaults['history_depth']))  # undo needs 2 slots
+        }
+        
+    def get_diagnostics_config(self) -> Dict[str, Any]:
+        """Get diagnostics configuration"""
+        defaults = self.DEFAULTS['diagnostics']
+        diag_cfg = self.hotkeys_config.get('diagnostics', {})
+        
+        trace_file = diag_cfg.get('input_trace_file', defaults['input_trace_file'])
+        
+        return {
+            'latency': diag_cfg.get('latency_tracing', defaults['latency_tracing']),
+            'input_trace': os.path.join(self.config_dir, trace_file) if trace_file else None
         }
         
     def get_monitor_keys(self) -> dict:
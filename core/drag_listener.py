@@ -1,81 +1,156 @@
 # core/drag_listener.py (Refactored - no hardcoded values)
+import queue
 import threading
 import time
 import win32gui
 import win32con
-from pynput import mouse
 from typing import Optional, Tuple
 
 from .overlay_win32 import (
-    get_hwnd_under_cursor,
+    window_from_point,
     get_cursor_pos,
     snap_hwnd_outer_to_zone_with_workarea,
 )
 from .input_handler import InputHandler
+from .input_bindings import SnapBindings, compile_snap_bindings
+from .drag_targets import DragTargetClassifier
+from .input_events import (
+    BUTTON_DOWN, BUTTON_UP, MOVE, SCROLL, KEY_DOWN, KEY_UP,
+    InputEvent, InputEventSource, PynputInputSource,
+)
+from .input_trace import InputTraceRecorder
 from .zone_numbering import ZoneNumbering
+from .window_state_store import WindowStateStore
+from .latency import latency
+from .scheduling import get_scheduler
+from .window_ops import window_move_transaction
+
+_STOP = object()  # queue sentinel
+
+# Time Windows gets to end the move loop after a number snap releases the button
+DRAG_SETTLE_DELAY = 0.03
 
 
 class DragZoneListener:
-    """Handles drag-to-snap behavior with configurable inputs"""
+    """
+    Handles drag-to-snap behavior with configurable inputs.
+
+    Drag handling is a state machine fed by input events (button down/up,
+    move, key down/up, scroll). The input source only queues events; one
+    worker thread consumes them, so nothing runs while the user is idle and
+    hover updates follow the mouse instead of a polling tick. Key and
+    button state comes from the same events, snapshotted once per event.
+    """
     
-    def __init__(self, zone_manager, overlay, config_manager):
+    def __init__(self, zone_manager, overlay, config_manager,
+                 input_source: Optional[InputEventSource] = None):
+        """
+        Args:
+            input_source: Where input events come from (default: pynput hooks)
+        """
         self.zone_manager = zone_manager
         self.overlay = overlay
         self.config = config_manager
         
         # Input handling (no hardcoded keys)
         self.input = InputHandler(config_manager)
+        self.input_source = input_source or PynputInputSource()
         
         # Zone numbering system
         self.numbering = ZoneNumbering(zone_manager)
         
+        # Snap keys compiled per geometry snapshot (layout switch / config reload)
+        self._bindings: Optional[SnapBindings] = None
+        self._bindings_geometry = None
+        
         # Thread control
         self.running = False
         self.drag_thread = None
-        self.mouse_listener = None
+        self._events: "queue.Queue" = queue.Queue()
+        
+        # Raw input recorder (diagnostics.input_trace_file), open while running
+        self.recorder: Optional[InputTraceRecorder] = None
         
         # Timing/cooldown (from config)
         drag_cfg = self.config.get_drag_config()
+        self.scroll_enabled = drag_cfg['scroll_enabled']
         self.scroll_cooldown = drag_cfg['scroll_cooldown']
         self.number_snap_cooldown = drag_cfg['number_snap_cooldown']
-        self.hover_margin = drag_cfg['hover_margin']
-        self.ignore_fullscreen = drag_cfg['ignore_fullscreen']
+        
+        # Drag target filter (class set compiled once from config)
+        self.targets = DragTargetClassifier(drag_cfg['ignored_classes'])
         
         self.last_scroll_time = 0.0
         self.last_number_snap_time = 0.0
         
-        # State tracking
+        # Delayed actions (the post-release settle before a number snap moves the window)
+        self.scheduler = get_scheduler()
+        
+        # State tracking (owned by the event thread)
+        self.left_down = False
+        self.show_key_down = False
+        self.drag_active_hwnd = None
         self.overlay_shown = False
         self.overlay_toggled = False
         self.dragged_hwnd = None
         self.current_zone: Optional[Tuple[int, str]] = None
         self.number_snap_occurred = False
+        
+        # Last seen position per candidate window (for movement detection).
+        # Only the few most recent windows matter; older entries are evicted.
+        self._last_positions = WindowStateStore('drag position', max_size=64, ttl=60.0)
     
-    def start(self) -> None:
-        """Start the drag listener"""
+    def start(self, worker: bool = True) -> None:
+        """Start the drag listener
+        
+        Args:
+            worker: Handle events on a worker thread. False leaves queued
+                events for process_pending() (deterministic replay).
+        """
+        if self.running:
+            return
         self.running = True
         
-        # Start monitoring thread
-        self.drag_thread = threading.Thread(target=self._monitor_drag, daemon=True)
-        self.drag_thread.start()
+        # Start the event thread, then the source feeding it
+        if worker:
+            self.drag_thread = threading.Thread(target=self._process_events, daemon=True)
+            self.drag_thread.start()
+        
+        # Window events keep the drag target cache fresh
+        self.targets.attach(getattr(self.zone_manager, 'window_events', None))
+        
+        # Record raw input ahead of any filtering, if configured
+        trace_path = self.config.get_diagnostics_config()['input_trace']
+        if trace_path:
+            recorder = InputTraceRecorder(trace_path)
+            if recorder.open():
+                self.recorder = recorder
+                self.input_source.subscribe(recorder.record)
+        
+        self.input_source.subscribe(self._enqueue)
+        if not self.input_source.start():
+            print("[DRAG] Input events unavailable - drag-to-snap disabled")
+            return
         
-        # Start mouse listener for scroll and right-click
-        drag_cfg = self.config.get_drag_config()
-        if drag_cfg['scroll_enabled']:
-            self.mouse_listener = mouse.Listener(
-                on_scroll=self._on_scroll,
-                on_click=self._on_click
-            )
-            self.mouse_listener.start()
+        if self.scroll_enabled:
             print("Drag zone listener started (with scroll support)")
         else:
             print("Drag zone listener started (scroll disabled)")
     
     def stop(self) -> None:
         """Stop the drag listener"""
+        if not self.running:
+            return
         self.running = False
-        if self.mouse_listener:
-            self.mouse_listener.stop()
+        self.input_source.unsubscribe(self._enqueue)
+        if self.recorder is not None:
+            self.input_source.unsubscribe(self.recorder.record)
+        self.input_source.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.targets.detach()
+        self._events.put(_STOP)
     
     def _assign_zone_numbers(self) -> None:
         """Refresh zone numbering and update overlay"""
@@ -92,12 +167,224 @@ class DragZoneListener:
             num = self.numbering.get_number(mon_id, zone_name)
             print(f"[ZONE] {label} -> Monitor {mon_id}, Zone {zone_name} (#{num})")
     
+    # ===== Event intake =====
+    
+    def _enqueue(self, event: InputEvent) -> None:
+        """Input source callback (hook thread) - just queue the event"""
+        # Moves only matter while the overlay tracks the hover zone
+        if event.kind == MOVE and not self.overlay_shown:
+            return
+        # Keys and releases while the overlay is up may snap - time them from here
+        if latency.enabled and self.overlay_shown and event.kind in (KEY_DOWN, BUTTON_UP):
+            event.trace = latency.start('number_snap' if event.kind == KEY_DOWN else 'release_snap')
+        self._events.put(event)
+    
+    def _process_events(self) -> None:
+        """Event thread: blocks until input arrives, then runs the state machine"""
+        pending = None
+        while True:
+            event = pending if pending is not None else self._events.get()
+            if event is _STOP:
+                return
+            event, pending = self._coalesce_moves(event)
+            self._run_tick(event)
+    
+    def process_pending(self) -> int:
+        """Handle every queued event on the caller's thread, without blocking. Returns how many ran."""
+        processed = 0
+        pending = None
+        while True:
+            if pending is None:
+                try:
+                    pending = self._events.get_nowait()
+                except queue.Empty:
+                    return processed
+            if pending is _STOP:
+                return processed
+            event, pending = self._coalesce_moves(pending)
+            self._run_tick(event)
+            processed += 1
+    
+    def _coalesce_moves(self, event: InputEvent):
+        """Skip moves queued behind a move - only the newest position matters.
+        Returns (event to handle, next event already taken off the queue or None)."""
+        if event.kind != MOVE:
+            return event, None
+        while True:
+            try:
+                nxt = self._events.get_nowait()
+            except queue.Empty:
+                return event, None
+            if nxt is _STOP or nxt.kind != MOVE:
+                return event, nxt
+            event = nxt
+    
+    def _run_tick(self, event: InputEvent) -> None:
+        """Run the state machine for one event"""
+        # One key-state snapshot per event: every query in this tick agrees
+        self.input.keyboard.apply(event)
+        self.input.begin_tick()
+        try:
+            self._handle_event(event)
+        except Exception as e:
+            print(f"[DRAG] Error handling {event.kind} event: {e}")
+        finally:
+            self.input.end_tick()
+    
+    def _handle_event(self, event: InputEvent) -> None:
+        """Drive the drag state machine with one event"""
+        kind = event.kind
+        if kind == MOVE:
+            self._on_move(event.x, event.y)
+        elif kind == BUTTON_DOWN:
+            if event.button == 'left':
+                self._on_left_down()
+            elif event.button == 'right':
+                self._on_right_click()
+        elif kind == BUTTON_UP:
+            if event.button == 'left':
+                self._on_left_up(event.trace)
+        elif kind == KEY_DOWN:
+            self._on_key_down(event.vk, event.trace)
+        elif kind == KEY_UP:
+            if self.input.is_drag_show_key_vk(event.vk):
+                self.show_key_down = False
+        elif kind == SCROLL:
+            self._on_scroll(event.x, event.y, 0, event.dy)
+    
+    # ===== Drag state machine =====
+    
+    def _on_left_down(self) -> None:
+        """LMB pressed - a new drag may be starting"""
+        self.left_down = True
+        
+        # Cooldown after number snap
+        if time.time() - self.last_number_snap_time < self.number_snap_cooldown:
+            print("[DRAG] Ignoring LMB - too soon after snap")
+            return
+        
+        # Clear snap flag on new drag
+        self.number_snap_occurred = False
+        
+        # Capture target window
+        self.drag_active_hwnd = self._capture_drag_target()
+        self.dragged_hwnd = self.drag_active_hwnd
+        if not self.drag_active_hwnd:
+            return
+        
+        # Remember where it started, so the show key can tell it is really moving
+        self._is_window_being_dragged(self.drag_active_hwnd)
+        
+        # If snapped, restore size for smooth dragging
+        if self.drag_active_hwnd in self.zone_manager.state_tracker.snapped_windows:
+            self.zone_manager.dispatcher.submit(
+                ('drag_start', self.drag_active_hwnd), self._restore_size_for_drag, self.drag_active_hwnd
+            )
+    
+    def _on_key_down(self, vk: Optional[int], trace=None) -> None:
+        """Key pressed - show key shows the overlay, anything else may be a snap key"""
+        if self.input.is_drag_show_key_vk(vk):
+            if self.show_key_down:
+                return  # auto-repeat
+            self.show_key_down = True
+            
+            if self.drag_active_hwnd and self.left_down and not self.overlay_shown:
+                if self._is_window_being_dragged(self.drag_active_hwnd):
+                    self._show_overlay()
+                    print("[OVERLAY] Shown via modifier key")
+            return
+        
+        if self.overlay_shown:
+            self._handle_snap_input(vk, trace)
+    
+    def _on_move(self, x: int, y: int) -> None:
+        """Cursor moved while the overlay is up - update the hover highlight"""
+        if not self.overlay_shown:
+            return
+        
+        # Ensure we have the drag target
+        if not self.dragged_hwnd and self.left_down:
+            self.dragged_hwnd = self._capture_drag_target()
+        
+        hovered = self._get_zone_at_point(x, y)
+        if hovered != self.current_zone:
+            self.current_zone = hovered
+            if hovered:
+                self.overlay.set_highlight(hovered[0], hovered[1])
+            else:
+                self.overlay.set_highlight(None, None)
+    
+    def _handle_snap_input(self, vk: Optional[int] = None, trace=None) -> None:
+        """Snap the dragged window if a zone/number key selects a zone"""
+        snap_target = self._check_for_snap_input(vk)
+        if snap_target is None:
+            return
+        if trace is not None:
+            trace.mark('checked')
+        
+        mon_id, zone_name = snap_target
+        if not self.dragged_hwnd:
+            self.dragged_hwnd = self._capture_drag_target()
+        if not self.dragged_hwnd:
+            return
+        
+        # Execute snap; the cooldown starts now, not when the dispatcher gets to it
+        self._snap_window_to_zone(self.dragged_hwnd, mon_id, zone_name, trace)
+        self.number_snap_occurred = True
+        self.last_number_snap_time = time.time()
+        
+        # Clean up overlay (key repeats are ignored until it is shown again)
+        self._hide_overlay()
+        self.dragged_hwnd = None
+    
+    def _on_left_up(self, trace=None) -> None:
+        """LMB released - end the drag, snapping to the hovered zone if the overlay is up"""
+        self.left_down = False
+        
+        if self.drag_active_hwnd:
+            self.zone_manager.dispatcher.submit(
+                ('drag_end', self.drag_active_hwnd),
+                self.zone_manager.state_tracker.unmark_as_dragging, self.drag_active_hwnd
+            )
+        self.drag_active_hwnd = None
+        
+        # If overlay shown and zone selected, snap on release
+        if self.overlay_shown and self.current_zone and self.dragged_hwnd:
+            mon_id, zone_name = self.current_zone
+            if trace is not None:
+                trace.mark('handled')
+            self.zone_manager.dispatcher.submit(
+                ('move', self.dragged_hwnd), self._snap_on_release, self.dragged_hwnd, mon_id, zone_name, trace
+            )
+        
+        if self.overlay_shown:
+            self._hide_overlay()
+        
+        self.current_zone = None
+        self.dragged_hwnd = None
+    
+    def _show_overlay(self) -> None:
+        self._assign_zone_numbers()
+        self.overlay.show()
+        self.overlay.redraw()
+        self.overlay_shown = True
+    
+    def _hide_overlay(self) -> None:
+        try:
+            self.overlay.hide()
+            self.overlay.set_highlight(None, None)
+        except Exception:
+            pass
+        self.overlay_shown = False
+        self.overlay_toggled = False
+        self.current_zone = None
+    
     # ===== Mouse event handlers =====
     
     def _on_scroll(self, x: int, y: int, dx: int, dy: int) -> None:
         """Handle scroll wheel for layout switching"""
         # Only when overlay visible and dragging
-        if not self.input.is_mouse_button_down('left') or not self.overlay_shown:
+        if not self.scroll_enabled or not self.left_down or not self.overlay_shown:
             return
         
         # Cooldown check
@@ -114,19 +401,9 @@ class DragZoneListener:
         if mon_id is None:
             return
         
-        # Cycle layouts
-        layouts = list(self.zone_manager.layouts.keys())
-        current_layout = self.zone_manager.per_monitor_layouts.get(
-            mon_id, self.zone_manager.active_layout
-        )
-        
-        try:
-            idx = layouts.index(current_layout)
-        except ValueError:
-            idx = 0
-        
-        next_idx = (idx + 1) % len(layouts) if dy > 0 else (idx - 1) % len(layouts)
-        next_layout = layouts[next_idx]
+        # Cycle layouts (precompiled - this is just a table lookup)
+        current_layout = self.zone_manager.get_layout_for_monitor(mon_id)
+        next_layout = self.zone_manager.get_adjacent_layout(current_layout, 1 if dy > 0 else -1)
         
         print(f"Scroll: Switching Monitor {mon_id} to layout {next_layout}")
         self.zone_manager.switch_layout_for_monitor(mon_id, next_layout)
@@ -138,35 +415,22 @@ class DragZoneListener:
             self.overlay.set_highlight(None, None)
             self.overlay.redraw()
     
-    def _on_click(self, x: int, y: int, button, pressed: bool) -> None:
+    def _on_right_click(self) -> None:
         """Handle right-click to toggle overlay during drag"""
-        if button != mouse.Button.right or not pressed:
-            return
-        
-        # Only respond during active drag
-        if not self.input.is_mouse_button_down('left'):
+        # Only respond during active drag (right-click toggling goes with scroll support)
+        if not self.scroll_enabled or not self.left_down:
             return
         
         if self.overlay_shown:
             # Toggle OFF
-            self.overlay.hide()
-            self.overlay.set_highlight(None, None)
-            self.overlay_shown = False
-            self.overlay_toggled = False
-            self.current_zone = None
+            self._hide_overlay()
             self.dragged_hwnd = None
             print("[OVERLAY] Toggled OFF")
         else:
             # Toggle ON
             self.overlay_toggled = True
-            self._assign_zone_numbers()
-            self.overlay.show()
-            self.overlay.redraw()
-            self.overlay_shown = True
-            
-            if self.input.is_mouse_button_down('left'):
-                self.dragged_hwnd = self._capture_drag_target()
-            
+            self._show_overlay()
+            self.dragged_hwnd = self._capture_drag_target()
             print("[OVERLAY] Toggled ON")
     
     # ===== Drag detection =====
@@ -174,70 +438,18 @@ class DragZoneListener:
     def _capture_drag_target(self):
         """Get the window handle being dragged"""
         x, y = get_cursor_pos()
-        hwnd = get_hwnd_under_cursor()
-        
-        # Skip overlay windows
-        overlay_hwnds = {w.hwnd for w in self.overlay.windows} if hasattr(self.overlay, 'windows') else set()
         
-        if hwnd in overlay_hwnds:
-            # Temporarily hide overlays to get underlying window
-            try:
-                for w in self.overlay.windows:
-                    win32gui.ShowWindow(w.hwnd, win32con.SW_HIDE)
-                hwnd = win32gui.WindowFromPoint((x, y))
-            finally:
-                for w in self.overlay.windows:
-                    win32gui.ShowWindow(w.hwnd, win32con.SW_SHOWNA)
-        
-        # Get top-level window
+        # Look through our own overlay windows (hwnd set is built once with them)
         try:
-            GA_ROOT = 2
-            hwnd = win32gui.GetAncestor(hwnd, GA_ROOT)
+            hwnd = window_from_point(x, y, getattr(self.overlay, 'overlay_hwnds', frozenset()))
         except Exception:
-            pass
+            return None
         
         return hwnd if self._is_valid_drag_target(hwnd) else None
     
     def _is_valid_drag_target(self, hwnd) -> bool:
-        """Check if window is valid for snapping"""
-        if not hwnd or hwnd == 0:
-            return False
-        
-        try:
-            class_name = win32gui.GetClassName(hwnd)
-            window_text = win32gui.GetWindowText(hwnd)
-            
-            # Invalid classes (configurable in future version)
-            invalid_classes = [
-                "Progman", "WorkerW", "Shell_TrayWnd", "Shell_SecondaryTrayWnd",
-                "Windows.UI.Core.CoreWindow", "ApplicationFrameWindow",
-                "Windows.UI.Input.InputSite.WindowClass", "SysListView32",
-                "ToolbarWindow32", "ReBarWindow32", "MSTaskSwWClass",
-                "TaskListThumbnailWnd", "Button",
-            ]
-            
-            if class_name in invalid_classes:
-                return False
-            if hwnd == win32gui.GetDesktopWindow():
-                return False
-            if not win32gui.IsWindowVisible(hwnd):
-                return False
-            
-            style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
-            ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
-            
-            if not (style & win32con.WS_CAPTION):
-                return False
-            if ex_style & win32con.WS_EX_TOOLWINDOW:
-                return False
-            if not window_text or len(window_text.strip()) == 0:
-                return False
-            if not (style & win32con.WS_SYSMENU):
-                return False
-            
-            return True
-        except Exception:
-            return False
+        """Check if window is valid for snapping (cached per hwnd while window events are on)"""
+        return self.targets.is_valid(hwnd)
     
     def _is_window_being_dragged(self, hwnd) -> bool:
         """Check if window is actively being moved"""
@@ -250,19 +462,12 @@ class DragZoneListener:
                 return True
             
             # Check for movement
-            if not hasattr(self, '_last_positions'):
-                self._last_positions = {}
-            
             L, T, R, B = win32gui.GetWindowRect(hwnd)
             pos = (L, T)
             
-            if hwnd in self._last_positions:
-                if pos != self._last_positions[hwnd]:
-                    self._last_positions[hwnd] = pos
-                    return True
-            
+            last = self._last_positions.get(hwnd)
             self._last_positions[hwnd] = pos
-            return False
+            return last is not None and pos != last
         except Exception:
             return False
     
@@ -270,39 +475,15 @@ class DragZoneListener:
     
     def _get_monitor_at_point(self, x: int, y: int) -> Optional[int]:
         """Get monitor ID at coordinates"""
-        for mon in self.zone_manager.detected_monitors:
-            L, T = mon["x"], mon["y"]
-            R, B = L + mon["width"], T + mon["height"]
-            if L <= x < R and T <= y < B:
-                return mon["id"]
-        return None
+        return self.zone_manager.get_monitor_at_point(x, y)
     
     def _get_zone_at_point(self, x: int, y: int) -> Optional[Tuple[int, str]]:
-        """Get (monitor_id, zone_name) at coordinates"""
-        mon_id = self._get_monitor_at_point(x, y)
-        if mon_id is None:
-            return None
-        
-        zones = self.zone_manager.monitors.get(mon_id, {})
-        ignore_set = {"full"} if self.ignore_fullscreen else set()
-        
-        for zone_name, z in zones.items():
-            if zone_name in ignore_set:
-                continue
-            
-            L = z["x"] + self.hover_margin
-            T = z["y"] + self.hover_margin
-            R = z["x"] + z["width"] - self.hover_margin
-            B = z["y"] + z["height"] - self.hover_margin
-            
-            if L <= x <= R and T <= y <= B:
-                return (mon_id, zone_name)
-        
-        return None
+        """Get (monitor_id, zone_name) at coordinates (hover margin and ignored zones are pre-applied)"""
+        return self.zone_manager.get_zone_at_point(x, y)
     
-    def _get_work_area(self, mon_id: int) -> Tuple[int, int, int, int]:
+    def _get_work_area(self, mon_id: int, geometry=None) -> Tuple[int, int, int, int]:
         """Get work area rect for monitor"""
-        m = self.zone_manager.detected_monitors[mon_id]
+        m = (geometry or self.zone_manager.geometry).monitors_by_id[mon_id]
         return (
             m["work_x"],
             m["work_y"],
@@ -312,11 +493,40 @@ class DragZoneListener:
     
     # ===== Snap handling =====
     
-    def _check_for_snap_input(self) -> Optional[Tuple[int, str]]:
+    def _get_bindings(self, geometry) -> SnapBindings:
+        """Snap-key table for a geometry snapshot, compiled on first use"""
+        if self._bindings_geometry is not geometry:
+            self._bindings = compile_snap_bindings(
+                geometry,
+                self.config.get_monitor_keys(),
+                self.config.get_default_monitor_behavior(),
+            )
+            self._bindings_geometry = geometry
+        return self._bindings
+    
+    def _get_fallback_monitor(self, bindings: SnapBindings) -> Optional[int]:
+        """Monitor for a zone key pressed without a stage-1 key"""
+        if bindings.default_behavior != 'context_aware':
+            return bindings.fallback_monitor
+        
+        # Use mouse position during drag, or window position otherwise
+        if self.dragged_hwnd:
+            x, y = get_cursor_pos()
+            return self._get_monitor_at_point(x, y)
+        hwnd = self.zone_manager.get_active_window()
+        if hwnd:
+            return self.zone_manager.get_monitor_for_window(hwnd)
+        return None
+    
+    def _check_for_snap_input(self, vk: Optional[int] = None) -> Optional[Tuple[int, str]]:
         """
         Check all possible snap inputs (zone keys and number keys).
         Returns (monitor_id, zone_name) if snap should occur, else None.
         
+        Args:
+            vk: Key that was just pressed - only its bindings are consulted.
+                None probes every bound key.
+        
         Two-stage hotkey system:
         Stage 1 (optional): Monitor selection key (`, 1, 2, etc.)
         Stage 2: Zone key (Q, W, etc.)
@@ -327,63 +537,42 @@ class DragZoneListener:
         - Press Q alone = Uses default_monitor_for_zone_keys behavior
         - Press 3 alone (not a monitor key) = Zone number 3
         """
+        # One geometry snapshot (and its compiled bindings) for the whole check
+        bindings = self._get_bindings(self.zone_manager.geometry)
+        
         # Check if a monitor selection key (stage 1) is pressed
-        pressed_monitor_id = self.input.get_pressed_monitor_key()
-        
-        # Get default behavior for when no monitor key is pressed
-        default_behavior = self.config.get_default_monitor_behavior()
-        
-        # Determine fallback monitor if no stage-1 key pressed
-        fallback_mon_id = None
-        if default_behavior == 'context_aware':
-            # Use mouse position during drag, or window position otherwise
-            if self.dragged_hwnd:
-                x, y = get_cursor_pos()
-                fallback_mon_id = self._get_monitor_at_point(x, y)
-            else:
-                hwnd = self.zone_manager.get_active_window()
-                if hwnd:
-                    fallback_mon_id = self.zone_manager.get_monitor_for_window(hwnd)
-        elif default_behavior == 'primary':
-            # Find primary monitor
-            for mon in self.zone_manager.detected_monitors:
-                if mon.get('is_primary', False):
-                    fallback_mon_id = mon['id']
-                    break
-        elif isinstance(default_behavior, int):
-            # Specific monitor ID
-            fallback_mon_id = default_behavior
+        pressed_monitor_id = self.input.get_pressed_monitor_key(bindings)
         
         # Priority 1: Zone-specific hotkeys with two-stage logic
-        for mon_id, zones in self.zone_manager.monitors.items():
-            for zone_name, zone_data in zones.items():
-                if isinstance(zone_data, dict) and 'key' in zone_data:
-                    key_str = zone_data.get('key', '').strip()
-                    if key_str:
-                        is_pressed, label = self.input.is_zone_key_pressed(key_str)
-                        if is_pressed:
-                            # Zone key pressed - determine which monitor
-                            target_mon_id = None
-                            
-                            if pressed_monitor_id is not None:
-                                # Stage 1 key pressed - use that monitor
-                                if pressed_monitor_id == mon_id:
-                                    target_mon_id = mon_id
-                                    print(f"[INPUT] Two-stage: Mon{mon_id} key + '{label}' -> {zone_name} (mon {mon_id})")
-                            else:
-                                # No stage 1 key - use fallback behavior
-                                if mon_id == fallback_mon_id:
-                                    target_mon_id = mon_id
-                                    print(f"[INPUT] Zone key '{label}' -> {zone_name} (mon {mon_id}) [fallback]")
-                            
-                            if target_mon_id is not None:
-                                return (target_mon_id, zone_name)
+        if vk is not None:
+            pressed_vks = (vk,) if vk in bindings.zone_keys else ()
+        else:
+            pressed_vks = [key_vk for key_vk in bindings.zone_keys if self.input.is_key_pressed(key_vk)]
+        
+        for key_vk in pressed_vks:
+            candidates = bindings.zone_keys[key_vk]
+            if pressed_monitor_id is not None:
+                # Stage 1 key pressed - use that monitor
+                for mon_id, zone_name, label in candidates:
+                    if mon_id == pressed_monitor_id:
+                        print(f"[INPUT] Two-stage: Mon{mon_id} key + '{label}' -> {zone_name} (mon {mon_id})")
+                        return (mon_id, zone_name)
+            else:
+                # No stage 1 key - use fallback behavior
+                fallback_mon_id = self._get_fallback_monitor(bindings)
+                for mon_id, zone_name, label in candidates:
+                    if mon_id == fallback_mon_id:
+                        print(f"[INPUT] Zone key '{label}' -> {zone_name} (mon {mon_id}) [fallback]")
+                        return (mon_id, zone_name)
         
         # Priority 2: Number keys (1-9 fallback)
         # CRITICAL: Don't check numbers if a monitor selection key is held down
         # (user is in two-stage mode waiting to press zone key)
         if pressed_monitor_id is None:
-            pressed_num = self.input.get_pressed_number()
+            if vk is not None:
+                pressed_num = bindings.number_keys.get(vk)
+            else:
+                pressed_num = self.input.get_pressed_number(bindings)
             if pressed_num is not None:
                 target = self.numbering.get_zone_by_number(pressed_num)
                 if target:
@@ -394,9 +583,17 @@ class DragZoneListener:
         return None
         
     
-    def _snap_window_to_zone(self, hwnd, mon_id: int, zone_name: str) -> None:
-        """Execute the snap operation"""
-        zones_map = self.zone_manager.monitors.get(mon_id, {})
+    def _snap_window_to_zone(self, hwnd, mon_id: int, zone_name: str, trace=None) -> None:
+        """Queue the snap operation (supersedes any pending move of this window)"""
+        self.zone_manager.dispatcher.submit(('move', hwnd), self._do_snap_window_to_zone, hwnd, mon_id, zone_name, trace)
+    
+    def _do_snap_window_to_zone(self, hwnd, mon_id: int, zone_name: str, trace=None) -> None:
+        """Execute the snap operation (dispatcher thread)"""
+        if trace is not None:
+            trace.mark('dispatch')
+        
+        geometry = self.zone_manager.geometry
+        zones_map = geometry.monitors.get(mon_id, {})
         if zone_name not in zones_map:
             print(f"[SNAP] Zone {zone_name} not found on monitor {mon_id}")
             return
@@ -412,14 +609,47 @@ class DragZoneListener:
         
         # Mark operation in progress to prevent auto-restore
         self.zone_manager.state_tracker.mark_operation_in_progress(hwnd)
+        if trace is not None:
+            trace.mark('exempt')
+        
+        # Remember where the window was, for undo
+        self.zone_manager.state_tracker.record_geometry(hwnd)
+        
+        # End drag first, THEN snap (prevents Windows from restoring old position).
+        # The snap waits out the settle on the scheduler, not on the dispatcher thread.
+        self._end_drag()
+        self.scheduler.schedule(
+            ('drag_settle', hwnd),
+            DRAG_SETTLE_DELAY,
+            lambda: self.zone_manager.dispatcher.submit(
+                ('move', hwnd), self._snap_after_settle, hwnd, mon_id, zone_name, trace
+            )
+        )
+    
+    def _end_drag(self) -> None:
+        """Release the mouse button so the system move loop ends"""
+        try:
+            import win32api
+            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+        except Exception:
+            pass
+    
+    def _snap_after_settle(self, hwnd, mon_id: int, zone_name: str, trace=None) -> None:
+        """Move a number-snapped window into its zone once the drag has ended (dispatcher thread)"""
+        if trace is not None:
+            trace.mark('release')
         
-        # End drag first, THEN snap (prevents Windows from restoring old position)
-        wa = self._get_work_area(mon_id)
-        zrect = zones_map[zone_name]
-        self._end_drag_then_snap(hwnd, zrect, wa)
+        geometry = self.zone_manager.geometry
+        zones_map = geometry.monitors.get(mon_id, {})
+        if zone_name not in zones_map:
+            print(f"[SNAP] Zone {zone_name} not found on monitor {mon_id}")
+            return
         
-        # Mark as snapped
-        self.zone_manager.state_tracker.mark_as_snapped(hwnd)
+        # Mark as snapped once the move has landed
+        wa = self._get_work_area(mon_id, geometry)
+        with window_move_transaction() as txn:
+            snap_hwnd_outer_to_zone_with_workarea(hwnd, zones_map[zone_name], wa)
+            txn.after_commit(lambda: self._mark_snapped(hwnd, mon_id, zone_name, trace))
         
         print(f"[SNAP] Window snapped to {zone_name} on monitor {mon_id}")
         
@@ -430,170 +660,51 @@ class DragZoneListener:
         except Exception:
             pass
     
-    def _end_drag_then_snap(self, hwnd, zone_rect: dict, work_area: Tuple[int, int, int, int]) -> None:
-        """End the drag cleanly, then snap to zone"""
+    def _restore_size_for_drag(self, hwnd) -> None:
+        """A snapped window started dragging - give it back its saved size (dispatcher thread)"""
+        if hwnd not in self.zone_manager.state_tracker.snapped_windows:
+            return
+        
         try:
-            # Release mouse button to end drag
-            import win32api
-            win32api.mouse_event(win32con.MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+            rect = win32gui.GetWindowRect(hwnd)
+            current_size = (rect[2] - rect[0], rect[3] - rect[1])
+            snapped_size = self.zone_manager.state_tracker.snapped_windows[hwnd][2:4]
+            
+            # Update saved state if manually resized
+            if current_size != snapped_size:
+                self.zone_manager.state_tracker.save_state(hwnd, force=True)
+                print("[DRAG] Updated saved state (window was resized)")
         except Exception:
             pass
         
-        # Let Windows settle
-        time.sleep(0.03)
+        self.zone_manager.state_tracker.mark_as_dragging(hwnd)
+        self.zone_manager.state_tracker.restore_size_only(hwnd)
+        print(f"[DRAG] Started - restored size for window {hwnd}")
+    
+    def _snap_on_release(self, hwnd, mon_id: int, zone_name: str, trace=None) -> None:
+        """Snap a released window to the hovered zone (dispatcher thread)"""
+        if trace is not None:
+            trace.mark('dispatch')
         
-        # Snap to zone
-        snap_hwnd_outer_to_zone_with_workarea(hwnd, zone_rect, work_area)
+        geometry = self.zone_manager.geometry
+        zones_map = geometry.monitors.get(mon_id, {})
+        if zone_name not in zones_map:
+            return
         
-        # Set cooldown
-        self.number_snap_occurred = True
-        self.last_number_snap_time = time.time()
-    
-    # ===== Main drag monitoring loop =====
-    
-    def _monitor_drag(self) -> None:
-        """Main monitoring loop for drag operations"""
-        left_was_down = False
-        mod_was_down = False
-        drag_active_hwnd = None
-        drag_start_time = None
+        is_resnap = hwnd in self.zone_manager.state_tracker.snapped_windows
+        self.zone_manager.state_tracker.save_state(hwnd, force=is_resnap)
+        self.zone_manager.state_tracker.record_geometry(hwnd)
         
-        while self.running:
-            # Poll input state
-            left_down = self.input.is_mouse_button_down('left')
-            mod_down = self.input.is_drag_show_key_pressed()
-            
-            # === LMB PRESSED (new drag starts) ===
-            if left_down and not left_was_down:
-                # Cooldown after number snap
-                if time.time() - self.last_number_snap_time < self.number_snap_cooldown:
-                    print("[DRAG] Ignoring LMB - too soon after snap")
-                    left_was_down = left_down
-                    mod_was_down = mod_down
-                    time.sleep(0.01)
-                    continue
-                
-                # Clear snap flag on new drag
-                self.number_snap_occurred = False
-                
-                # Capture target window
-                potential = self._capture_drag_target()
-                if potential:
-                    drag_active_hwnd = potential
-                    drag_start_time = time.time()
-                    self.dragged_hwnd = drag_active_hwnd
-                    
-                    # If snapped, restore size for smooth dragging
-                    if drag_active_hwnd in self.zone_manager.state_tracker.snapped_windows:
-                        try:
-                            rect = win32gui.GetWindowRect(drag_active_hwnd)
-                            current_size = (rect[2] - rect[0], rect[3] - rect[1])
-                            snapped_size = self.zone_manager.state_tracker.snapped_windows[drag_active_hwnd][2:4]
-                            
-                            # Update saved state if manually resized
-                            if current_size != snapped_size:
-                                self.zone_manager.state_tracker.save_state(drag_active_hwnd, force=True)
-                                print("[DRAG] Updated saved state (window was resized)")
-                        except Exception:
-                            pass
-                        
-                        self.zone_manager.state_tracker.mark_as_dragging(drag_active_hwnd)
-                        self.zone_manager.state_tracker.restore_size_only(drag_active_hwnd)
-                        print(f"[DRAG] Started - restored size for window {drag_active_hwnd}")
-                else:
-                    drag_active_hwnd = None
-                    self.dragged_hwnd = None
-            
-            # === MODIFIER PRESSED (show overlay) ===
-            if mod_down and not mod_was_down and drag_active_hwnd and left_down and not self.overlay_shown:
-                if self._is_window_being_dragged(drag_active_hwnd):
-                    self._assign_zone_numbers()
-                    self.overlay.show()
-                    self.overlay.redraw()
-                    self.overlay_shown = True
-                    print("[OVERLAY] Shown via modifier key")
-            
-            # === OVERLAY ACTIVE - handle hover and snap inputs ===
-            if self.overlay_shown:
-                # Ensure we have the drag target
-                if not self.dragged_hwnd and left_down:
-                    self.dragged_hwnd = self._capture_drag_target()
-                
-                x, y = get_cursor_pos()
-                
-                # Update hover highlight
-                hovered = self._get_zone_at_point(x, y)
-                if hovered != self.current_zone:
-                    self.current_zone = hovered
-                    if hovered:
-                        self.overlay.set_highlight(hovered[0], hovered[1])
-                    else:
-                        self.overlay.set_highlight(None, None)
-                
-                # === CRITICAL FIX: Check snap inputs EVERY frame, not just on hover change ===
-                snap_target = self._check_for_snap_input()
-                
-                if snap_target is not None:
-                    mon_id, zone_name = snap_target
-                    
-                    if not self.dragged_hwnd:
-                        self.dragged_hwnd = self._capture_drag_target()
-                    
-                    if self.dragged_hwnd:
-                        # Execute snap
-                        self._snap_window_to_zone(self.dragged_hwnd, mon_id, zone_name)
-                        
-                        # Clean up overlay
-                        try:
-                            self.overlay.hide()
-                            self.overlay.set_highlight(None, None)
-                        except Exception:
-                            pass
-                        
-                        self.overlay_shown = False
-                        self.overlay_toggled = False
-                        self.current_zone = None
-                        self.dragged_hwnd = None
-                        
-                        # Debounce to prevent key repeat
-                        time.sleep(0.2)
-                        continue
-            
-            # === LMB RELEASED (end drag) ===
-            if left_was_down and not left_down:
-                if drag_active_hwnd:
-                    self.zone_manager.state_tracker.unmark_as_dragging(drag_active_hwnd)
-                
-                drag_active_hwnd = None
-                drag_start_time = None
-                
-                # If overlay shown and zone selected, snap on release
-                if self.overlay_shown and self.current_zone and self.dragged_hwnd:
-                    mon_id, zone_name = self.current_zone
-                    zones_map = self.zone_manager.monitors.get(mon_id, {})
-                    
-                    if zone_name in zones_map:
-                        is_resnap = self.dragged_hwnd in self.zone_manager.state_tracker.snapped_windows
-                        self.zone_manager.state_tracker.save_state(self.dragged_hwnd, force=is_resnap)
-                        
-                        wa = self._get_work_area(mon_id)
-                        snap_hwnd_outer_to_zone_with_workarea(self.dragged_hwnd, zones_map[zone_name], wa)
-                        
-                        self.zone_manager.state_tracker.mark_as_snapped(self.dragged_hwnd)
-                        print(f"[SNAP] Released on zone {zone_name} (mon {mon_id})")
-                
-                # Hide overlay
-                if self.overlay_shown:
-                    self.overlay.hide()
-                    self.overlay.set_highlight(None, None)
-                    self.overlay_shown = False
-                    self.overlay_toggled = False
-                
-                self.current_zone = None
-                self.dragged_hwnd = None
-            
-            # Update state
-            left_was_down = left_down
-            mod_was_down = mod_down
-            
-            time.sleep(0.01)
\ No newline at end of file
+        wa = self._get_work_area(mon_id, geometry)
+        with window_move_transaction() as txn:
+            snap_hwnd_outer_to_zone_with_workarea(hwnd, zones_map[zone_name], wa)
+            txn.after_commit(lambda: self._mark_snapped(hwnd, mon_id, zone_name, trace))
+        print(f"[SNAP] Released on zone {zone_name} (mon {mon_id})")
+    
+    def _mark_snapped(self, hwnd, mon_id: int, zone_name: str, trace=None) -> None:
+        """Record a snapped window's final rect (after the move transaction that placed it commits)"""
+        if trace is not None:
+            trace.mark('moved')
+        self.zone_manager.state_tracker.mark_as_snapped(hwnd, (mon_id, zone_name))
+        if trace is not None:
+            trace.finish()
@@ -0,0 +1,123 @@
+# core/drag_targets.py
+"""Which windows can be drag-snapped - filters compiled from config, results cached per hwnd"""
+
+from typing import Dict, Iterable, Optional
+
+import win32con
+import win32gui
+
+from .window_events import (
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_SHOW,
+    EVENT_OBJECT_HIDE,
+    EVENT_OBJECT_LOCATIONCHANGE,
+    EVENT_OBJECT_NAMECHANGE,
+)
+
+# A drag target needs a caption (either bit) and a system menu, and must not be a tool window
+REQUIRED_STYLE_ANY = win32con.WS_CAPTION
+REQUIRED_STYLE_ALL = win32con.WS_SYSMENU
+FORBIDDEN_EX_STYLE = win32con.WS_EX_TOOLWINDOW
+
+# Events after which a window's classification may be different. Style
+# changes (e.g. a browser going fullscreen and dropping its caption) come
+# with a frame change, which is reported as a location change.
+INVALIDATING_EVENTS = frozenset((
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_SHOW,
+    EVENT_OBJECT_HIDE,
+    EVENT_OBJECT_LOCATIONCHANGE,
+    EVENT_OBJECT_NAMECHANGE,
+))
+
+
+class DragTargetClassifier:
+    """
+    Decides whether a window is a valid drag-to-snap target.
+
+    With a window event source attached, results are cached per hwnd and
+    dropped when the window is destroyed, shown/hidden, retitled or
+    reframed, so repeated presses on the same window are a dict lookup.
+    Without events nothing could invalidate the cache, so every call
+    classifies afresh.
+    """
+
+    def __init__(self, ignored_classes: Iterable[str]):
+        """
+        Args:
+            ignored_classes: Window classes that are never drag targets
+        """
+        self.ignored_classes = frozenset(ignored_classes)
+        self.event_source = None
+        self.hits = 0
+        self.misses = 0
+        self._cache: Dict[int, bool] = {}
+        self._epoch = 0  # bumped on every invalidation
+        self._desktop: Optional[int] = None
+
+    def attach(self, event_source) -> bool:
+        """Enable caching, invalidated by a WindowEventSource. Returns False if events are unavailable."""
+        if event_source is None:
+            return False
+        event_source.subscribe(self._on_window_event)
+        if not event_source.start():
+            event_source.unsubscribe(self._on_window_event)
+            return False
+        self.event_source = event_source
+        return True
+
+    def detach(self) -> None:
+        """Stop caching (the shared event source itself keeps running)"""
+        if self.event_source is not None:
+            self.event_source.unsubscribe(self._on_window_event)
+            self.event_source = None
+        self._cache.clear()
+
+    def is_valid(self, hwnd) -> bool:
+        """Check if window is valid for snapping"""
+        if not hwnd:
+            return False
+        if self.event_source is None:
+            return self._classify(hwnd)
+
+        cached = self._cache.get(hwnd)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        epoch = self._epoch
+        result = self._classify(hwnd)
+        if epoch == self._epoch:  # don't cache a result an event may already have made stale
+            self._cache[hwnd] = result
+        return result
+
+    def _on_window_event(self, event, hwnd) -> None:
+        if event in INVALIDATING_EVENTS:
+            self._epoch += 1
+            self._cache.pop(hwnd, None)
+
+    def _classify(self, hwnd) -> bool:
+        try:
+            if win32gui.GetClassName(hwnd) in self.ignored_classes:
+                return False
+            if self._desktop is None:
+                self._desktop = win32gui.GetDesktopWindow()
+            if hwnd == self._desktop:
+                return False
+            if not win32gui.IsWindowVisible(hwnd):
+                return False
+
+            style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
+            if not (style & REQUIRED_STYLE_ANY) or (style & REQUIRED_STYLE_ALL) != REQUIRED_STYLE_ALL:
+                return False
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & FORBIDDEN_EX_STYLE:
+                return False
+
+            window_text = win32gui.GetWindowText(hwnd)
+            if not window_text or len(window_text.strip()) == 0:
+                return False
+
+            return True
+        except Exception:
+            return False
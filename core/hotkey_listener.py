@@ -1,7 +1,10 @@
 # hotkey_listener.py
+import time
 from pynput import keyboard
 from pynput.keyboard import Key, KeyCode
 
+from .latency import latency
+
 class HotkeyListener:
     def __init__(self, zone_manager, overlay=None, tray_icon=None):
         self.zone_manager = zone_manager
@@ -116,6 +119,18 @@ class HotkeyListener:
         normalized = self._normalize_hotkey_config(self.zone_manager.config.get('cycle_all_prev_hotkey', 'ctrl+alt+shift+['))
         actions[normalized] = {'type': 'cycle_all', 'direction': 'prev'}
         
+        normalized = self._normalize_hotkey_config(self.zone_manager.config.get('zone_windows_next_hotkey', 'ctrl+alt+.'))
+        actions[normalized] = {'type': 'zone_windows', 'direction': 'next'}
+        
+        normalized = self._normalize_hotkey_config(self.zone_manager.config.get('zone_windows_prev_hotkey', 'ctrl+alt+,'))
+        actions[normalized] = {'type': 'zone_windows', 'direction': 'prev'}
+        
+        normalized = self._normalize_hotkey_config(self.zone_manager.config.get('undo_hotkey', 'ctrl+alt+z'))
+        actions[normalized] = {'type': 'history', 'direction': 'undo'}
+        
+        normalized = self._normalize_hotkey_config(self.zone_manager.config.get('redo_hotkey', 'ctrl+alt+y'))
+        actions[normalized] = {'type': 'history', 'direction': 'redo'}
+        
         for layout_hk in self.zone_manager.layout_hotkeys:
             normalized = self._normalize_hotkey_config(layout_hk['keys'])
             actions[normalized] = {
@@ -252,6 +267,8 @@ class HotkeyListener:
 
     def _on_press(self, key):
         """Handle key press events"""
+        pressed_at = time.perf_counter_ns() if latency.enabled else 0
+        
         if key in self.current_keys:
             return
         
@@ -263,7 +280,7 @@ class HotkeyListener:
                 if self._check_hotkey_match(combo, registered_combo):
                     if combo not in self.hotkeys_fired:
                         self.hotkeys_fired.add(combo)
-                        self._execute_action(action, registered_combo)
+                        self._execute_action(action, registered_combo, pressed_at)
                     break
     
     def _on_release(self, key):
@@ -294,18 +311,20 @@ class HotkeyListener:
                 self.hotkeys_fired = {hk for hk in self.hotkeys_fired 
                                      if self._get_key_name(key) not in hk.split('+')}
     
-    def _execute_action(self, action, combo):
-        """Execute the action associated with a hotkey"""
+    def _execute_action(self, action, combo, pressed_at=0):
+        """Execute the action associated with a hotkey (pressed_at: perf_counter_ns of the key press if tracing latency)"""
         try:
             if action['type'] == 'zone':
                 print(f"Hotkey [{combo}] triggered: Moving to Monitor {action['monitor']}, Zone {action['zone']}")
-                self.zone_manager.move_window_to_zone(action['monitor'], action['zone'])
+                trace = latency.start('hotkey_snap', pressed_at) if pressed_at else None
+                self.zone_manager.move_window_to_zone(action['monitor'], action['zone'], trace=trace)
             elif action['type'] == 'overlay':
                 print(f"Hotkey [{combo}] triggered: Toggling overlay")
                 self._toggle_overlay()
             elif action['type'] == 'restore':
                 print(f"Hotkey [{combo}] triggered: Restoring window")
-                self.zone_manager.restore_window()
+                trace = latency.start('restore', pressed_at) if pressed_at else None
+                self.zone_manager.restore_window(trace=trace)
             elif action['type'] == 'reload':
                 print(f"Hotkey [{combo}] triggered: Reloading config")
                 self._reload_config()
@@ -315,6 +334,12 @@ class HotkeyListener:
             elif action['type'] == 'cycle_all':
                 print(f"Hotkey [{combo}] triggered: Cycling {action['direction']} (all monitors)")
                 self.zone_manager.cycle_zone_all_monitors(action['direction'])
+            elif action['type'] == 'zone_windows':
+                print(f"Hotkey [{combo}] triggered: Cycling {action['direction']} window in zone")
+                self.zone_manager.cycle_zone_windows(action['direction'])
+            elif action['type'] == 'history':
+                print(f"Hotkey [{combo}] triggered: {action['direction'].capitalize()} window move")
+                self.zone_manager.step_window_history(action['direction'])
             elif action['type'] == 'layout':
                 print(f"Hotkey [{combo}] triggered: Switching to layout {action['layout']}")
                 self.zone_manager.switch_layout(action['layout'])
@@ -0,0 +1,101 @@
+# core/input_bindings.py
+"""Snap-key bindings compiled once per geometry snapshot - VK -> what it selects"""
+
+from typing import Dict, Optional, Tuple, Union
+
+from .keycodes import parse_key_to_vk
+
+ZoneBinding = Tuple[int, str, str]  # (mon_id, zone_name, label)
+
+MODIFIER_NAMES = ('shift', 'ctrl', 'alt', 'win')
+
+# Digit VKs: top row '1'-'9' (0x31-0x39) and numpad 1-9 (0x61-0x69)
+TOP_ROW_VK_BASE = 0x30
+NUMPAD_VK_BASE = 0x60
+
+
+class SnapBindings:
+    """
+    Every key the drag snap check can react to, resolved to virtual-key
+    codes up front: zone keys (VK -> candidate zones), monitor-selection
+    keys and zone-number keys. A check then looks up the pressed VK
+    instead of walking every zone and re-parsing its key string.
+    """
+
+    __slots__ = ('zone_keys', 'monitor_keys', 'number_keys', 'default_behavior', 'fallback_monitor')
+
+    def __init__(self, zone_keys: Dict[int, Tuple[ZoneBinding, ...]],
+                 monitor_keys: Tuple[Tuple[int, Union[int, str], bool], ...],
+                 number_keys: Dict[int, int], default_behavior, fallback_monitor: Optional[int]):
+        """
+        Args:
+            zone_keys: VK -> zones bound to it, in monitor/zone order
+            monitor_keys: (mon_id, vk or modifier name, is_modifier) for stage-1 keys
+            number_keys: VK -> zone number (digits not used as monitor keys)
+            default_behavior: default_monitor_for_zone_keys setting
+            fallback_monitor: Monitor for zone keys without a stage-1 key, if fixed
+                ('primary' or a monitor id); None for 'context_aware'
+        """
+        self.zone_keys = zone_keys
+        self.monitor_keys = monitor_keys
+        self.number_keys = number_keys
+        self.default_behavior = default_behavior
+        self.fallback_monitor = fallback_monitor
+
+
+def compile_snap_bindings(geometry, monitor_keys: dict, default_behavior) -> SnapBindings:
+    """
+    Build the binding table for a geometry snapshot.
+
+    Args:
+        geometry: GeometrySnapshot whose active zones are bound
+        monitor_keys: {mon_id: key name} from ConfigManager.get_monitor_keys()
+        default_behavior: ConfigManager.get_default_monitor_behavior()
+    """
+    zone_keys: Dict[int, list] = {}
+    for mon_id, zones in geometry.monitors.items():
+        for zone_name, zone_data in zones.items():
+            if not isinstance(zone_data, dict):
+                continue
+            key = zone_data.get('key')
+            if not key:
+                continue
+            vk, label = parse_key_to_vk(str(key).strip())
+            if vk is not None:
+                zone_keys.setdefault(vk, []).append((mon_id, zone_name, label))
+
+    stage1 = []
+    monitor_digits = set()
+    for mon_id, key_name in monitor_keys.items():
+        key_name = str(key_name)
+        if key_name.isdigit():
+            monitor_digits.add(int(key_name))
+        if key_name.lower() in MODIFIER_NAMES:
+            stage1.append((mon_id, key_name.lower(), True))
+        else:
+            vk, _ = parse_key_to_vk(key_name.upper())
+            if vk:
+                stage1.append((mon_id, vk, False))
+
+    number_keys = {}
+    for base in (TOP_ROW_VK_BASE, NUMPAD_VK_BASE):
+        for i in range(1, 10):
+            if i not in monitor_digits:
+                number_keys[base + i] = i
+
+    fallback_monitor = None
+    if default_behavior == 'primary':
+        for mon in geometry.detected_monitors:
+            if mon.get('is_primary', False):
+                fallback_monitor = mon['id']
+                break
+    elif isinstance(default_behavior, int):
+        fallback_monitor = default_behavior
+
+    return SnapBindings(
+        {vk: tuple(entries) for vk, entries in zone_keys.items()},
+        tuple(stage1),
+        number_keys,
+        default_behavior,
+        fallback_monitor,
+    )
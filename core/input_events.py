@@ -0,0 +1,169 @@
+# core/input_events.py
+"""Input event sources - pynput low-level hooks on Windows, a simulated source for tests"""
+
+from typing import Callable, List, Optional
+
+# Event kinds
+BUTTON_DOWN = 'button_down'
+BUTTON_UP = 'button_up'
+MOVE = 'move'
+SCROLL = 'scroll'
+KEY_DOWN = 'key_down'
+KEY_UP = 'key_up'
+
+
+class InputEvent:
+    """
+    One mouse/keyboard event. button is 'left'/'right'/'middle', vk a
+    virtual-key code; trace is a LatencyTrace started on arrival, if any.
+    """
+
+    __slots__ = ('kind', 'x', 'y', 'button', 'vk', 'dy', 'trace')
+
+    def __init__(self, kind: str, x: int = 0, y: int = 0, button: Optional[str] = None,
+                 vk: Optional[int] = None, dy: int = 0):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.button = button
+        self.vk = vk
+        self.dy = dy
+        self.trace = None
+
+    def __repr__(self) -> str:
+        return f"InputEvent({self.kind}, ({self.x}, {self.y}), button={self.button}, vk={self.vk}, dy={self.dy})"
+
+
+InputEventCallback = Callable[[InputEvent], None]
+
+
+class InputEventSource:
+    """Base input source: fans InputEvents out to subscribers"""
+
+    def __init__(self):
+        self._subscribers: List[InputEventCallback] = []
+        self.running = False
+
+    def subscribe(self, callback: InputEventCallback) -> None:
+        """Register a callback(event)"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: InputEventCallback) -> None:
+        """Remove a previously registered callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start(self) -> bool:
+        """Start delivering events. Returns False if events are unavailable."""
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+        """Stop delivering events"""
+        self.running = False
+
+    def _emit(self, event: InputEvent) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[EVENTS] Error handling input event {event.kind}: {e}")
+
+
+class SimulatedInputSource(InputEventSource):
+    """Input source driven by hand - emit() delivers synchronously on the caller's thread"""
+
+    def emit(self, kind: str, x: int = 0, y: int = 0, button: Optional[str] = None,
+             vk: Optional[int] = None, dy: int = 0) -> None:
+        """Deliver an event to subscribers (only while started)"""
+        if self.running:
+            self._emit(InputEvent(kind, x, y, button, vk, dy))
+
+
+class PynputInputSource(InputEventSource):
+    """
+    Low-level mouse and keyboard hooks via pynput (WH_MOUSE_LL / WH_KEYBOARD_LL
+    on Windows). Hook callbacks only build an InputEvent and hand it to the
+    subscribers, so they stay short enough not to stall system input.
+    """
+
+    def __init__(self, mouse_moves: bool = True):
+        """
+        Args:
+            mouse_moves: Deliver MOVE events (the busiest event type)
+        """
+        super().__init__()
+        self.mouse_moves = mouse_moves
+        self._mouse_listener = None
+        self._keyboard_listener = None
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+
+        try:
+            from pynput import keyboard, mouse
+        except Exception as e:
+            print(f"[EVENTS] Input hooks unavailable: {e}")
+            return False
+
+        self._buttons = {
+            mouse.Button.left: 'left',
+            mouse.Button.right: 'right',
+            mouse.Button.middle: 'middle',
+        }
+
+        self._mouse_listener = mouse.Listener(
+            on_move=self._on_move if self.mouse_moves else None,
+            on_click=self._on_click,
+            on_scroll=self._on_scroll,
+        )
+        self._keyboard_listener = keyboard.Listener(
+            on_press=self._on_press,
+            on_release=self._on_release,
+        )
+        self._mouse_listener.start()
+        self._keyboard_listener.start()
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+        for listener in (self._mouse_listener, self._keyboard_listener):
+            if listener:
+                listener.stop()
+        self._mouse_listener = None
+        self._keyboard_listener = None
+        self.running = False
+
+    # ===== hook callbacks =====
+
+    def _on_move(self, x, y) -> None:
+        self._emit(InputEvent(MOVE, x, y))
+
+    def _on_click(self, x, y, button, pressed) -> None:
+        name = self._buttons.get(button)
+        if name:
+            self._emit(InputEvent(BUTTON_DOWN if pressed else BUTTON_UP, x, y, button=name))
+
+    def _on_scroll(self, x, y, dx, dy) -> None:
+        self._emit(InputEvent(SCROLL, x, y, dy=dy))
+
+    def _on_press(self, key) -> None:
+        vk = self._key_vk(key)
+        if vk is not None:
+            self._emit(InputEvent(KEY_DOWN, vk=vk))
+
+    def _on_release(self, key) -> None:
+        vk = self._key_vk(key)
+        if vk is not None:
+            self._emit(InputEvent(KEY_UP, vk=vk))
+
+    @staticmethod
+    def _key_vk(key) -> Optional[int]:
+        """Virtual-key code of a pynput Key/KeyCode"""
+        vk = getattr(key, 'vk', None)
+        if vk is None:
+            value = getattr(key, 'value', None)  # special keys wrap a KeyCode
+            vk = getattr(value, 'vk', None)
+        return vk
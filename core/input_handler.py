@@ -5,10 +5,18 @@ import win32api
 import win32con
 from typing import Optional, Tuple
 from .keycodes import parse_key_to_vk
+from .keyboard_state import KeyboardSnapshot, KeyboardState
 
 
 class InputHandler:
-    """Centralized input detection - all key codes come from config"""
+    """
+    Centralized input detection - all key codes come from config.
+    
+    Between begin_tick() and end_tick() every query is answered from one
+    KeyboardSnapshot of the event-fed key state (no syscalls, and every
+    caller in the tick sees the same edges). Outside a tick, queries fall
+    back to GetAsyncKeyState.
+    """
     
     # Virtual key mappings for modifier keys
     MODIFIER_VK_MAP = {
@@ -18,14 +26,38 @@ class InputHandler:
         'win': win32con.VK_LWIN
     }
     
+    # Every VK a modifier can arrive as in a key event (generic and left/right)
+    MODIFIER_EVENT_VKS = {
+        'shift': frozenset((win32con.VK_SHIFT, win32con.VK_LSHIFT, win32con.VK_RSHIFT)),
+        'ctrl': frozenset((win32con.VK_CONTROL, win32con.VK_LCONTROL, win32con.VK_RCONTROL)),
+        'alt': frozenset((win32con.VK_MENU, win32con.VK_LMENU, win32con.VK_RMENU)),
+        'win': frozenset((win32con.VK_LWIN, win32con.VK_RWIN)),
+    }
+    
     def __init__(self, config_manager):
         self.config = config_manager
         self._last_key_states = {}  # Track key states for edge detection
-        self.monitor_keys = config_manager.get_monitor_keys()
+        
+        # Key state fed from input events (see KeyboardState.apply)
+        self.keyboard = KeyboardState()
+        self.snapshot: Optional[KeyboardSnapshot] = None
+    
+    def begin_tick(self) -> None:
+        """Take the key snapshot that answers queries until end_tick()"""
+        self.snapshot = self.keyboard.snapshot()
+    
+    def end_tick(self) -> None:
+        """Go back to live GetAsyncKeyState queries"""
+        self.snapshot = None
         
     def is_modifier_pressed(self, modifier_name: str) -> bool:
         """Check if a modifier key is currently pressed"""
-        vk = self.MODIFIER_VK_MAP.get(modifier_name.lower())
+        name = modifier_name.lower()
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return any(snapshot.is_down(vk) for vk in self.MODIFIER_EVENT_VKS.get(name, ()))
+        
+        vk = self.MODIFIER_VK_MAP.get(name)
         if vk is None:
             return False
         return (win32api.GetAsyncKeyState(vk) & 0x8000) != 0
@@ -36,23 +68,27 @@ class InputHandler:
         key_name = drag_config['show_zones_key']
         return self.is_modifier_pressed(key_name)
     
-    def get_pressed_monitor_key(self) -> Optional[int]:
+    def is_drag_show_key_vk(self, vk: Optional[int]) -> bool:
+        """Check if a key event's VK is the configured drag-to-show-overlay key"""
+        key_name = self.config.get_drag_config()['show_zones_key']
+        return vk in self.MODIFIER_EVENT_VKS.get(key_name.lower(), ())
+    
+    def get_pressed_monitor_key(self, bindings) -> Optional[int]:
         """
         Check which monitor selection key (stage 1) is pressed.
-        Now supports ANY key, not just modifiers.
+        Supports ANY key, not just modifiers.
+        
+        Args:
+            bindings: Compiled SnapBindings (keys are already resolved to VKs)
+        
         Returns monitor ID or None.
         """
-        for mon_id, key_name in self.monitor_keys.items():
-            # Check if it's a standard modifier first
-            if key_name.lower() in ['shift', 'ctrl', 'alt', 'win']:
-                if self.is_modifier_pressed(key_name):
-                    return mon_id
-            else:
-                # Custom key - use the generic key checking
-                from .keycodes import parse_key_to_vk
-                vk, _ = parse_key_to_vk(key_name.upper())
-                if vk and self._is_key_edge_or_held(vk):
+        for mon_id, key, is_modifier in bindings.monitor_keys:
+            if is_modifier:
+                if self.is_modifier_pressed(key):
                     return mon_id
+            elif self._is_key_edge_or_held(key):
+                return mon_id
         return None
     
     def is_mouse_button_down(self, button: str = 'left') -> bool:
@@ -65,33 +101,20 @@ class InputHandler:
         vk = vk_map.get(button.lower())
         if vk is None:
             return False
+        if self.snapshot is not None:
+            return self.snapshot.is_down(vk)
         return (win32api.GetAsyncKeyState(vk) & 0x8000) != 0
     
-    def get_pressed_number(self) -> Optional[int]:
+    def get_pressed_number(self, bindings) -> Optional[int]:
         """
         Check if any number key (1-9) is pressed.
         Returns the number or None.
-        Checks both top row and numpad.
-        IMPORTANT: Excludes numbers that are configured as monitor keys.
+        Checks both top row and numpad, except numbers configured as
+        monitor keys (already left out of bindings.number_keys).
         """
-        # Get list of numbers used as monitor keys
-        monitor_key_numbers = set()
-        for key_name in self.monitor_keys.values():
-            if key_name.isdigit():
-                monitor_key_numbers.add(int(key_name))
-        
-        # Top row '1'-'9' (VK 0x31-0x39)
-        for i in range(1, 10):
-            if i not in monitor_key_numbers:  # Skip if used as monitor key
-                if self._is_key_edge_or_held(0x30 + i):
-                    return i
-        
-        # Numpad '1'-'9' (VK 0x61-0x69)
-        for i in range(1, 10):
-            if i not in monitor_key_numbers:  # Skip if used as monitor key
-                if self._is_key_edge_or_held(0x60 + i):
-                    return i
-        
+        for vk, number in bindings.number_keys.items():
+            if self._is_key_edge_or_held(vk):
+                return number
         return None
     
     def is_zone_key_pressed(self, zone_key_str: str) -> Tuple[bool, Optional[str]]:
@@ -109,11 +132,18 @@ class InputHandler:
         is_pressed = self._is_key_edge_or_held(vk)
         return (is_pressed, label)
     
+    def is_key_pressed(self, vk: int) -> bool:
+        """Check if a key is held or was tapped since the last check"""
+        return self._is_key_edge_or_held(vk)
+    
     def _is_key_edge_or_held(self, vk: int) -> bool:
         """
         Check if a key was just pressed (edge) OR is currently held.
         This catches quick taps between polling intervals.
         """
+        if self.snapshot is not None:
+            return self.snapshot.is_pressed(vk)
+        
         state = win32api.GetAsyncKeyState(vk)
         # Bit 0 = key was pressed since last check (edge)
         # Bit 15 = key is currently down
@@ -121,6 +151,8 @@ class InputHandler:
     
     def reset_key_states(self) -> None:
         """Reset tracked key states (call after handling input)"""
+        self.keyboard.clear_edges()
+        
         # Clear the edge-detect bit by reading all tracked keys
         for vk in self._last_key_states.keys():
             win32api.GetAsyncKeyState(vk)
\ No newline at end of file
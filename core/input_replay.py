@@ -0,0 +1,717 @@
+# core/input_replay.py
+"""
+Deterministic input replay - feeds a recorded (or synthesized) input trace
+through DragZoneListener and HotkeyListener against a fake desktop.
+
+Runs on any OS: win32gui/win32api/win32con, ctypes.windll and pynput are
+replaced by in-memory fakes before the listeners are imported, nothing
+touches real windows, and drag timing (cooldowns, the settle delay) runs
+on a virtual clock that follows the trace timestamps.
+
+    python -m core.input_replay trace.czit --config config
+    python -m core.input_replay --synthesize 500 --save session.czit
+
+Run it as its own process - the fakes replace the real modules for the
+whole interpreter.
+"""
+
+import argparse
+import contextlib
+import ctypes
+import enum
+import io
+import itertools
+import random
+import sys
+import time
+import types
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .config_manager import ConfigManager
+from .input_events import BUTTON_DOWN, BUTTON_UP, MOVE, SCROLL, KEY_DOWN, KEY_UP, InputEvent, SimulatedInputSource
+from .input_trace import TimedEvent, read_input_trace, write_input_trace
+from .keyboard_state import BUTTON_VKS, GENERIC_MODIFIER_VKS
+from .latency import latency
+from .window_events import EVENT_OBJECT_LOCATIONCHANGE, SimulatedEventSource
+from .window_ops import RecordingWindowBackend, set_window_backend
+
+# Real values for the win32con constants the app uses
+WIN32CON = {
+    'VK_LBUTTON': 0x01, 'VK_RBUTTON': 0x02, 'VK_MBUTTON': 0x04,
+    'VK_SHIFT': 0x10, 'VK_CONTROL': 0x11, 'VK_MENU': 0x12,
+    'VK_LSHIFT': 0xA0, 'VK_RSHIFT': 0xA1, 'VK_LCONTROL': 0xA2, 'VK_RCONTROL': 0xA3,
+    'VK_LMENU': 0xA4, 'VK_RMENU': 0xA5, 'VK_LWIN': 0x5B, 'VK_RWIN': 0x5C,
+    **{f'VK_F{i}': 0x6F + i for i in range(1, 25)},
+    **{f'VK_NUMPAD{i}': 0x60 + i for i in range(10)},
+    'GWL_STYLE': -16, 'GWL_EXSTYLE': -20, 'GW_HWNDNEXT': 2,
+    'WS_CAPTION': 0x00C00000, 'WS_SYSMENU': 0x00080000, 'WS_POPUP': 0x80000000,
+    'WS_EX_TOPMOST': 0x08, 'WS_EX_TRANSPARENT': 0x20, 'WS_EX_TOOLWINDOW': 0x80, 'WS_EX_LAYERED': 0x80000,
+    'SWP_NOSIZE': 0x01, 'SWP_NOMOVE': 0x02, 'SWP_NOZORDER': 0x04, 'SWP_NOACTIVATE': 0x10, 'SWP_SHOWWINDOW': 0x40,
+    'SW_HIDE': 0, 'SW_SHOWNORMAL': 1, 'SW_SHOWMAXIMIZED': 3, 'SW_SHOWNA': 8, 'SW_RESTORE': 9,
+    'HWND_TOP': 0, 'HWND_TOPMOST': -1, 'MOUSEEVENTF_LEFTUP': 0x04,
+    'LWA_ALPHA': 0x02, 'NULL_BRUSH': 5, 'PS_SOLID': 0, 'TRANSPARENT': 1,
+    'DT_CENTER': 0x01, 'DT_VCENTER': 0x04, 'DT_SINGLELINE': 0x20,
+}
+
+APP_STYLE = WIN32CON['WS_CAPTION'] | WIN32CON['WS_SYSMENU']
+DESKTOP_HWND = 0x10010
+TITLE_BAR_HEIGHT = 30
+TASKBAR_HEIGHT = 48
+
+# Keys the synthesizer presses (besides digits)
+VK_LSHIFT = 0xA0
+VK_LCONTROL = 0xA2
+VK_LMENU = 0xA4
+VK_CLOSE_BRACKET = 0xDD
+
+
+class VirtualClock:
+    """Stands in for the time module inside the drag listener: sleep() just moves the clock"""
+
+    def __init__(self):
+        self.now_us = 0
+
+    def advance_to(self, t_us: int) -> None:
+        if t_us > self.now_us:
+            self.now_us = t_us
+
+    def time(self) -> float:
+        return self.now_us / 1e6
+
+    monotonic = perf_counter = time
+
+    def sleep(self, seconds: float) -> None:
+        self.now_us += int(seconds * 1e6)
+
+
+class VirtualScheduler:
+    """
+    DeadlineScheduler on a VirtualClock: nothing runs on its own, run_due()
+    runs the entries whose deadline the clock has passed, in deadline order.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self._entries: Dict[Hashable, tuple] = {}  # key -> (deadline_us, seq, callback)
+        self._seq = itertools.count()
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+        self._entries[key] = (self.clock.now_us + int(delay * 1e6), next(self._seq), callback)
+
+    def cancel(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def is_pending(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def run_due(self) -> int:
+        """Run every entry due by now (including ones they schedule). Returns how many ran."""
+        ran = 0
+        while self._entries:
+            key, (deadline_us, _, callback) = min(self._entries.items(), key=lambda item: item[1][:2])
+            if deadline_us > self.clock.now_us:
+                break
+            del self._entries[key]
+            try:
+                callback()
+            except Exception as e:
+                print(f"[SCHEDULER] Error in delayed action {key}: {e}")
+            ran += 1
+        return ran
+
+    def flush(self) -> int:
+        """Advance the clock through every pending deadline. Returns how many entries ran."""
+        ran = 0
+        while self._entries:
+            self.clock.advance_to(min(entry[0] for entry in self._entries.values()))
+            ran += self.run_due()
+        return ran
+
+
+class FakeWindow:
+    """A top-level window as the fake desktop sees it"""
+
+    __slots__ = ('hwnd', 'title', 'class_name', 'style', 'ex_style', 'visible')
+
+    def __init__(self, hwnd: int, title: str, class_name: str, style: int = APP_STYLE, ex_style: int = 0):
+        self.hwnd = hwnd
+        self.title = title
+        self.class_name = class_name
+        self.style = style
+        self.ex_style = ex_style
+        self.visible = True
+
+
+class FakeDesktop(RecordingWindowBackend):
+    """
+    In-memory desktop: monitors, top-level windows in z-order, cursor,
+    key state and mouse capture. Serves the win32 calls the app makes and
+    is the window backend, so snaps land in self.rects (x, y, w, h).
+    Pressing the left button on a title bar captures the window and moves
+    it with the cursor, like the system move loop.
+    """
+
+    def __init__(self, monitors: List[Dict[str, Any]], windows_per_monitor: int = 2):
+        super().__init__()
+        self.monitors = monitors
+        self.windows: Dict[int, FakeWindow] = {}
+        self.z_order: List[int] = []  # topmost first
+        self.events = SimulatedEventSource()
+        self.cursor = (0, 0)
+        self.keys = bytearray(256)
+        self.capture = 0
+        self.foreground = 0
+        self._drag_from = (0, 0)
+
+        hwnd = 0x10020
+        for mon in monitors:
+            if mon['is_primary']:
+                self._add(FakeWindow(hwnd, '', 'Shell_TrayWnd', style=0, ex_style=WIN32CON['WS_EX_TOOLWINDOW']),
+                          (mon['x'], mon['work_y'] + mon['work_height'], mon['width'], TASKBAR_HEIGHT))
+                hwnd += 0x10
+            for i in range(windows_per_monitor):
+                w, h = mon['work_width'] // 2, mon['work_height'] // 2
+                x = mon['work_x'] + mon['work_width'] // 8 + i * 60
+                y = mon['work_y'] + mon['work_height'] // 8 + i * 60
+                self._add(FakeWindow(hwnd, f"Window {len(self.windows)}", 'ReplayWindow'), (x, y, w, h))
+                hwnd += 0x10
+        self.events.start()
+
+    def _add(self, window: FakeWindow, rect: Tuple[int, int, int, int]) -> None:
+        self.windows[window.hwnd] = window
+        self.z_order.insert(0, window.hwnd)
+        self.rects[window.hwnd] = rect
+        if window.class_name == 'ReplayWindow':
+            self.foreground = window.hwnd
+
+    @property
+    def app_windows(self) -> List[int]:
+        return [hwnd for hwnd, w in self.windows.items() if w.class_name == 'ReplayWindow']
+
+    def _apply(self, hwnd, x, y, width, height, flags):
+        super()._apply(hwnd, x, y, width, height, flags)
+        self.events.emit(EVENT_OBJECT_LOCATIONCHANGE, hwnd)
+
+    # ===== Input =====
+
+    def apply_input(self, event: InputEvent) -> None:
+        """Update cursor, key state and capture from a trace event (before the app sees it)"""
+        kind = event.kind
+        if kind in (KEY_DOWN, KEY_UP):
+            self._set_key(event.vk, kind == KEY_DOWN)
+            return
+
+        self.cursor = (event.x, event.y)
+        if kind == MOVE:
+            if self.capture:
+                x, y, w, h = self.rects[self.capture]
+                dx, dy = event.x - self._drag_from[0], event.y - self._drag_from[1]
+                self._drag_from = (event.x, event.y)
+                self._apply(self.capture, x + dx, y + dy, w, h, 0)
+        elif kind in (BUTTON_DOWN, BUTTON_UP):
+            self._set_key(BUTTON_VKS.get(event.button), kind == BUTTON_DOWN)
+            if event.button == 'left':
+                if kind == BUTTON_DOWN:
+                    self._press_left(event.x, event.y)
+                else:
+                    self.capture = 0
+
+    def _set_key(self, vk: Optional[int], down: bool) -> None:
+        if vk is None or not 0 <= vk < 256:
+            return
+        self.keys[vk] = 1 if down else 0
+        generic = GENERIC_MODIFIER_VKS.get(vk)
+        if generic is not None:
+            sides = [side for side, g in GENERIC_MODIFIER_VKS.items() if g == generic]
+            self.keys[generic] = 1 if any(self.keys[side] for side in sides) else 0
+
+    def _press_left(self, x: int, y: int) -> None:
+        hwnd = self.WindowFromPoint((x, y))
+        if hwnd not in self.windows or self.windows[hwnd].class_name != 'ReplayWindow':
+            return
+        self.z_order.remove(hwnd)
+        self.z_order.insert(0, hwnd)
+        self.foreground = hwnd
+        if y < self.rects[hwnd][1] + TITLE_BAR_HEIGHT:
+            self.capture = hwnd
+            self._drag_from = (x, y)
+
+    def window_rect(self, hwnd: int) -> Tuple[int, int, int, int]:
+        x, y, w, h = self.rects[hwnd]
+        return (x, y, x + w, y + h)
+
+    # ===== win32gui =====
+
+    def WindowFromPoint(self, pt) -> int:
+        x, y = pt
+        for hwnd in self.z_order:
+            L, T, R, B = self.window_rect(hwnd)
+            if self.windows[hwnd].visible and L <= x < R and T <= y < B:
+                return hwnd
+        return DESKTOP_HWND
+
+    def GetWindow(self, hwnd, cmd) -> int:
+        if hwnd in self.z_order and cmd == WIN32CON['GW_HWNDNEXT']:
+            idx = self.z_order.index(hwnd) + 1
+            return self.z_order[idx] if idx < len(self.z_order) else 0
+        return 0
+
+    def GetWindowRect(self, hwnd):
+        if hwnd not in self.rects:
+            raise OSError(f"Invalid window handle {hwnd}")
+        return self.window_rect(hwnd)
+
+    def GetWindowLong(self, hwnd, index) -> int:
+        window = self.windows.get(hwnd)
+        if window is None:
+            return 0
+        return window.style if index == WIN32CON['GWL_STYLE'] else window.ex_style
+
+    def GetClassName(self, hwnd) -> str:
+        window = self.windows.get(hwnd)
+        return window.class_name if window else 'Progman'
+
+    def GetWindowText(self, hwnd) -> str:
+        window = self.windows.get(hwnd)
+        return window.title if window else ''
+
+    def IsWindowVisible(self, hwnd) -> bool:
+        window = self.windows.get(hwnd)
+        return window is not None and window.visible
+
+    def GetWindowPlacement(self, hwnd):
+        return (0, WIN32CON['SW_SHOWNORMAL'], (-1, -1), (-1, -1), self.GetWindowRect(hwnd))
+
+    def _win32gui(self) -> types.ModuleType:
+        module = types.ModuleType('win32gui')
+        module.desktop = self
+        module.WindowFromPoint = self.WindowFromPoint
+        module.GetAncestor = lambda hwnd, flags: hwnd
+        module.GetWindow = self.GetWindow
+        module.GetWindowRect = self.GetWindowRect
+        module.GetWindowLong = self.GetWindowLong
+        module.GetClassName = self.GetClassName
+        module.GetWindowText = self.GetWindowText
+        module.IsWindowVisible = self.IsWindowVisible
+        module.IsWindow = lambda hwnd: hwnd in self.windows
+        module.IsIconic = lambda hwnd: False
+        module.GetDesktopWindow = lambda: DESKTOP_HWND
+        module.GetForegroundWindow = lambda: self.foreground
+        module.SetForegroundWindow = lambda hwnd: setattr(self, 'foreground', hwnd)
+        module.GetCapture = lambda: self.capture
+        module.GetWindowPlacement = self.GetWindowPlacement
+        module.ShowWindow = lambda hwnd, cmd: True
+        module.PostMessage = lambda hwnd, msg, wparam, lparam: None
+        module.SetWindowPos = lambda hwnd, after, x, y, w, h, flags: self.set_window_pos(hwnd, after, x, y, w, h, flags)
+        return module
+
+    # ===== win32api =====
+
+    def mouse_event(self, flags, dx, dy, data, extra) -> None:
+        if flags & WIN32CON['MOUSEEVENTF_LEFTUP']:
+            self.capture = 0  # a synthesized button-up ends the move loop
+
+    def _win32api(self) -> types.ModuleType:
+        module = types.ModuleType('win32api')
+        module.GetCursorPos = lambda: self.cursor
+        module.GetAsyncKeyState = lambda vk: 0x8000 if 0 <= vk < 256 and self.keys[vk] else 0
+        module.mouse_event = self.mouse_event
+        return module
+
+    # ===== Installation =====
+
+    def install(self) -> None:
+        """
+        Put the fakes in place of win32gui/win32api/win32con, ctypes.windll
+        and pynput. The first install must run before the listeners are
+        imported; installing another desktop later retargets the fakes
+        already in place (app modules keep the module objects they imported).
+        """
+        installed = sys.modules.get('win32gui')
+        if isinstance(getattr(installed, 'desktop', None), FakeDesktop):
+            installed.__dict__.update(self._win32gui().__dict__)
+            sys.modules['win32api'].__dict__.update(self._win32api().__dict__)
+        else:
+            if f"{__package__}.drag_listener" in sys.modules:
+                raise RuntimeError("Install the fake desktop before importing the listeners")
+
+            win32con = types.ModuleType('win32con')
+            win32con.__dict__.update(WIN32CON)
+            sys.modules['win32con'] = win32con
+            sys.modules['win32gui'] = self._win32gui()
+            sys.modules['win32api'] = self._win32api()
+            ctypes.windll = _FakeWinDLL()
+            sys.modules['pynput'], sys.modules['pynput.keyboard'] = _fake_pynput()
+
+        from .monitor_detection import MonitorDetector
+        MonitorDetector.get_monitors = staticmethod(lambda: [dict(m) for m in self.monitors])
+        set_window_backend(self)
+
+
+class _FakeDLL:
+    """Any exported function returns 0"""
+
+    def __getattr__(self, name):
+        return lambda *args: 0
+
+
+class _FakeWinDLL:
+    """ctypes.windll with only user32/gdi32/kernel32 (no shcore or dwmapi, like an old Windows)"""
+
+    def __init__(self):
+        self.user32 = _FakeDLL()
+        self.gdi32 = _FakeDLL()
+        self.kernel32 = _FakeDLL()
+
+
+# ===== pynput =====
+
+class KeyCode:
+    """pynput.keyboard.KeyCode look-alike"""
+
+    def __init__(self, vk: Optional[int] = None, char: Optional[str] = None):
+        self.vk = vk
+        self.char = char
+
+    @classmethod
+    def from_vk(cls, vk: int) -> 'KeyCode':
+        char = chr(vk).lower() if 0x30 <= vk <= 0x39 or 0x41 <= vk <= 0x5A else None
+        return cls(vk=vk, char=char)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, KeyCode) and other.vk == self.vk
+
+    def __hash__(self) -> int:
+        return hash(self.vk)
+
+    def __repr__(self) -> str:
+        return f"KeyCode(vk={self.vk})"
+
+
+# Special keys with pynput's Windows virtual-key values; later names with the
+# same value are aliases (Key.shift_l is Key.shift), as in pynput
+Key = enum.Enum('Key', [
+    ('alt', KeyCode(0x12)), ('alt_l', KeyCode(0xA4)), ('alt_r', KeyCode(0xA5)), ('alt_gr', KeyCode(0xA5)),
+    ('backspace', KeyCode(0x08)), ('caps_lock', KeyCode(0x14)),
+    ('cmd', KeyCode(0x5B)), ('cmd_l', KeyCode(0x5B)), ('cmd_r', KeyCode(0x5C)),
+    ('ctrl', KeyCode(0x11)), ('ctrl_l', KeyCode(0xA2)), ('ctrl_r', KeyCode(0xA3)),
+    ('delete', KeyCode(0x2E)), ('down', KeyCode(0x28)), ('end', KeyCode(0x23)), ('enter', KeyCode(0x0D)),
+    ('esc', KeyCode(0x1B)), ('home', KeyCode(0x24)), ('left', KeyCode(0x25)),
+    ('page_down', KeyCode(0x22)), ('page_up', KeyCode(0x21)), ('right', KeyCode(0x27)),
+    ('shift', KeyCode(0xA0)), ('shift_l', KeyCode(0xA0)), ('shift_r', KeyCode(0xA1)),
+    ('space', KeyCode(0x20)), ('tab', KeyCode(0x09)), ('up', KeyCode(0x26)),
+    ('insert', KeyCode(0x2D)), ('menu', KeyCode(0x5D)), ('num_lock', KeyCode(0x90)),
+    ('scroll_lock', KeyCode(0x91)),
+    *[(f'f{i}', KeyCode(0x6F + i)) for i in range(1, 21)],
+])
+
+
+def key_for_vk(vk: int):
+    """The key object pynput's Windows listener would report for a virtual-key code"""
+    code = KeyCode.from_vk(vk)
+    try:
+        return Key(code)
+    except ValueError:
+        return code
+
+
+class _Listener:
+    """pynput.keyboard.Listener that never hooks anything (replay calls the handlers)"""
+
+    def __init__(self, on_press=None, on_release=None, **kwargs):
+        self.on_press = on_press
+        self.on_release = on_release
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+def _fake_pynput() -> Tuple[types.ModuleType, types.ModuleType]:
+    keyboard = types.ModuleType('pynput.keyboard')
+    keyboard.Key = Key
+    keyboard.KeyCode = KeyCode
+    keyboard.Listener = _Listener
+    pynput = types.ModuleType('pynput')
+    pynput.keyboard = keyboard
+    return pynput, keyboard
+
+
+# ===== App side =====
+
+class InlineDispatcher:
+    """Runs window operations immediately on the caller's thread, in submission order"""
+
+    def __init__(self):
+        self.executed = 0
+
+    def submit(self, key, fn, *args) -> None:
+        self.executed += 1
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"[DISPATCH] Error in {key}: {e}")
+
+    def pending(self, key):
+        return None  # nothing is ever queued
+
+    def queue_depth(self) -> int:
+        return 0
+
+
+class ReplayOverlay:
+    """Overlay stand-in that counts what would have been drawn"""
+
+    def __init__(self):
+        self.overlay_hwnds = frozenset()
+        self.zone_numbers = {}
+        self.zone_key_labels = {}
+        self.visible = False
+        self.shows = 0
+        self.highlights = 0
+
+    def show(self) -> None:
+        self.visible = True
+        self.shows += 1
+
+    def hide(self) -> None:
+        self.visible = False
+
+    def redraw(self) -> None:
+        pass
+
+    def set_highlight(self, mon_id, zone_name) -> None:
+        self.highlights += 1
+
+
+class ReplayConfigManager(ConfigManager):
+    """Config as loaded from disk, minus anything that writes files (state DB, input trace)"""
+
+    def get_state_tracking_config(self) -> Dict[str, Any]:
+        cfg = super().get_state_tracking_config()
+        cfg['persist'] = False
+        return cfg
+
+    def get_diagnostics_config(self) -> Dict[str, Any]:
+        cfg = super().get_diagnostics_config()
+        cfg['input_trace'] = None
+        return cfg
+
+
+class InputReplay:
+    """
+    The app's input path wired to a fake desktop: ZoneManager (inline
+    dispatcher, simulated window events), DragZoneListener without its
+    worker thread, and HotkeyListener without its hook. run() feeds
+    events one at a time and handles each completely before the next.
+    """
+
+    def __init__(self, config_dir: str, desktop: FakeDesktop):
+        from . import drag_listener
+        from .drag_listener import DragZoneListener
+        from .hotkey_listener import HotkeyListener
+        from .zone_manager import ZoneManager
+
+        self.desktop = desktop
+        self.clock = VirtualClock()
+        self.scheduler = VirtualScheduler(self.clock)
+        drag_listener.time = self.clock  # cooldowns and the settle delay follow the trace
+
+        self.zone_manager = ZoneManager(config_dir, config_manager=ReplayConfigManager(config_dir))
+        self.zone_manager.dispatcher = InlineDispatcher()
+        self.zone_manager.window_events = desktop.events
+
+        self.overlay = ReplayOverlay()
+        self.source = SimulatedInputSource()
+        self.drag = DragZoneListener(self.zone_manager, self.overlay, self.zone_manager.config_manager,
+                                     input_source=self.source)
+        self.drag.scheduler = self.scheduler
+        self.hotkeys = HotkeyListener(self.zone_manager, self.overlay)
+        self.hotkeys.start()
+
+        self.snaps: List[Tuple[int, int, Tuple[int, str], Tuple[int, int, int, int]]] = []  # (t_us, hwnd, zone key, rect)
+        tracker = self.zone_manager.state_tracker
+        mark_as_snapped = tracker.mark_as_snapped
+
+        def record_snap(hwnd, zone_key=None):
+            self.snaps.append((self.clock.now_us, hwnd, zone_key, desktop.rects.get(hwnd)))
+            mark_as_snapped(hwnd, zone_key)
+        tracker.mark_as_snapped = record_snap
+
+    def run(self, events: Iterable[TimedEvent]) -> Dict[str, Any]:
+        """Replay events in order. Returns counts and timings for the report."""
+        kinds = Counter()
+        replayed = 0
+        last_us = 0
+        self.drag.start(worker=False)
+        start = time.perf_counter()
+        try:
+            for t_us, event in events:
+                self.clock.advance_to(t_us)
+                self.scheduler.run_due()
+                self.desktop.apply_input(event)
+                self.source.emit(event.kind, event.x, event.y, event.button, event.vk, event.dy)
+                self.drag.process_pending()
+                if event.kind == KEY_DOWN:
+                    self.hotkeys._on_press(key_for_vk(event.vk))
+                elif event.kind == KEY_UP:
+                    self.hotkeys._on_release(key_for_vk(event.vk))
+                kinds[event.kind] += 1
+                replayed += 1
+                last_us = t_us
+            self.scheduler.flush()
+        finally:
+            elapsed = time.perf_counter() - start
+            self.drag.stop()
+        return {
+            'events': replayed,
+            'kinds': dict(kinds),
+            'trace_seconds': last_us / 1e6,
+            'elapsed': elapsed,
+            'events_per_second': replayed / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+# ===== Synthetic sessions =====
+
+def synthesize_session(desktop: FakeDesktop, drags: int, seed: int = 0) -> Iterator[TimedEvent]:
+    """
+    Generate drag-to-snap sessions against the desktop's current state:
+    grab a window's title bar, hold Shift, sweep across the monitors, then
+    release on a zone, press a digit or scroll; now and then a cycle
+    hotkey. Lazy - each drag starts from where the previous one left the
+    windows, so consume it while replaying.
+    """
+    rng = random.Random(seed)
+    t_us = 0
+    work_areas = [(m['work_x'], m['work_y'], m['work_width'], m['work_height']) for m in desktop.monitors]
+
+    def at(delay_ms: float, event: InputEvent) -> TimedEvent:
+        nonlocal t_us
+        t_us += int(delay_ms * 1000)
+        return t_us, event
+
+    for i in range(drags):
+        hwnd = rng.choice(desktop.app_windows)
+        L, T, R, B = desktop.window_rect(hwnd)
+        x, y = (L + R) // 2, T + TITLE_BAR_HEIGHT // 2
+        yield at(rng.uniform(300, 1200), InputEvent(MOVE, x, y))
+        yield at(rng.uniform(40, 120), InputEvent(BUTTON_DOWN, x, y, button='left'))
+
+        for _ in range(4):
+            x, y = x + 8, y + 4
+            yield at(8, InputEvent(MOVE, x, y))
+        yield at(rng.uniform(50, 150), InputEvent(KEY_DOWN, x, y, vk=VK_LSHIFT))
+
+        wx, wy, ww, wh = rng.choice(work_areas)
+        tx, ty = wx + rng.randrange(ww), wy + rng.randrange(wh)
+        steps = rng.randint(12, 40)
+        for s in range(1, steps + 1):
+            yield at(8, InputEvent(MOVE, x + (tx - x) * s // steps, y + (ty - y) * s // steps))
+        x, y = tx, ty
+
+        finish = rng.random()
+        if finish < 0.2:
+            yield at(rng.uniform(80, 200), InputEvent(SCROLL, x, y, dy=rng.choice((-1, 1))))
+            yield at(8, InputEvent(MOVE, x + 1, y))
+        elif finish < 0.45:
+            digit = 0x30 + rng.randint(1, 9)
+            yield at(rng.uniform(80, 200), InputEvent(KEY_DOWN, x, y, vk=digit))
+            yield at(rng.uniform(40, 90), InputEvent(KEY_UP, x, y, vk=digit))
+        yield at(rng.uniform(60, 200), InputEvent(BUTTON_UP, x, y, button='left'))
+        yield at(rng.uniform(20, 80), InputEvent(KEY_UP, x, y, vk=VK_LSHIFT))
+
+        if i % 10 == 9:
+            for vk in (VK_LCONTROL, VK_LMENU, VK_CLOSE_BRACKET):
+                yield at(rng.uniform(30, 80), InputEvent(KEY_DOWN, x, y, vk=vk))
+            for vk in (VK_CLOSE_BRACKET, VK_LMENU, VK_LCONTROL):
+                yield at(rng.uniform(30, 80), InputEvent(KEY_UP, x, y, vk=vk))
+
+
+def parse_monitors(spec: str) -> List[Dict[str, Any]]:
+    """'2560x1440,1920x1080' -> MonitorDetector-style dicts, left to right, taskbar at the bottom"""
+    monitors = []
+    x = 0
+    for idx, size in enumerate(part for part in spec.split(',') if part.strip()):
+        width, height = (int(v) for v in size.lower().split('x'))
+        monitors.append({
+            'id': idx, 'x': x, 'y': 0, 'width': width, 'height': height,
+            'work_x': x, 'work_y': 0, 'work_width': width, 'work_height': height - TASKBAR_HEIGHT,
+            'is_primary': idx == 0
+        })
+        x += width
+    return monitors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay an input trace through the drag and hotkey listeners")
+    parser.add_argument('trace', nargs='?', help="Input trace to replay (diagnostics.input_trace_file)")
+    parser.add_argument('--config', default='config', help="Config directory (hotkeys.yaml, layouts/)")
+    parser.add_argument('--monitors', default='2560x1440,1920x1080', help="Fake monitors, left to right")
+    parser.add_argument('--windows', type=int, default=2, help="Fake app windows per monitor")
+    parser.add_argument('--synthesize', type=int, default=0, help="Replay this many generated drags instead of a trace")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for --synthesize")
+    parser.add_argument('--save', help="Write the replayed events to this trace file")
+    parser.add_argument('--latency', action='store_true', help="Trace per-stage latency and print the table")
+    parser.add_argument('--show-snaps', type=int, default=10, help="Max snaps to list")
+    parser.add_argument('--verbose', action='store_true', help="Show the app's console output")
+    args = parser.parse_args(argv)
+
+    if not args.trace and not args.synthesize:
+        parser.error("give a trace file or --synthesize N")
+
+    desktop = FakeDesktop(parse_monitors(args.monitors), args.windows)
+    desktop.install()
+
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        replay = InputReplay(args.config, desktop)
+        if args.latency:
+            latency.enabled = True
+
+        if args.synthesize:
+            events = synthesize_session(desktop, args.synthesize, args.seed)
+        else:
+            events = read_input_trace(args.trace)
+        saved: List[TimedEvent] = []
+        if args.save:
+            events = _tee(events, saved)
+
+        result = replay.run(events)
+
+    if args.save:
+        write_input_trace(args.save, saved)
+        print(f"Saved {len(saved)} events to {args.save}")
+
+    kinds = ', '.join(f"{count} {kind}" for kind, count in sorted(result['kinds'].items()))
+    print(f"Replayed {result['events']} events ({kinds}) covering {result['trace_seconds']:.1f}s of input")
+    print(f"Processed in {result['elapsed']:.3f}s: {result['events_per_second']:,.0f} events/s")
+    print(f"Overlay shown {replay.overlay.shows} times, {replay.overlay.highlights} highlight changes")
+
+    snaps = replay.snaps
+    print(f"{len(snaps)} snap(s) across {len({snap[1] for snap in snaps})} window(s)")
+    for t_us, hwnd, zone_key, (x, y, w, h) in snaps[:args.show_snaps]:
+        where = f"zone {zone_key[1]} on Monitor {zone_key[0]}" if zone_key else "no zone"
+        print(f"  {t_us / 1e6:9.3f}s  window {hwnd:#x} -> {where}: {w}x{h} at ({x}, {y})")
+    if len(snaps) > args.show_snaps:
+        print(f"  ... {len(snaps) - args.show_snaps} more")
+
+    if args.latency:
+        print(latency.format_stats())
+    return 0
+
+
+def _tee(events: Iterable[TimedEvent], into: List[TimedEvent]) -> Iterator[TimedEvent]:
+    for item in events:
+        into.append(item)
+        yield item
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
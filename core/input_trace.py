@@ -0,0 +1,141 @@
+# core/input_trace.py
+"""Compact binary input traces - record live input events, read them back for replay"""
+
+import struct
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from .input_events import BUTTON_DOWN, BUTTON_UP, MOVE, SCROLL, KEY_DOWN, KEY_UP, InputEvent
+from .keyboard_state import BUTTON_VKS
+
+# File layout: 8-byte header, then one fixed-size record per event
+MAGIC = b'CZIT'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')  # magic, version, reserved
+RECORD = struct.Struct('<IBBhii')  # delta_us, kind, code (button VK or key VK), scroll dy, x, y
+
+MAX_DELTA_US = 0xFFFFFFFF  # longer idle gaps are clamped (about 71 minutes)
+
+KIND_CODES = {MOVE: 0, BUTTON_DOWN: 1, BUTTON_UP: 2, SCROLL: 3, KEY_DOWN: 4, KEY_UP: 5}
+KINDS = {code: kind for kind, code in KIND_CODES.items()}
+BUTTONS = {vk: name for name, vk in BUTTON_VKS.items()}
+
+TimedEvent = Tuple[int, InputEvent]  # (microseconds since trace start, event)
+
+
+def _pack(delta_us: int, event: InputEvent) -> bytes:
+    if event.kind in (BUTTON_DOWN, BUTTON_UP):
+        code = BUTTON_VKS.get(event.button, 0)
+    else:
+        code = event.vk or 0
+    dy = max(-32768, min(32767, int(event.dy)))
+    return RECORD.pack(min(delta_us, MAX_DELTA_US), KIND_CODES[event.kind], code & 0xFF,
+                       dy, int(event.x), int(event.y))
+
+
+def _unpack(record: bytes) -> Tuple[int, InputEvent]:
+    delta_us, kind_code, code, dy, x, y = RECORD.unpack(record)
+    kind = KINDS.get(kind_code)
+    if kind is None:
+        raise ValueError(f"Unknown event kind {kind_code} in input trace")
+    if kind in (BUTTON_DOWN, BUTTON_UP):
+        return delta_us, InputEvent(kind, x, y, button=BUTTONS.get(code))
+    if kind in (KEY_DOWN, KEY_UP):
+        return delta_us, InputEvent(kind, x, y, vk=code)
+    return delta_us, InputEvent(kind, x, y, dy=dy)
+
+
+class InputTraceRecorder:
+    """
+    Appends input events to a trace file, 16 bytes each. Subscribe
+    record() to an InputEventSource; it only packs and buffers, so it is
+    cheap enough to run on the hook threads. Key events carry the last
+    cursor position, so every record says where the pointer was.
+    """
+
+    def __init__(self, path: str, clock=time.perf_counter_ns):
+        """
+        Args:
+            path: Trace file to create (overwritten)
+            clock: Nanosecond clock used for timestamps
+        """
+        self.path = path
+        self.count = 0
+        self._clock = clock
+        self._file: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._last_ns = 0
+        self._cursor = (0, 0)
+
+    def open(self) -> bool:
+        """Create the file and write the header. Returns False if it can't be written."""
+        try:
+            self._file = open(self.path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0))
+        except OSError as e:
+            print(f"[EVENTS] Can't record input trace to {self.path}: {e}")
+            self._file = None
+            return False
+        self._last_ns = self._clock()
+        print(f"[EVENTS] Recording input trace to {self.path}")
+        return True
+
+    def record(self, event: InputEvent) -> None:
+        """InputEventSource callback - append one event"""
+        with self._lock:
+            if self._file is None:
+                return
+            now = self._clock()
+            delta_us = (now - self._last_ns) // 1000
+            self._last_ns += delta_us * 1000  # keep the remainder so deltas don't drift
+
+            if event.kind in (KEY_DOWN, KEY_UP):
+                event = InputEvent(event.kind, *self._cursor, vk=event.vk)
+            else:
+                self._cursor = (event.x, event.y)
+            self._file.write(_pack(delta_us, event))
+            self.count += 1
+
+    def close(self) -> None:
+        """Flush and close the file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                print(f"[EVENTS] Input trace closed ({self.count} events)")
+
+
+def write_input_trace(path: str, events: Iterable[TimedEvent]) -> int:
+    """Write (t_us, event) pairs (t_us ascending) as a trace file. Returns the event count."""
+    count = 0
+    last_us = 0
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0))
+        for t_us, event in events:
+            f.write(_pack(max(0, t_us - last_us), event))
+            last_us = max(last_us, t_us)
+            count += 1
+    return count
+
+
+def read_input_trace(path: str) -> Iterator[TimedEvent]:
+    """Yield (t_us, event) from a trace file, t_us counted from the start of the recording"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not an input trace (too short)")
+        magic, version, _ = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an input trace")
+        if version != VERSION:
+            raise ValueError(f"Unsupported input trace version {version}")
+
+        t_us = 0
+        while True:
+            record = f.read(RECORD.size)
+            if len(record) < RECORD.size:
+                return  # a recording cut off mid-write just ends early
+            delta_us, event = _unpack(record)
+            t_us += delta_us
+            yield t_us, event
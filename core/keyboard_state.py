@@ -0,0 +1,101 @@
+# core/keyboard_state.py
+"""256-key input state fed by input events, read as one snapshot per tick"""
+
+import threading
+
+from .input_events import BUTTON_DOWN, BUTTON_UP, KEY_DOWN, KEY_UP, InputEvent
+
+BUTTON_VKS = {'left': 0x01, 'right': 0x02, 'middle': 0x04}  # VK_LBUTTON, VK_RBUTTON, VK_MBUTTON
+
+# Left/right modifier VK -> generic VK (VK_SHIFT, VK_CONTROL, VK_MENU)
+GENERIC_MODIFIER_VKS = {
+    0xA0: 0x10, 0xA1: 0x10,
+    0xA2: 0x11, 0xA3: 0x11,
+    0xA4: 0x12, 0xA5: 0x12,
+}
+_SIDES = {0x10: (0xA0, 0xA1), 0x11: (0xA2, 0xA3), 0x12: (0xA4, 0xA5)}
+
+
+class KeyboardSnapshot:
+    """
+    Key and button state for one tick, GetKeyboardState-style.
+
+    down[vk] is 1 while the key is held; edges[vk] is 1 if the key went
+    down at any point since the previous snapshot, so taps shorter than a
+    tick are still seen. Reading never changes anything.
+    """
+
+    __slots__ = ('down', 'edges')
+
+    def __init__(self, down: bytes, edges: bytes):
+        self.down = down
+        self.edges = edges
+
+    def is_down(self, vk: int) -> bool:
+        """Key currently held"""
+        return self.down[vk] != 0
+
+    def is_pressed(self, vk: int) -> bool:
+        """Key held, or tapped since the previous snapshot"""
+        return self.down[vk] != 0 or self.edges[vk] != 0
+
+
+class KeyboardState:
+    """
+    Live 256-entry key state, updated from InputEvents (low-level hooks
+    see every key and button, whatever window has focus). Edges latch
+    until the next snapshot() instead of being cleared by whichever caller
+    reads a key first, as GetAsyncKeyState's edge bit is.
+    """
+
+    def __init__(self):
+        self._down = bytearray(256)
+        self._edges = bytearray(256)
+        self._lock = threading.Lock()
+
+    def apply(self, event: InputEvent) -> None:
+        """Update state from a key or button event (other events are ignored)"""
+        kind = event.kind
+        if kind == KEY_DOWN or kind == KEY_UP:
+            vk = event.vk
+        elif kind == BUTTON_DOWN or kind == BUTTON_UP:
+            vk = BUTTON_VKS.get(event.button)
+        else:
+            return
+        if vk is None or not 0 <= vk < 256:
+            return
+
+        with self._lock:
+            if kind == KEY_DOWN or kind == BUTTON_DOWN:
+                self._set(vk, True)
+            else:
+                self._set(vk, False)
+
+    def _set(self, vk: int, down: bool) -> None:
+        if down:
+            self._down[vk] = 1
+            self._edges[vk] = 1
+        else:
+            self._down[vk] = 0
+
+        # Keep the generic modifier VK in step with its left/right keys
+        generic = GENERIC_MODIFIER_VKS.get(vk)
+        if generic is not None:
+            left, right = _SIDES[generic]
+            if down:
+                self._down[generic] = 1
+                self._edges[generic] = 1
+            elif not (self._down[left] or self._down[right]):
+                self._down[generic] = 0
+
+    def snapshot(self) -> KeyboardSnapshot:
+        """State for the next tick; latched edges are handed over and cleared"""
+        with self._lock:
+            snap = KeyboardSnapshot(bytes(self._down), bytes(self._edges))
+            self._edges = bytearray(256)
+        return snap
+
+    def clear_edges(self) -> None:
+        """Forget latched edges without taking a snapshot"""
+        with self._lock:
+            self._edges = bytearray(256)
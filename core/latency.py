@@ -0,0 +1,155 @@
+# core/latency.py
+"""Input-to-snap latency tracing - per-stage histograms, free when disabled"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+_now = time.perf_counter_ns
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in microseconds: exact below 16 us,
+    then 8 buckets per power of two (at most 12.5% wide). Constant
+    memory however many samples are recorded.
+    """
+
+    __slots__ = ('buckets', 'count', 'total_us', 'max_us')
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, us: int) -> None:
+        if us < 8:
+            idx = us
+        else:
+            shift = us.bit_length() - 4  # keep the top 4 bits (8..15)
+            idx = shift * 8 + (us >> shift)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    @staticmethod
+    def _upper_bound(idx: int) -> int:
+        if idx < 8:
+            return idx
+        shift = idx // 8 - 1
+        return ((idx % 8 + 8 + 1) << shift) - 1
+
+    def percentile(self, p: float) -> int:
+        """Upper bound (us) of the bucket holding the p-th percentile (0 < p <= 100)"""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * p // 100))  # ceil
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= target:
+                return min(self._upper_bound(idx), self.max_us)
+        return self.max_us
+
+
+class LatencyTrace:
+    """Timestamps of one operation's stages; created by LatencyRecorder.start()"""
+
+    __slots__ = ('recorder', 'flow', 'marks')
+
+    def __init__(self, recorder: 'LatencyRecorder', flow: str, started_at: Optional[int] = None):
+        self.recorder = recorder
+        self.flow = flow
+        self.marks: List[Tuple[str, int]] = [('input', started_at or _now())]
+
+    def mark(self, stage: str) -> None:
+        """Time stamp the end of a stage"""
+        self.marks.append((stage, _now()))
+
+    def finish(self, stage: str = 'done') -> None:
+        """Mark the last stage and add the trace to the histograms"""
+        self.marks.append((stage, _now()))
+        self.recorder._record(self)
+
+
+class LatencyRecorder:
+    """
+    Collects LatencyTraces into per-(flow, stage) histograms.
+
+    Call sites guard with `if latency.enabled:` before starting a trace and
+    pass the trace (or None) along with the operation, so a disabled
+    recorder costs one branch per site.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._stage_order: Dict[str, List[str]] = {}  # flow -> stages in first-seen order
+
+    def start(self, flow: str, started_at: Optional[int] = None) -> LatencyTrace:
+        """Begin a trace at started_at (a perf_counter_ns() value, default now)"""
+        return LatencyTrace(self, flow, started_at)
+
+    def _record(self, trace: LatencyTrace) -> None:
+        marks = trace.marks
+        with self._lock:
+            order = self._stage_order.setdefault(trace.flow, [])
+            for (_, prev), (stage, at) in zip(marks, marks[1:]):
+                self._add(trace.flow, stage, (at - prev) // 1000, order)
+            self._add(trace.flow, 'total', (marks[-1][1] - marks[0][1]) // 1000, order)
+
+    def _add(self, flow: str, stage: str, us: int, order: List[str]) -> None:
+        hist = self._histograms.get((flow, stage))
+        if hist is None:
+            hist = self._histograms[(flow, stage)] = LatencyHistogram()
+            order.append(stage)
+        hist.record(us)
+
+    def reset(self) -> None:
+        """Drop everything recorded so far"""
+        with self._lock:
+            self._histograms.clear()
+            self._stage_order.clear()
+
+    def get_stats(self) -> Dict[str, List[dict]]:
+        """{flow: [{stage, count, p50_ms, p95_ms, p99_ms, max_ms}, ...]} with stages in path order"""
+        with self._lock:
+            stats = {}
+            for flow in sorted(self._stage_order):
+                rows = []
+                stages = [stage for stage in self._stage_order[flow] if stage != 'total'] + ['total']
+                for stage in stages:
+                    hist = self._histograms[(flow, stage)]
+                    rows.append({
+                        'stage': stage,
+                        'count': hist.count,
+                        'p50_ms': hist.percentile(50) / 1000.0,
+                        'p95_ms': hist.percentile(95) / 1000.0,
+                        'p99_ms': hist.percentile(99) / 1000.0,
+                        'max_ms': hist.max_us / 1000.0,
+                    })
+                stats[flow] = rows
+            return stats
+
+    def format_stats(self) -> str:
+        """Per-stage latency table for printing"""
+        stats = self.get_stats()
+        if not stats:
+            return "No latency samples" + ("" if self.enabled else " (latency tracing is disabled)")
+
+        lines = []
+        for flow, rows in stats.items():
+            lines.append(f"{flow} ({rows[-1]['count'] if rows else 0} traces)")
+            lines.append(f"  {'stage':<12} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  ms")
+            for row in rows:
+                lines.append(f"  {row['stage']:<12} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+                             f"{row['p99_ms']:>8.2f} {row['max_ms']:>8.2f}")
+        return "\n".join(lines)
+
+
+# App-wide recorder (module attribute so the disabled check stays a single attribute load)
+latency = LatencyRecorder()
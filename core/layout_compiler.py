@@ -0,0 +1,298 @@
+# core/layout_compiler.py
+"""
+Vectorized layout compiler - layout YAMLs + monitor topology -> packed pixel arrays.
+
+Also runnable offline (no Win32 needed) to pre-validate layouts against many
+monitor topologies and benchmark compile cost:
+
+    python -m core.layout_compiler --config config --topologies 5000 --workers 8
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from .config_manager import ConfigManager
+
+
+# Packed zone columns
+COL_X, COL_Y, COL_WIDTH, COL_HEIGHT, COL_FLAGS = range(5)
+
+# Zone flags
+FLAG_RESPECT_TASKBAR = 0x1
+FLAG_HAS_KEY = 0x2
+FLAG_FULLSCREEN = 0x4  # zone named "full" (skipped by hover when ignore_fullscreen_zone)
+
+# Monitor base rects: index 0 = full monitor, 1 = work area; each (x, y, width, height)
+BASE_FULL = 0
+BASE_WORK = 1
+
+
+class LayoutTable:
+    """One layout's zones as parallel arrays, prepared once from YAML"""
+
+    __slots__ = ('name', 'zone_names', 'keys', 'percents', 'flags')
+
+    def __init__(self, name: str, zone_list: List[Dict[str, Any]]):
+        self.name = name
+        self.zone_names = tuple(zone['name'] for zone in zone_list)
+        self.keys = tuple(zone.get('key') for zone in zone_list)
+        self.percents = np.array(
+            [[zone['x_percent'], zone['y_percent'], zone['width_percent'], zone['height_percent']]
+             for zone in zone_list],
+            dtype=np.float64
+        ).reshape(-1, 4)
+
+        flags = np.zeros(len(zone_list), dtype=np.int32)
+        for idx, zone in enumerate(zone_list):
+            # Default respect_taskbar to True (only need to specify if False)
+            if zone.get('respect_taskbar', True):
+                flags[idx] |= FLAG_RESPECT_TASKBAR
+            if 'key' in zone:
+                flags[idx] |= FLAG_HAS_KEY
+            if zone['name'] == 'full':
+                flags[idx] |= FLAG_FULLSCREEN
+        self.flags = flags
+
+
+def prepare_layouts(layouts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turn layout YAML data into LayoutTables.
+    Simplified layouts map to one table; legacy per-monitor layouts map to
+    {monitor_id: LayoutTable}.
+    """
+    prepared = {}
+    for layout_name, layout_data in layouts.items():
+        zone_list = layout_data.get('zones', [])
+        if zone_list:
+            prepared[layout_name] = LayoutTable(layout_name, zone_list)
+        else:
+            prepared[layout_name] = {
+                mc['id']: LayoutTable(layout_name, mc.get('zones', []))
+                for mc in layout_data.get('monitors', [])
+                if mc.get('zones')
+            }
+    return prepared
+
+
+def topology_bases(monitors: List[Dict[str, Any]]) -> np.ndarray:
+    """Get (M, 2, 4) int64 array of full/work-area base rects for detected monitors"""
+    return np.array(
+        [[[mon['x'], mon['y'], mon['width'], mon['height']],
+          [mon['work_x'], mon['work_y'], mon['work_width'], mon['work_height']]]
+         for mon in monitors],
+        dtype=np.int64
+    ).reshape(-1, 2, 4)
+
+
+def compile_table(table: LayoutTable, bases: np.ndarray) -> np.ndarray:
+    """
+    Compile one layout against every monitor at once.
+    Returns (M, N, 5) int32 array of x, y, width, height, flags.
+    Matches the scalar int(base * percent / 100) truncation exactly.
+    """
+    monitor_count = bases.shape[0]
+    zone_count = len(table.zone_names)
+    packed = np.empty((monitor_count, zone_count, 5), dtype=np.int32)
+    if zone_count == 0 or monitor_count == 0:
+        return packed
+
+    # Pick full or work-area base per zone -> (M, N, 4)
+    which = np.where(table.flags & FLAG_RESPECT_TASKBAR, BASE_WORK, BASE_FULL)
+    base = bases[:, which, :]
+
+    # Percent of (w, h, w, h), truncated toward zero like int()
+    dims = base[:, :, [2, 3, 2, 3]].astype(np.float64)
+    scaled = np.trunc(dims * table.percents / 100).astype(np.int64)
+
+    packed[:, :, COL_X] = base[:, :, 0] + scaled[:, :, 0]
+    packed[:, :, COL_Y] = base[:, :, 1] + scaled[:, :, 1]
+    packed[:, :, COL_WIDTH] = scaled[:, :, 2]
+    packed[:, :, COL_HEIGHT] = scaled[:, :, 3]
+    packed[:, :, COL_FLAGS] = table.flags
+    return packed
+
+
+def compile_layouts(prepared: Dict[str, Any],
+                    monitors: List[Dict[str, Any]]) -> Dict[Tuple[str, int], Tuple[LayoutTable, np.ndarray]]:
+    """
+    Compile every prepared layout against a monitor topology.
+    Returns {(layout_name, monitor_id): (LayoutTable, (N, 5) int32 array)}.
+    Layouts with no zones for a monitor are left out.
+    """
+    bases = topology_bases(monitors)
+    compiled = {}
+
+    for layout_name, table in prepared.items():
+        if isinstance(table, LayoutTable):
+            if not table.zone_names:
+                continue
+            packed = compile_table(table, bases)
+            for row, mon in enumerate(monitors):
+                compiled[(layout_name, mon['id'])] = (table, packed[row])
+        else:
+            # LEGACY: per-monitor zone lists
+            for row, mon in enumerate(monitors):
+                mon_table = table.get(mon['id'])
+                if mon_table is None:
+                    continue
+                packed = compile_table(mon_table, bases[row:row + 1])
+                compiled[(layout_name, mon['id'])] = (mon_table, packed[0])
+
+    return compiled
+
+
+def packed_to_zones(table: LayoutTable, packed: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    """Convert one monitor's packed rows to the {zone_name: {'x', 'y', 'width', 'height', ['key']}} form"""
+    zones = {}
+    for zone_name, key, (x, y, width, height, flags) in zip(table.zone_names, table.keys, packed.tolist()):
+        entry = {'x': x, 'y': y, 'width': width, 'height': height}
+        # Carry optional YAML fields through (e.g., key)
+        if flags & FLAG_HAS_KEY:
+            entry['key'] = key
+        zones[zone_name] = entry
+    return zones
+
+
+# ===== Offline validation / benchmark =====
+
+COMMON_RESOLUTIONS = [
+    (1366, 768), (1600, 900), (1920, 1080), (1920, 1200), (2560, 1080),
+    (2560, 1440), (3440, 1440), (3840, 1600), (3840, 2160), (5120, 1440),
+    (1080, 1920), (1440, 2560),  # portrait
+]
+
+
+def synthetic_topology(rng: random.Random, max_monitors: int = 6) -> List[Dict[str, Any]]:
+    """Generate a plausible desk setup in MonitorDetector.get_monitors() format"""
+    monitors = []
+    x = 0
+    for idx in range(rng.randint(1, max_monitors)):
+        width, height = rng.choice(COMMON_RESOLUTIONS)
+        y = rng.randint(-height // 4, height // 4) if idx else 0
+
+        # Taskbar on a random edge (primary always has one; others sometimes)
+        work_x, work_y, work_width, work_height = x, y, width, height
+        if idx == 0 or rng.random() < 0.5:
+            bar = rng.choice([40, 48, 60, 72])
+            edge = rng.choice(['bottom', 'bottom', 'top', 'left', 'right'])
+            if edge == 'bottom':
+                work_height -= bar
+            elif edge == 'top':
+                work_y += bar
+                work_height -= bar
+            elif edge == 'left':
+                work_x += bar
+                work_width -= bar
+            else:
+                work_width -= bar
+
+        monitors.append({
+            'id': idx, 'x': x, 'y': y, 'width': width, 'height': height,
+            'work_x': work_x, 'work_y': work_y, 'work_width': work_width, 'work_height': work_height,
+            'is_primary': idx == 0
+        })
+        x += width
+
+    # Same ordering rules as MonitorDetector
+    monitors.sort(key=lambda m: (m['x'], m['y']))
+    for i, mon in enumerate(monitors):
+        mon['id'] = i
+    return monitors
+
+
+def validate_compiled(compiled: Dict[Tuple[str, int], Tuple[LayoutTable, np.ndarray]],
+                      monitors: List[Dict[str, Any]]) -> List[str]:
+    """Check compiled zones are non-empty and inside their base area"""
+    issues = []
+    bases = topology_bases(monitors)
+    row_of = {mon['id']: row for row, mon in enumerate(monitors)}
+
+    for (layout_name, mon_id), (table, packed) in compiled.items():
+        base = bases[row_of[mon_id], np.where(packed[:, COL_FLAGS] & FLAG_RESPECT_TASKBAR, BASE_WORK, BASE_FULL)]
+        empty = (packed[:, COL_WIDTH] <= 0) | (packed[:, COL_HEIGHT] <= 0)
+        outside = ((packed[:, COL_X] < base[:, 0]) |
+                   (packed[:, COL_Y] < base[:, 1]) |
+                   (packed[:, COL_X] + packed[:, COL_WIDTH] > base[:, 0] + base[:, 2]) |
+                   (packed[:, COL_Y] + packed[:, COL_HEIGHT] > base[:, 1] + base[:, 3]))
+
+        for idx in np.nonzero(empty | outside)[0]:
+            problem = "empty" if empty[idx] else "outside monitor"
+            issues.append(f"{layout_name}/{table.zone_names[idx]} on Monitor {mon_id}: {problem} "
+                          f"{packed[idx, COL_WIDTH]}x{packed[idx, COL_HEIGHT]} at "
+                          f"({packed[idx, COL_X]}, {packed[idx, COL_Y]})")
+    return issues
+
+
+def _compile_batch(args) -> Tuple[int, int, List[str]]:
+    """Compile and validate a batch of topologies (process pool worker)"""
+    layouts, topologies = args
+    prepared = prepare_layouts(layouts)
+    zone_count = 0
+    issues = []
+    for monitors in topologies:
+        compiled = compile_layouts(prepared, monitors)
+        zone_count += sum(packed.shape[0] for _, packed in compiled.values())
+        issues.extend(validate_compiled(compiled, monitors))
+    return len(topologies), zone_count, issues
+
+
+def _load_topologies(path: Optional[str], count: int, seed: int) -> List[List[Dict[str, Any]]]:
+    """Load topologies from a YAML list of monitor lists, or generate synthetic ones"""
+    if path:
+        with open(path, 'r') as f:
+            return yaml.safe_load(f) or []
+    rng = random.Random(seed)
+    return [synthetic_topology(rng) for _ in range(count)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile and validate layouts against monitor topologies")
+    parser.add_argument('--config', default='config', help="Config directory containing layouts/")
+    parser.add_argument('--topologies', type=int, default=1000, help="Number of synthetic topologies")
+    parser.add_argument('--topology-file', help="YAML list of monitor lists (MonitorDetector format)")
+    parser.add_argument('--workers', type=int, default=0, help="Process pool size (0 = compile in-process)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for synthetic topologies")
+    parser.add_argument('--show-issues', type=int, default=10, help="Max issues to print")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager(args.config)
+    config.load_layouts()
+    layouts = config.layouts
+    topologies = _load_topologies(args.topology_file, args.topologies, args.seed)
+
+    print(f"Compiling {len(layouts)} layouts ({', '.join(layouts.keys())}) "
+          f"against {len(topologies)} topologies")
+
+    start = time.perf_counter()
+    if args.workers > 0:
+        chunk = max(1, len(topologies) // (args.workers * 4))
+        batches = [(layouts, topologies[i:i + chunk]) for i in range(0, len(topologies), chunk)]
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_compile_batch, batches))
+    else:
+        results = [_compile_batch((layouts, topologies))]
+    elapsed = time.perf_counter() - start
+
+    compiled_topologies = sum(r[0] for r in results)
+    zone_count = sum(r[1] for r in results)
+    issues = [issue for r in results for issue in r[2]]
+
+    print(f"Compiled {zone_count} zones in {elapsed:.3f}s "
+          f"({elapsed / max(1, compiled_topologies) * 1e6:.1f} us/topology)")
+    if issues:
+        print(f"{len(issues)} issue(s) found:")
+        for issue in issues[:args.show_issues]:
+            print(f"  {issue}")
+    else:
+        print("All zones valid")
+    return 1 if issues else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
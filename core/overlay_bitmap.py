@@ -0,0 +1,112 @@
+# core/overlay_bitmap.py
+"""Overlay frames as premultiplied BGRA pixels - rasterized bases cached sparse, fills composited with numpy"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+Rect = Tuple[int, int, int, int]  # (left, top, right, bottom), pixel coords in the frame
+
+
+def premultiplied(color_ref: int, alpha: int) -> int:
+    """COLORREF (0x00BBGGRR) at alpha -> one premultiplied BGRA pixel as stored in a 32-bit DIB"""
+    r = (color_ref & 0xFF) * alpha // 255
+    g = ((color_ref >> 8) & 0xFF) * alpha // 255
+    b = ((color_ref >> 16) & 0xFF) * alpha // 255
+    return (alpha << 24) | (r << 16) | (g << 8) | b
+
+
+class OverlayBase:
+    """
+    What GDI drew for one monitor/layout (white outlines and labels on
+    black), kept as the coverage of the few pixels it touched rather than
+    a full frame: a 4K base is a few hundred KB instead of 33 MB.
+    """
+
+    __slots__ = ('width', 'height', 'index', 'coverage', '_by_rect')
+
+    def __init__(self, width: int, height: int, index: np.ndarray, coverage: np.ndarray):
+        self.width = width
+        self.height = height
+        self.index = index  # flat pixel indices with coverage > 0
+        self.coverage = coverage  # uint8 coverage of each (255 = solid)
+        self._by_rect: Dict[Rect, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_pixels(cls, pixels: np.ndarray) -> 'OverlayBase':
+        """Capture a frame GDI rendered white-on-black (alpha ignored) as a base"""
+        height, width = pixels.shape
+        coverage = ((pixels >> 8) & 0xFF).astype(np.uint8).ravel()  # green channel
+        index = np.flatnonzero(coverage).astype(np.int32)
+        return cls(width, height, index, coverage[index])
+
+    @property
+    def nbytes(self) -> int:
+        return self.index.nbytes + self.coverage.nbytes
+
+    def in_rect(self, rect: Rect) -> Tuple[np.ndarray, np.ndarray]:
+        """(index, coverage) of the covered pixels inside rect (memoized per rect)"""
+        hit = self._by_rect.get(rect)
+        if hit is None:
+            left, top, right, bottom = rect
+            ys, xs = np.divmod(self.index, self.width)
+            mask = (ys >= top) & (ys < bottom) & (xs >= left) & (xs < right)
+            hit = self._by_rect[rect] = (self.index[mask], self.coverage[mask])
+        return hit
+
+    def compose(self, pixels: np.ndarray, fill: int, rect: Optional[Rect] = None) -> int:
+        """
+        Write the base over a premultiplied fill into pixels - the whole
+        frame, or just rect. Returns the number of pixels written.
+        """
+        if rect is None:
+            pixels.fill(fill)
+            index, coverage = self.index, self.coverage
+            written = pixels.size
+        else:
+            left, top, right, bottom = rect
+            pixels[top:bottom, left:right] = fill
+            index, coverage = self.in_rect(rect)
+            written = (right - left) * (bottom - top)
+
+        if index.size:
+            pixels.reshape(-1)[index] = _white_over(coverage, fill)
+        return written
+
+
+def _white_over(coverage: np.ndarray, fill: int) -> np.ndarray:
+    """Premultiplied white at each coverage composited over a premultiplied fill pixel"""
+    c = coverage.astype(np.uint32)
+    inv = 255 - c
+    out = np.zeros(c.shape, dtype=np.uint32)
+    for shift in (0, 8, 16, 24):  # B, G, R, A
+        channel = (fill >> shift) & 0xFF
+        out |= (c + channel * inv // 255) << shift
+    return out
+
+
+class BaseCache:
+    """Most recently used OverlayBases by content key, bounded per window"""
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._bases: "OrderedDict[Hashable, OverlayBase]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[OverlayBase]:
+        base = self._bases.get(key)
+        if base is not None:
+            self._bases.move_to_end(key)
+        return base
+
+    def put(self, key: Hashable, base: OverlayBase) -> None:
+        self._bases[key] = base
+        self._bases.move_to_end(key)
+        while len(self._bases) > self.max_entries:
+            self._bases.popitem(last=False)
+
+    def clear(self) -> None:
+        self._bases.clear()
+
+    def __len__(self) -> int:
+        return len(self._bases)
@@ -4,12 +4,19 @@ from ctypes import wintypes as wt
 import win32con as wc
 import win32gui as wg
 import win32api as wa
+import numpy as np
+
+from .overlay_bitmap import BaseCache, OverlayBase, premultiplied
+from .window_ops import window_move_transaction
 
 user32 = ctypes.windll.user32
 gdi32 = ctypes.windll.gdi32
 shcore = ctypes.windll.shcore if hasattr(ctypes.windll, "shcore") else None
+dwmapi = ctypes.windll.dwmapi if hasattr(ctypes.windll, "dwmapi") else None
 
 MONITOR_DEFAULTTONEAREST = 2
+GA_ROOT = 2
+DWMWA_CLOAKED = 14
 AWT_DPI_AWARE_PER_MONITOR = 2
 
 try:
@@ -27,9 +34,128 @@ def get_dpi_for_monitor(x, y):
         return dpix.value
     return 96
 
+# ---- Paint cost accounting ----
+class PaintStats:
+    """
+    Counts overlay paint work: full vs partial frames, pixels composed, GDI
+    calls and objects created, bases rasterized and frames reused as-is
+    """
+    def __init__(self):
+        self.full_repaints = 0
+        self.partial_repaints = 0
+        self.pixels = 0
+        self.gdi_calls = 0
+        self.gdi_objects_created = 0
+        self.bases_rendered = 0
+        self.frames_reused = 0
+
+    def record(self, partial, pixels, gdi_calls):
+        if partial:
+            self.partial_repaints += 1
+        else:
+            self.full_repaints += 1
+        self.pixels += pixels
+        self.gdi_calls += gdi_calls
+
+    def as_dict(self):
+        paints = self.full_repaints + self.partial_repaints
+        return {
+            'full_repaints': self.full_repaints,
+            'partial_repaints': self.partial_repaints,
+            'pixels': self.pixels,
+            'gdi_calls': self.gdi_calls,
+            'gdi_objects_created': self.gdi_objects_created,
+            'gdi_objects_per_paint': self.gdi_objects_created / paints if paints else 0.0,
+            'bases_rendered': self.bases_rendered,
+            'frames_reused': self.frames_reused,
+        }
+
+# Overlay palette (COLORREF, 0x00BBGGRR) and label font
+OUTLINE_COLOR = 0x00FFFFFF
+HIGHLIGHT_COLOR = 0x004080FF
+BACKGROUND_COLOR = 0x00000000
+LABEL_COLOR = 0x00FFFFFF
+LABEL_FONT = ("Arial", 72, 700)  # face, height in pixels at 96 DPI, weight
+ANTIALIASED_QUALITY = 4  # grey antialiasing - ClearType fringes would show up as coloured coverage
+
+# Layered window update (per-pixel alpha)
+AC_SRC_OVER = 0x00
+AC_SRC_ALPHA = 0x01
+ULW_ALPHA = 0x02
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+class BLENDFUNCTION(ctypes.Structure):
+    _fields_ = [("BlendOp", ctypes.c_ubyte), ("BlendFlags", ctypes.c_ubyte),
+                ("SourceConstantAlpha", ctypes.c_ubyte), ("AlphaFormat", ctypes.c_ubyte)]
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [("biSize", wt.DWORD), ("biWidth", wt.LONG), ("biHeight", wt.LONG),
+                ("biPlanes", wt.WORD), ("biBitCount", wt.WORD), ("biCompression", wt.DWORD),
+                ("biSizeImage", wt.DWORD), ("biXPelsPerMeter", wt.LONG), ("biYPelsPerMeter", wt.LONG),
+                ("biClrUsed", wt.DWORD), ("biClrImportant", wt.DWORD)]
+
+class UPDATELAYEREDWINDOWINFO(ctypes.Structure):
+    _fields_ = [("cbSize", wt.DWORD), ("hdcDst", wt.HDC), ("pptDst", ctypes.POINTER(wt.POINT)),
+                ("psize", ctypes.POINTER(wt.SIZE)), ("hdcSrc", wt.HDC), ("pptSrc", ctypes.POINTER(wt.POINT)),
+                ("crKey", wt.DWORD), ("pblend", ctypes.POINTER(BLENDFUNCTION)), ("dwFlags", wt.DWORD),
+                ("prcDirty", ctypes.POINTER(wt.RECT))]
+
+# ---- GDI objects reused across paints ----
+class GdiObjectCache:
+    """
+    Outline pen and label font for one overlay window. Created on first
+    use and kept until something they are built from (monitor DPI,
+    palette, font) changes, or the window is destroyed - rendering a new
+    base only selects them.
+    """
+    def __init__(self, paint_stats):
+        self.paint_stats = paint_stats
+        self.key = None
+        self.pen = None
+        self.font = None
+
+    def ensure(self, dpi):
+        """Build the objects for dpi unless the cached ones already match. Returns GDI calls made."""
+        key = (dpi, OUTLINE_COLOR, LABEL_FONT)
+        if key == self.key:
+            return 0
+        calls = self.release()
+
+        face, height, weight = LABEL_FONT
+        self.pen = gdi32.CreatePen(wc.PS_SOLID, 3, OUTLINE_COLOR)
+        self.font = gdi32.CreateFontW(
+            -(-height * dpi // 96), 0, 0, 0, weight, 0, 0, 0, 0, 0, 0, ANTIALIASED_QUALITY, 0, face
+        )
+        self.key = key
+        self.paint_stats.gdi_objects_created += 2
+        return calls + 2
+
+    def release(self):
+        """Delete the cached objects. Returns GDI calls made."""
+        calls = 0
+        for obj in (self.pen, self.font):
+            if obj:
+                gdi32.DeleteObject(obj)
+                calls += 1
+        self.pen = self.font = None
+        self.key = None
+        return calls
+
 # ---- Simple Overlay Window with proper callback ----
 class OverlayWindow:
-    def __init__(self, mon_rect, alpha=180, mon_id=0):
+    """
+    One monitor's overlay: a layered window whose content is a 32-bit
+    premultiplied BGRA DIB pushed with UpdateLayeredWindow. Fills are
+    translucent (alpha) while outlines and labels are opaque, and the
+    system keeps the pushed frame across hide/show.
+
+    What GDI draws for a layout (outlines, labels) is rasterized once per
+    monitor/layout/labels and cached as an OverlayBase; frames are
+    composed from it with numpy, and highlight changes recompose only the
+    affected zone rects.
+    """
+    def __init__(self, mon_rect, alpha=180, mon_id=0, paint_stats=None):
         self.mon = mon_rect  # (x, y, w, h)
         self.mon_id = mon_id  # Store which monitor this overlay belongs to
         self.alpha = alpha
@@ -39,6 +165,17 @@ class OverlayWindow:
         self.highlight_name = None
         self.zone_numbers = {}  # Maps (mon_id, zone_name) -> number
         self.zone_key_labels = {}  # {(mon_id, zone_name): "Q" / "Num1" / "2" ...}
+        self.paint_stats = paint_stats or PaintStats()
+        self.gdi = GdiObjectCache(self.paint_stats)
+        self.dpi = 96
+        self.bases = BaseCache()
+        self.pixels = None  # numpy (h, w) uint32 view of the DIB bits
+        self._mem_dc = None
+        self._dib = None
+        self._old_bitmap = None
+        self._base = None  # OverlayBase of the frame currently in the DIB
+        self._frame = None  # (base key, highlight name) the window shows
+        self._zone_rects = {}  # zone name -> rect in window coords, for the current base
         self._create()
 
     def _create(self):
@@ -60,11 +197,35 @@ class OverlayWindow:
         if not self.hwnd:
             raise Exception("Failed to create window")
         
-        # Set layered attributes
-        wg.SetLayeredWindowAttributes(self.hwnd, 0, self.alpha, wc.LWA_ALPHA)
+        # Content comes from UpdateLayeredWindow (no SetLayeredWindowAttributes -
+        # a window using that can't take per-pixel alpha frames)
         wg.SetWindowPos(self.hwnd, wc.HWND_TOPMOST, 0, 0, 0, 0,
                        wc.SWP_NOMOVE | wc.SWP_NOSIZE | wc.SWP_NOACTIVATE)
 
+    def _ensure_surface(self):
+        """Create the memory DC and top-down 32-bit DIB on first use"""
+        if self.pixels is not None:
+            return
+        _, _, w, h = self.mon
+        bmi = BITMAPINFOHEADER()
+        bmi.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        bmi.biWidth = w
+        bmi.biHeight = -h  # top-down rows
+        bmi.biPlanes = 1
+        bmi.biBitCount = 32
+        bmi.biCompression = BI_RGB
+
+        bits = ctypes.c_void_p()
+        self._mem_dc = gdi32.CreateCompatibleDC(0)
+        self._dib = gdi32.CreateDIBSection(self._mem_dc, ctypes.byref(bmi), DIB_RGB_COLORS,
+                                           ctypes.byref(bits), None, 0)
+        if not self._dib or not bits.value:
+            gdi32.DeleteDC(self._mem_dc)
+            self._mem_dc = None
+            raise Exception("Failed to create overlay bitmap")
+        self._old_bitmap = gdi32.SelectObject(self._mem_dc, self._dib)
+        self.pixels = np.ctypeslib.as_array((ctypes.c_uint32 * (w * h)).from_address(bits.value)).reshape(h, w)
+
     def show(self):
         if not self.visible:
             wg.ShowWindow(self.hwnd, wc.SW_SHOWNA)
@@ -77,102 +238,180 @@ class OverlayWindow:
 
     def redraw(self):
         """
-        Repaint THIS overlay window only. All required data is already on self:
+        Bring THIS overlay window up to date. All required data is already on self:
           - self.zones           : list[dict] each with "x","y","width","height","name"
           - self.zone_numbers    : {(mon_id, zone_name): number}
           - self.mon_id          : this window's monitor id
           - self.highlight_name  : (optional) name of highlighted zone
+        A frame the window already shows is not pushed again; a layout seen
+        before is composed from its cached base without any GDI drawing.
         """
         # If manager set a generic 'highlight' attr, mirror it to highlight_name
         if getattr(self, "highlight", None) is not None and not getattr(self, "highlight_name", None):
             self.highlight_name = self.highlight
 
-        # Paint immediately to avoid relying on WM_PAINT for this transparent window
-        hdc = wg.GetDC(self.hwnd)
-        try:
-            self._paint_direct(hdc)
-        finally:
-            wg.ReleaseDC(self.hwnd, hdc)
+        x, y, w, h = self.mon
+        # Pick up DPI changes on full redraws
+        self.dpi = get_dpi_for_monitor(x + w // 2, y + h // 2)
+        items = self._zone_items()
+        key = (items, self.dpi, self.alpha)
+        if self._frame == (key, self.highlight_name):
+            self.paint_stats.frames_reused += 1
+            return
+        if self._frame is not None and self._frame[0] == key:
+            # Same layout, other highlight: only the two zones change
+            self._recompose({self._frame[1], self.highlight_name})
+            return
+
+        self._ensure_surface()
+        calls = 0
+        base = self.bases.get(key)
+        if base is None:
+            base, calls = self._render_base(items)
+            self.bases.put(key, base)
+        self._base = base
+        self._zone_rects = {name: self._clip(rx, ry, rw, rh) for name, rx, ry, rw, rh, _ in items}
+
+        pixels = base.compose(self.pixels, premultiplied(BACKGROUND_COLOR, self.alpha))
+        rect = self._zone_rects.get(self.highlight_name)
+        if rect is not None:
+            base.compose(self.pixels, premultiplied(HIGHLIGHT_COLOR, self.alpha), rect)
+        calls += self._push()
+        self._frame = (key, self.highlight_name)
+        self.paint_stats.record(False, pixels, calls)
+
+    def repaint_zones(self, zone_names):
+        """
+        Recompose only the given zones (e.g. old and new highlight) over the
+        cached base, and push just that part of the frame.
+        """
+        if self._base is None or self._frame is None:
+            self.redraw()
+            return
+        self._recompose(zone_names)
+
+    def _recompose(self, zone_names):
+        """Compose the named zones over the cached base and push their bounding rect"""
+        rects = [(name, self._zone_rects[name]) for name in zone_names if name in self._zone_rects]
+        if not rects:
+            return
+        # Plain zones first, so the highlight wins where zones overlap
+        rects.sort(key=lambda item: item[0] == self.highlight_name)
+
+        pixels = 0
+        for name, rect in rects:
+            color = HIGHLIGHT_COLOR if name == self.highlight_name else BACKGROUND_COLOR
+            pixels += self._base.compose(self.pixels, premultiplied(color, self.alpha), rect)
+
+        dirty = (min(r[0] for _, r in rects), min(r[1] for _, r in rects),
+                 max(r[2] for _, r in rects), max(r[3] for _, r in rects))
+        calls = self._push(dirty)
+        self._frame = (self._frame[0], self.highlight_name)
+        self.paint_stats.record(True, pixels, calls)
 
     def set_zone_numbers(self, zone_numbers):
         """Update zone number mappings"""
         self.zone_numbers = zone_numbers
 
-    def _paint_direct(self, hdc):
-        """Paint directly to DC without WM_PAINT"""
-        x0, y0, w, h = self.mon
-        
-        # Clear background
-        brush = gdi32.CreateSolidBrush(0x00000000)
-        rect = wt.RECT(0, 0, w, h)
-        user32.FillRect(hdc, ctypes.byref(rect), brush)
-        gdi32.DeleteObject(brush)
-        
-        # Create drawing objects
-        white_pen = gdi32.CreatePen(wc.PS_SOLID, 3, 0x00FFFFFF)
-        highlight_brush = gdi32.CreateSolidBrush(0x004080FF)
+    def _clip(self, rx, ry, rw, rh):
+        _, _, w, h = self.mon
+        return (max(rx, 0), max(ry, 0), min(rx + rw, w), min(ry + rh, h))
+
+    def _zone_items(self):
+        """(name, x, y, w, h, label) per zone in window coords - everything a base depends on"""
+        x0, y0, _, _ = self.mon
+        return tuple(
+            (z.get("name"), z["x"] - x0, z["y"] - y0, z["width"], z["height"], self._zone_label(z.get("name")))
+            for z in self.zones
+        )
+
+    def _zone_label(self, zone_name):
+        # Choose label: prefer per-zone key label; else the assigned number
+        zone_label = None
+
+        # If caller provided labels dict, try it first
+        if hasattr(self, "zone_key_labels"):
+            zone_label = self.zone_key_labels.get((self.mon_id, zone_name))
+
+        # Fallback: search number map
+        if not zone_label:
+            zone_num = None
+            for (mon_id_key, zone_name_key), num in self.zone_numbers.items():
+                if zone_name_key == zone_name and mon_id_key == self.mon_id:
+                    zone_num = num
+                    break
+            if zone_num is not None:
+                zone_label = str(zone_num)
+        return zone_label
+
+    def _render_base(self, items):
+        """Rasterize outlines and labels white-on-black into the DIB and capture them. Returns (base, GDI calls)."""
+        hdc = self._mem_dc
+        gdi = self.gdi
+        calls = gdi.ensure(self.dpi)
+
+        self.pixels.fill(0)
         null_brush = wg.GetStockObject(wc.NULL_BRUSH)
-        
-        old_pen = gdi32.SelectObject(hdc, white_pen)
+        old_pen = gdi32.SelectObject(hdc, gdi.pen)
+        old_brush = gdi32.SelectObject(hdc, null_brush)
+        old_font = gdi32.SelectObject(hdc, gdi.font)
         gdi32.SetBkMode(hdc, wc.TRANSPARENT)
-        gdi32.SetTextColor(hdc, 0x00FFFFFF)
-        
-        # Create larger font for zone numbers
-        number_font = gdi32.CreateFontW(
-            72, 0, 0, 0, 700, 0, 0, 0, 0, 0, 0, 0, 0, "Arial"
-        )
-        old_font = gdi32.SelectObject(hdc, number_font)
-        
-        for z in self.zones:
-            rx = z["x"] - x0
-            ry = z["y"] - y0
-            rw = z["width"]
-            rh = z["height"]
-            
-            # Fill or outline
-            if z.get("name") == self.highlight_name:
-                old_brush = gdi32.SelectObject(hdc, highlight_brush)
-            else:
-                old_brush = gdi32.SelectObject(hdc, null_brush)
-            
+        gdi32.SetTextColor(hdc, LABEL_COLOR)
+        calls += 6
+
+        for _, rx, ry, rw, rh, label in items:
             gdi32.Rectangle(hdc, rx, ry, rx + rw, ry + rh)
-            gdi32.SelectObject(hdc, old_brush)
-            
-            # Choose label: prefer per-zone key label; else the assigned number
-            zone_label = None
-            zone_name_to_find = z.get("name")
-
-            # If caller provided labels dict, try it first
-            if hasattr(self, "zone_key_labels"):
-                zone_label = self.zone_key_labels.get((self.mon_id, zone_name_to_find))
-
-            # Fallback: search number map
-            if not zone_label:
-                zone_num = None
-                for (mon_id_key, zone_name_key), num in self.zone_numbers.items():
-                    if zone_name_key == zone_name_to_find and mon_id_key == self.mon_id:
-                        zone_num = num
-                        break
-                if zone_num is not None:
-                    zone_label = str(zone_num)
-
-            # Draw label if we have one
-            if zone_label:
+            calls += 1
+            if label:
                 text_rect = wt.RECT(rx, ry, rx + rw, ry + rh)
-                user32.DrawTextW(hdc, zone_label, -1, ctypes.byref(text_rect),
-                                wc.DT_CENTER | wc.DT_VCENTER | wc.DT_SINGLELINE)
-        
-        # Cleanup
+                user32.DrawTextW(hdc, label, -1, ctypes.byref(text_rect),
+                                 wc.DT_CENTER | wc.DT_VCENTER | wc.DT_SINGLELINE)
+                calls += 1
+
         gdi32.SelectObject(hdc, old_font)
-        gdi32.DeleteObject(number_font)
+        gdi32.SelectObject(hdc, old_brush)
         gdi32.SelectObject(hdc, old_pen)
-        gdi32.DeleteObject(white_pen)
-        gdi32.DeleteObject(highlight_brush)
+        gdi32.GdiFlush()  # GDI batches - make sure the bits are written before reading them
+        calls += 4
+
+        self.paint_stats.bases_rendered += 1
+        return OverlayBase.from_pixels(self.pixels), calls
+
+    def _push(self, dirty=None):
+        """Hand the DIB (or its dirty rect) to the window. Returns GDI calls made."""
+        x, y, w, h = self.mon
+        pt_dst = wt.POINT(x, y)
+        size = wt.SIZE(w, h)
+        pt_src = wt.POINT(0, 0)
+        blend = BLENDFUNCTION(AC_SRC_OVER, 0, 255, AC_SRC_ALPHA)
+        info = UPDATELAYEREDWINDOWINFO()
+        info.cbSize = ctypes.sizeof(UPDATELAYEREDWINDOWINFO)
+        info.pptDst = ctypes.pointer(pt_dst)
+        info.psize = ctypes.pointer(size)
+        info.hdcSrc = self._mem_dc
+        info.pptSrc = ctypes.pointer(pt_src)
+        info.pblend = ctypes.pointer(blend)
+        info.dwFlags = ULW_ALPHA
+        if dirty is not None:
+            dirty_rect = wt.RECT(*dirty)
+            info.prcDirty = ctypes.pointer(dirty_rect)
+        user32.UpdateLayeredWindowIndirect(self.hwnd, ctypes.byref(info))
+        return 1
 
     def destroy(self):
         if self.hwnd:
             wg.DestroyWindow(self.hwnd)
             self.hwnd = None
+        if self._mem_dc:
+            gdi32.SelectObject(self._mem_dc, self._old_bitmap)
+            gdi32.DeleteObject(self._dib)
+            gdi32.DeleteDC(self._mem_dc)
+            self._mem_dc = self._dib = self._old_bitmap = None
+            self.pixels = None
+        self.gdi.release()
+        self.bases.clear()
+        self._base = None
+        self._frame = None
 
 # ---- Manager ----
 class Win32OverlayManager:
@@ -184,6 +423,9 @@ class Win32OverlayManager:
         self.highlight = None
         self.zone_numbers = {}  # Maps (mon_id, zone_name) -> number
         self.zone_key_labels = {}  # {(mon_id, zone_name): "Q", "Num1", ...}
+        self.paint_stats = PaintStats()
+        self._painted = None  # (geometry, zone_numbers, zone_key_labels) of the last full redraw
+        self.overlay_hwnds = frozenset()  # built once with the windows, for window_from_point()
         self._build_windows()
 
     def _build_windows(self):
@@ -191,9 +433,11 @@ class Win32OverlayManager:
             ow = OverlayWindow(
                 (mon["x"], mon["y"], mon["width"], mon["height"]),
                 self.alpha,
-                mon_id=mon["id"]
+                mon_id=mon["id"],
+                paint_stats=self.paint_stats
             )
             self.windows.append(ow)
+        self.overlay_hwnds = frozenset(w.hwnd for w in self.windows)
 
     def start(self):
         pass  # Nothing needed
@@ -208,14 +452,13 @@ class Win32OverlayManager:
             w.hide()
 
     def redraw(self):
+        # One geometry snapshot per frame; its per-monitor zone lists are
+        # prebuilt and immutable, so they're handed to the windows as-is
+        geometry = self.zm.geometry
+        self._painted = (geometry, self.zone_numbers, getattr(self, "zone_key_labels", {}))
         for w in self.windows:
-            mon_id = self._get_monitor_id_for_window(w)
-            zones_dict = self.zm.monitors.get(mon_id, {})
-            zones = []
-            for name, z in zones_dict.items():
-                zz = dict(z)
-                zz["name"] = name
-                zones.append(zz)
+            mon_id = self._get_monitor_id_for_window(w, geometry)
+            zones = geometry.zone_lists.get(mon_id, ())
             
             hl = None
             if self.highlight and self.highlight[0] == mon_id:
@@ -252,11 +495,40 @@ class Win32OverlayManager:
                 print(f"[CLICK ERR] {e}")
 
     def set_highlight(self, mon_id, zone_name):
+        old = self.highlight
         self.highlight = (mon_id, zone_name) if zone_name is not None else None
-        self.redraw()
+        if self.highlight == old:
+            return
+
+        # Zones, numbers or labels changed since the last full paint - repaint everything
+        geometry = self.zm.geometry
+        if self._painted != (geometry, self.zone_numbers, getattr(self, "zone_key_labels", {})):
+            self.redraw()
+            return
+
+        # Otherwise only the old and new highlighted zones need repainting
+        dirty = {}
+        for hl in (old, self.highlight):
+            if hl is not None:
+                dirty.setdefault(hl[0], set()).add(hl[1])
 
-    def _get_monitor_id_for_window(self, w):
-        for m in self.zm.detected_monitors:
+        for w in self.windows:
+            mon_id = self._get_monitor_id_for_window(w, geometry)
+            hl = self.highlight[1] if self.highlight and self.highlight[0] == mon_id else None
+            w.highlight = hl
+            w.highlight_name = hl
+            if mon_id in dirty and w.visible:
+                try:
+                    w.repaint_zones(dirty[mon_id])
+                except Exception as e:
+                    print(f"[CLICK ERR] {e}")
+
+    def get_paint_stats(self):
+        """Paint cost counters summed over all overlay windows"""
+        return self.paint_stats.as_dict()
+
+    def _get_monitor_id_for_window(self, w, geometry=None):
+        for m in (geometry or self.zm.geometry).detected_monitors:
             if (m["x"], m["y"], m["width"], m["height"]) == w.mon:
                 return m["id"]
         return 0
@@ -270,6 +542,39 @@ def get_hwnd_under_cursor():
     x, y = get_cursor_pos()
     return wg.WindowFromPoint((x, y))
 
+def _is_cloaked(hwnd):
+    """DWM-cloaked windows (suspended UWP apps, other virtual desktops) are 'visible' but not shown"""
+    if not dwmapi:
+        return False
+    cloaked = ctypes.c_int(0)
+    if dwmapi.DwmGetWindowAttribute(wt.HWND(hwnd), DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked)) != 0:
+        return False
+    return cloaked.value != 0
+
+def window_from_point(x, y, skip_hwnds=frozenset()):
+    """
+    Top-level window at (x, y), looking through any window in skip_hwnds
+    (e.g. the overlays). If WindowFromPoint lands on a skipped window, the
+    z-order is walked down from it to the first visible window containing
+    the point - nothing is hidden or re-shown. Returns 0 if none.
+    """
+    hwnd = wg.WindowFromPoint((x, y))
+    if not hwnd:
+        return 0
+    root = wg.GetAncestor(hwnd, GA_ROOT) or hwnd
+    if root not in skip_hwnds:
+        return root
+
+    h = wg.GetWindow(root, wc.GW_HWNDNEXT)
+    while h:
+        if (h not in skip_hwnds and wg.IsWindowVisible(h) and not wg.IsIconic(h)
+                and not (wg.GetWindowLong(h, wc.GWL_EXSTYLE) & wc.WS_EX_TRANSPARENT)
+                and rect_contains(wg.GetWindowRect(h), x, y)
+                and not _is_cloaked(h)):
+            return h
+        h = wg.GetWindow(h, wc.GW_HWNDNEXT)
+    return 0
+
 def rect_contains(rect, x, y):
     L, T, R, B = rect
     return (x >= L) and (x < R) and (y >= T) and (y < B)
@@ -290,5 +595,6 @@ def snap_hwnd_outer_to_zone_with_workarea(hwnd, z, work_area):
     if B > waB:
         d = B - waB; T -= d; B -= d
 
-    wg.SetWindowPos(hwnd, None, L, T, R - L, B - T,
-                    wc.SWP_NOZORDER | wc.SWP_NOACTIVATE)
\ No newline at end of file
+    with window_move_transaction() as txn:
+        txn.move(hwnd, L, T, R - L, B - T,
+                 wc.SWP_NOZORDER | wc.SWP_NOACTIVATE, insert_after=None)
\ No newline at end of file
@@ -0,0 +1,192 @@
+# core/scheduling.py
+"""Timing helpers for background loops"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable, Optional
+
+
+class AdaptivePollScheduler:
+    """
+    Decides when a polling loop wakes up.
+
+    Sleeps on a condition variable (no wakeups at all) while there is nothing
+    to watch, polls at min_interval right after poke(), and backs off
+    exponentially up to max_interval while passes report no activity.
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 2.0, backoff: float = 2.0):
+        self._cond = threading.Condition()
+        self._poked = False
+        self.running = True
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._wakeups = deque()  # monotonic timestamps of recent wakeups
+
+    def configure(self, min_interval: float, max_interval: float) -> None:
+        """Update interval bounds (max is raised to min if smaller)"""
+        with self._cond:
+            self.min_interval = min_interval
+            self.max_interval = max(min_interval, max_interval)
+            self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def poke(self) -> None:
+        """Something changed (snap, drag end) - poll fast and wake the loop now"""
+        with self._cond:
+            self.interval = self.min_interval
+            self._poked = True
+            self._cond.notify_all()
+
+    def start(self) -> None:
+        """Allow wait() to block again after stop()"""
+        with self._cond:
+            self.running = True
+            self.interval = self.min_interval
+
+    def stop(self) -> None:
+        """Release any waiting loop; wait() returns False from now on"""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+
+    def wait(self, has_work: Callable[[], bool]) -> bool:
+        """
+        Block until the next poll is due. Sleeps indefinitely while has_work()
+        is False. Returns False once stopped.
+        """
+        with self._cond:
+            while self.running and not has_work():
+                self._poked = False
+                self._cond.wait()
+
+            if self.running and not self._poked:
+                self._cond.wait(timeout=self.interval)
+            self._poked = False
+
+            if not self.running:
+                return False
+
+        self.record_wakeup()
+        return True
+
+    def report(self, active: bool) -> None:
+        """Report whether the last pass saw any movement"""
+        with self._cond:
+            if active:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def record_wakeup(self) -> None:
+        """Count a wakeup for wakeups_per_minute()"""
+        with self._cond:
+            now = time.monotonic()
+            self._wakeups.append(now)
+            while self._wakeups and now - self._wakeups[0] > 60.0:
+                self._wakeups.popleft()
+
+    def wakeups_per_minute(self) -> int:
+        """Number of wakeups in the last 60 seconds"""
+        with self._cond:
+            now = time.monotonic()
+            while self._wakeups and now - self._wakeups[0] > 60.0:
+                self._wakeups.popleft()
+            return len(self._wakeups)
+
+
+class DeadlineScheduler:
+    """
+    Runs delayed callbacks from a single thread in deadline order.
+
+    Every entry has a key; scheduling an existing key re-arms it (replacing
+    its deadline and callback) instead of adding another timer, and entries
+    can be cancelled. Cancelled/re-armed heap slots are skipped lazily.
+    """
+
+    def __init__(self, name: str = "DeadlineScheduler"):
+        self.name = name
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline, seq, key)
+        self._entries: Dict[Hashable, tuple] = {}  # key -> (deadline, seq, callback)
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+        """Run callback after delay seconds, replacing any pending entry for key"""
+        deadline = time.monotonic() + delay
+        with self._cond:
+            seq = next(self._seq)
+            self._entries[key] = (deadline, seq, callback)
+            heapq.heappush(self._heap, (deadline, seq, key))
+
+            # Drop stale slots if re-arming has left many behind
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [(d, s, k) for k, (d, s, _) in self._entries.items()]
+                heapq.heapify(self._heap)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancel a pending entry. Returns True if one was pending."""
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check whether key has a pending entry"""
+        return key in self._entries
+
+    def pending(self) -> int:
+        """Number of pending entries"""
+        return len(self._entries)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                callback = None
+                while callback is None:
+                    # Skip slots that were cancelled or re-armed
+                    while self._heap:
+                        deadline, seq, key = self._heap[0]
+                        entry = self._entries.get(key)
+                        if entry is not None and entry[1] == seq:
+                            break
+                        heapq.heappop(self._heap)
+
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    deadline, seq, key = self._heap[0]
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self._cond.wait(timeout=remaining)
+                        continue
+
+                    heapq.heappop(self._heap)
+                    callback = self._entries.pop(key)[2]
+
+            try:
+                callback()
+            except Exception as e:
+                print(f"[SCHEDULER] Error in delayed action {key}: {e}")
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> DeadlineScheduler:
+    """Get the app-wide deadline scheduler (one thread for all delayed actions)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DeadlineScheduler()
+        return _scheduler
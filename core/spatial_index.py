@@ -0,0 +1,79 @@
+# core/spatial_index.py
+"""Constant-time point -> rect lookup for monitor and zone hit-testing"""
+
+from array import array
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+class RectIndex:
+    """
+    Label grid over compressed rect coordinates.
+
+    Every distinct rect edge splits the bounds into columns/rows; each cell of
+    the resulting grid stores the first rect (in priority order) covering it.
+    Per-pixel column/row maps turn a lookup into two array reads and one grid
+    read, independent of how many rects there are or how they overlap.
+    """
+
+    def __init__(self, rects: Sequence[Tuple[Any, int, int, int, int]],
+                 bounds: Tuple[int, int, int, int]):
+        """
+        Args:
+            rects: (label, left, top, right, bottom) half-open rects, highest
+                   priority first (first match wins where rects overlap)
+            bounds: (left, top, right, bottom) area covered by the index;
+                    points outside it never match
+        """
+        self.left, self.top, right, bottom = bounds
+        self.width = max(0, right - self.left)
+        self.height = max(0, bottom - self.top)
+
+        # Clip rects to bounds, drop empty ones
+        clipped = []
+        for label, L, T, R, B in rects:
+            L, T = max(L, self.left), max(T, self.top)
+            R, B = min(R, right), min(B, bottom)
+            if L < R and T < B:
+                clipped.append((label, L, T, R, B))
+
+        if len(clipped) >= 0xFFFF:
+            raise ValueError(f"Too many rects for index: {len(clipped)}")
+
+        xs = sorted({self.left, right} | {c[1] for c in clipped} | {c[3] for c in clipped})
+        ys = sorted({self.top, bottom} | {c[2] for c in clipped} | {c[4] for c in clipped})
+        self._xmap, col_of = self._build_axis_map(xs, self.left)
+        self._ymap, row_of = self._build_axis_map(ys, self.top)
+        self._ncols = max(1, len(xs) - 1)
+
+        # Slot 0 means "no rect"; rect i is stored as i + 1
+        self._labels: List[Any] = [None] + [c[0] for c in clipped]
+        grid = array('H', [0]) * (self._ncols * max(1, len(ys) - 1))
+
+        for slot, (_, L, T, R, B) in enumerate(clipped, start=1):
+            c0, c1 = col_of[L], col_of[R]
+            for row in range(row_of[T], row_of[B]):
+                base = row * self._ncols
+                for cell in range(base + c0, base + c1):
+                    if not grid[cell]:
+                        grid[cell] = slot
+
+        self._grid = grid
+
+    @staticmethod
+    def _build_axis_map(edges: List[int], origin: int):
+        """Map every pixel offset along one axis to its column/row index"""
+        pixel_map = array('H')
+        index_of = {}
+        for idx in range(len(edges) - 1):
+            index_of[edges[idx]] = idx
+            pixel_map.extend(array('H', [idx]) * (edges[idx + 1] - edges[idx]))
+        index_of[edges[-1]] = len(edges) - 1
+        return pixel_map, index_of
+
+    def lookup(self, x: int, y: int) -> Optional[Any]:
+        """Get label of the highest-priority rect containing (x, y), or None"""
+        dx = x - self.left
+        dy = y - self.top
+        if dx < 0 or dy < 0 or dx >= self.width or dy >= self.height:
+            return None
+        return self._labels[self._grid[self._ymap[dy] * self._ncols + self._xmap[dx]]]
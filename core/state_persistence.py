@@ -0,0 +1,239 @@
+# core/state_persistence.py
+"""Persist saved window states to SQLite so restore survives restarts and crashes"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from .window_state_store import SavedWindowState
+
+WindowIdentity = Tuple[int, str, str]  # (pid, window class, process image path)
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS window_states (
+    hwnd INTEGER PRIMARY KEY,
+    pid INTEGER NOT NULL,
+    class_name TEXT NOT NULL,
+    image TEXT NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    timestamp REAL NOT NULL
+)
+"""
+
+
+def window_identity(hwnd: int) -> Optional[WindowIdentity]:
+    """
+    Get a stable identity for a live window, or None if it no longer exists.
+
+    HWND values carry a reuse counter, so hwnd + owning pid + class + process
+    image only matches after a restart if it is really the same window.
+    """
+    import ctypes
+    import win32gui
+    import win32process
+
+    if not win32gui.IsWindow(hwnd):
+        return None
+
+    _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    class_name = win32gui.GetClassName(hwnd)
+
+    # Image path via limited query rights (works for most elevated processes too)
+    image = ""
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if handle:
+        try:
+            buf = ctypes.create_unicode_buffer(1024)
+            size = ctypes.c_ulong(len(buf))
+            if kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+                image = buf.value
+        finally:
+            kernel32.CloseHandle(handle)
+
+    return (pid, class_name, image)
+
+
+class WindowStatePersistence:
+    """
+    Write-behind SQLite mirror of saved window states.
+
+    put()/delete() only enqueue, so snapping never waits on disk. A writer
+    thread coalesces queued changes (last change per hwnd wins) and writes
+    them in one transaction per flush interval. The database is opened and
+    loaded on that thread too, so startup isn't blocked either.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0,
+                 identify: Callable[[int], Optional[WindowIdentity]] = window_identity):
+        """
+        Args:
+            path: SQLite database file
+            flush_interval: Seconds to collect changes before writing a batch
+            identify: hwnd -> WindowIdentity (None if the window is gone)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.identify = identify
+        self.rows_written = 0
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self, on_loaded: Callable[[int, SavedWindowState], None]) -> None:
+        """Start the writer thread; on_loaded(hwnd, state) is called for every restored entry"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(on_loaded,),
+                                        name="WindowStatePersistence", daemon=True)
+        self._thread.start()
+
+    def put(self, hwnd: int, state: SavedWindowState) -> None:
+        """Queue a saved state for writing"""
+        self._queue.put(('put', hwnd, state))
+
+    def delete(self, hwnd: int) -> None:
+        """Queue removal of a window's saved state"""
+        self._queue.put(('delete', hwnd, None))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write everything queued so far. Returns False on timeout."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(('flush', None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending changes and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(('close', None, None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    # ===== writer thread =====
+
+    def _run(self, on_loaded) -> None:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            # WAL keeps committed batches intact if the process dies mid-write
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+        except Exception as e:
+            print(f"[STATE] Could not open state database {self.path}: {e}")
+            self._drain_without_db()
+            return
+
+        try:
+            self._load(conn, on_loaded)
+        except Exception as e:
+            print(f"[STATE] Error loading saved window states: {e}")
+
+        running = True
+        while running:
+            batch = [self._queue.get()]
+
+            # Collect more changes for up to flush_interval (control items end the batch early)
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1][0] in ('put', 'delete'):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(conn, batch)
+            except Exception as e:
+                print(f"[STATE] Error writing window states: {e}")
+
+            for op, _, arg in batch:
+                if op == 'flush':
+                    arg.set()
+                elif op == 'close':
+                    running = False
+
+        conn.close()
+
+    def _drain_without_db(self) -> None:
+        """No database - keep accepting (and dropping) changes so callers never block"""
+        while True:
+            op, _, arg = self._queue.get()
+            if op == 'flush':
+                arg.set()
+            elif op == 'close':
+                return
+
+    def _load(self, conn, on_loaded) -> None:
+        """Restore entries whose window still exists with the same identity; drop the rest"""
+        loaded = 0
+        stale = []
+        for hwnd, pid, class_name, image, x, y, width, height, timestamp in conn.execute(
+                "SELECT hwnd, pid, class_name, image, x, y, width, height, timestamp FROM window_states"):
+            try:
+                identity = self.identify(hwnd)
+            except Exception:
+                identity = None
+
+            if identity != (pid, class_name, image):
+                stale.append((hwnd,))
+                continue
+
+            on_loaded(hwnd, SavedWindowState(x, y, width, height, timestamp))
+            loaded += 1
+
+        if stale:
+            conn.executemany("DELETE FROM window_states WHERE hwnd = ?", stale)
+            conn.commit()
+
+        print(f"[STATE] Loaded {loaded} saved window state(s), dropped {len(stale)} stale")
+
+    def _write(self, conn, batch) -> None:
+        # Coalesce: only the last change per hwnd matters
+        latest = {}
+        for op, hwnd, state in batch:
+            if op in ('put', 'delete'):
+                latest[hwnd] = (op, state)
+
+        rows = []
+        deletes = []
+        for hwnd, (op, state) in latest.items():
+            try:
+                identity = self.identify(hwnd) if op == 'put' else None
+            except Exception:
+                identity = None
+            if identity is None:
+                # Deleted, or the window closed before we got to write it
+                deletes.append((hwnd,))
+                continue
+            rows.append((hwnd, *identity, state.x, state.y, state.width, state.height, state.timestamp))
+
+        if not rows and not deletes:
+            return
+
+        with conn:
+            if rows:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO window_states "
+                    "(hwnd, pid, class_name, image, x, y, width, height, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            if deletes:
+                conn.executemany("DELETE FROM window_states WHERE hwnd = ?", deletes)
+        self.rows_written += len(rows)
@@ -5,6 +5,8 @@ import threading
 import tkinter as tk
 import os
 
+from .latency import latency
+
 class TrayApp:
     def __init__(self, zone_manager, hotkey_listener, config_dir, drag_listener=None, overlay=None):
         self.zone_manager = zone_manager
@@ -69,6 +71,34 @@ class TrayApp:
         print(info)
         icon.notify(info, "Zone Manager - Monitors")
     
+    def show_tracker_stats(self, icon, item):
+        """Show auto-restore monitoring stats (confirms idle cost)"""
+        stats = self.zone_manager.state_tracker.get_monitoring_stats()
+        dispatch = self.zone_manager.dispatcher.get_stats()
+        info = (f"Auto-restore monitoring: {stats['mode']}\n"
+                f"Snapped windows: {stats['snapped_windows']}\n"
+                f"Poll interval: {stats['interval']:.2f}s\n"
+                f"Wakeups/min: {stats['wakeups_per_minute']}\n"
+                f"Window ops: {dispatch['executed']} run, {dispatch['coalesced']} coalesced, "
+                f"queue {dispatch['queue_depth']} (max {dispatch['max_depth']})")
+        for kind, lat in sorted(dispatch['latency'].items()):
+            info += f"\n  {kind}: avg {lat['avg_ms']:.1f}ms, max {lat['max_ms']:.1f}ms"
+        if self.overlay and hasattr(self.overlay, 'get_paint_stats'):
+            paint = self.overlay.get_paint_stats()
+            info += (f"\nOverlay paints: {paint['full_repaints']} full, {paint['partial_repaints']} partial, "
+                     f"{paint['pixels'] / 1e6:.1f} Mpx, {paint['gdi_calls']} GDI calls, "
+                     f"{paint['gdi_objects_created']} GDI objects created "
+                     f"({paint['gdi_objects_per_paint']:.2f}/paint), "
+                     f"{paint['bases_rendered']} bases rendered, {paint['frames_reused']} frames reused")
+        print(info)
+        icon.notify(info, "Zone Manager - Tracker")
+    
+    def show_latency_stats(self, icon, item):
+        """Dump per-stage input-to-snap latency percentiles"""
+        info = latency.format_stats()
+        print(f"\n=== Snap latency ===\n{info}\n")
+        icon.notify(info, "Zone Manager - Latency")
+    
     def quit_app(self, icon, item):
         """Quit the application"""
         print("Shutting down...")
@@ -87,6 +117,9 @@ class TrayApp:
         if self.drag_listener:
             self.drag_listener.stop()
         
+        # Write out saved window states
+        self.zone_manager.state_tracker.close()
+        
         # Stop tray icon
         icon.stop()
         print("Shutdown complete")
@@ -96,6 +129,8 @@ class TrayApp:
         menu = pystray.Menu(
             pystray.MenuItem("Show Monitors", self.show_monitors),
             pystray.MenuItem("Show Hotkeys", self.show_info),
+            pystray.MenuItem("Show Tracker Stats", self.show_tracker_stats),
+            pystray.MenuItem("Show Latency Stats", self.show_latency_stats),
             pystray.MenuItem("Reload Config", self.reload_config),
             pystray.MenuItem("Quit", self.quit_app)
         )
@@ -161,6 +196,10 @@ class HotkeyInfoWindow:
             (self.zone_manager.reload_config_hotkey, "Reload Configuration"),
             (self.zone_manager.config.get('cycle_next_hotkey', 'ctrl+alt+]'), "Cycle Next Zone"),
             (self.zone_manager.config.get('cycle_prev_hotkey', 'ctrl+alt+['), "Cycle Previous Zone"),
+            (self.zone_manager.config.get('zone_windows_next_hotkey', 'ctrl+alt+.'), "Next Window in Zone"),
+            (self.zone_manager.config.get('zone_windows_prev_hotkey', 'ctrl+alt+,'), "Previous Window in Zone"),
+            (self.zone_manager.config.get('undo_hotkey', 'ctrl+alt+z'), "Undo Window Move"),
+            (self.zone_manager.config.get('redo_hotkey', 'ctrl+alt+y'), "Redo Window Move"),
         ]
         
         for hotkey, description in special_hotkeys:
@@ -0,0 +1,166 @@
+# core/window_dispatcher.py
+"""Single-writer dispatcher - every window operation runs on one thread, in order"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from .window_ops import window_move_transaction
+
+
+class WindowOpDispatcher:
+    """
+    Runs window operations (snap, restore, save/mark state) from a command
+    queue on a dedicated thread, so hotkey, mouse, drag and monitor threads
+    never mutate window state concurrently.
+
+    Commands are keyed, e.g. ('move', hwnd). Submitting a key that is still
+    queued supersedes the old command: it is dropped and the new one goes to
+    the back of the queue, so ten queued cycle steps end in one move to the
+    final zone. Commands submitted from the dispatcher thread run inline.
+
+    Everything queued when the thread wakes runs inside one window move
+    transaction, so a burst of commands for different windows (auto-restores
+    after a display change, say) repaints once.
+    """
+
+    def __init__(self, name: str = "WindowOpDispatcher"):
+        self.name = name
+        self._cond = threading.Condition()
+        self._queue: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (fn, args, submitted_at)
+        self._anon = itertools.count()  # keys for commands that never coalesce
+        self._running_key = None
+        self._running_args = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Stats
+        self.executed = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self._latency: Dict[str, list] = {}  # kind -> [count, total_ms, max_ms]
+
+    def submit(self, key: Optional[Hashable], fn: Callable, *args) -> None:
+        """
+        Queue fn(*args). Replaces any queued command with the same key
+        (key=None never coalesces).
+        """
+        if threading.current_thread() is self._thread:
+            self._execute(key if key is not None else ('inline',), fn, args, time.perf_counter())
+            return
+
+        with self._cond:
+            if self._stopped:
+                return
+            if key is None:
+                key = ('anonymous', next(self._anon))
+            elif self._queue.pop(key, None) is not None:
+                self.coalesced += 1
+
+            self._queue[key] = (fn, args, time.perf_counter())
+            self.max_depth = max(self.max_depth, len(self._queue))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self, key: Hashable) -> Optional[tuple]:
+        """Args of the queued (or currently running) command for key, or None"""
+        with self._cond:
+            entry = self._queue.get(key)
+            if entry is not None:
+                return entry[1]
+            if self._running_key == key:
+                return self._running_args
+            return None
+
+    def queue_depth(self) -> int:
+        """Number of commands waiting to run"""
+        return len(self._queue)
+
+    def get_stats(self) -> dict:
+        """Queue depth, coalescing and per-command-kind latency (queue wait + run time)"""
+        with self._cond:
+            latency = {
+                kind: {'count': count, 'avg_ms': total / count, 'max_ms': worst}
+                for kind, (count, total, worst) in self._latency.items()
+            }
+            return {
+                'queue_depth': len(self._queue),
+                'max_depth': self.max_depth,
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'latency': latency,
+            }
+
+    def stop(self) -> None:
+        """Drop queued commands and stop accepting new ones"""
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                batch = len(self._queue)
+
+            with window_move_transaction() as txn:
+                for _ in range(batch):
+                    with self._cond:
+                        if not self._queue or self._stopped:
+                            break
+                        key, (fn, args, submitted_at) = self._queue.popitem(last=False)
+                        self._running_key = key
+                        self._running_args = args
+
+                    # A command may read back a window this batch has already moved
+                    if txn.moves and not self._independent_of(key, txn.moves):
+                        txn.commit()
+                    self._execute(key, fn, args, submitted_at)
+
+                    with self._cond:
+                        self._running_key = None
+                        self._running_args = None
+
+    @staticmethod
+    def _independent_of(key, moved) -> bool:
+        """Whether a command keyed (kind, hwnd) leaves the windows in `moved` alone (unknown: no)"""
+        if isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], int) and key[0] != 'anonymous':
+            return key[1] not in moved
+        return False
+
+    def _execute(self, key, fn, args, submitted_at) -> None:
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"[DISPATCH] Error in {key}: {e}")
+
+        elapsed_ms = (time.perf_counter() - submitted_at) * 1000.0
+        kind = str(key[0]) if isinstance(key, tuple) and key else str(key)
+        with self._cond:
+            self.executed += 1
+            stats = self._latency.setdefault(kind, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed_ms
+            stats[2] = max(stats[2], elapsed_ms)
+
+
+_dispatcher: Optional[WindowOpDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> WindowOpDispatcher:
+    """Get the app-wide window operation dispatcher"""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = WindowOpDispatcher()
+        return _dispatcher
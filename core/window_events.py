@@ -0,0 +1,165 @@
+# core/window_events.py
+"""Window event sources - WinEvent hooks on Windows, a simulated source for tests"""
+
+import threading
+from typing import Callable, List
+
+# WinEvent constants
+EVENT_SYSTEM_MOVESIZESTART = 0x000A
+EVENT_SYSTEM_MOVESIZEEND = 0x000B
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+
+WindowEventCallback = Callable[[int, int], None]  # (event, hwnd)
+
+
+class WindowEventSource:
+    """Base event source: fans (event, hwnd) notifications out to subscribers"""
+
+    def __init__(self):
+        self._subscribers: List[WindowEventCallback] = []
+        self.running = False
+
+    def subscribe(self, callback: WindowEventCallback) -> None:
+        """Register a callback(event, hwnd)"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: WindowEventCallback) -> None:
+        """Remove a previously registered callback"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start(self) -> bool:
+        """Start delivering events. Returns False if events are unavailable."""
+        self.running = True
+        return True
+
+    def stop(self) -> None:
+        """Stop delivering events"""
+        self.running = False
+
+    def _emit(self, event: int, hwnd: int) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(event, hwnd)
+            except Exception as e:
+                print(f"[EVENTS] Error handling event {event:#06x} for {hwnd}: {e}")
+
+
+class SimulatedEventSource(WindowEventSource):
+    """Event source driven by hand - emit() delivers synchronously on the caller's thread"""
+
+    def emit(self, event: int, hwnd: int) -> None:
+        """Deliver an event to subscribers (only while started)"""
+        if self.running:
+            self._emit(event, hwnd)
+
+
+class WinEventSource(WindowEventSource):
+    """
+    Out-of-context SetWinEventHook listener on a dedicated message-loop thread.
+    Only top-level window notifications (OBJID_WINDOW / CHILDID_SELF) are delivered.
+    """
+
+    EVENT_RANGES = [
+        (EVENT_SYSTEM_MOVESIZESTART, EVENT_SYSTEM_MOVESIZEEND),
+        (EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE),
+        (EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE),
+    ]
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+        self._hooked = False
+        self._proc = None  # keep the ctypes callback alive
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=2.0)
+
+        self.running = self._hooked
+        if not self._hooked:
+            print("[EVENTS] WinEvent hooks unavailable")
+        return self.running
+
+    def stop(self) -> None:
+        if self._thread_id:
+            try:
+                import ctypes
+                ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            except Exception:
+                pass
+        self.running = False
+
+    def _run(self) -> None:
+        try:
+            import ctypes
+            from ctypes import wintypes as wt
+        except Exception:
+            self._ready.set()
+            return
+
+        try:
+            user32 = ctypes.windll.user32
+            kernel32 = ctypes.windll.kernel32
+        except AttributeError:
+            # Not on Windows
+            self._ready.set()
+            return
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wt.HANDLE, wt.DWORD, wt.HWND, wt.LONG, wt.LONG, wt.DWORD, wt.DWORD
+        )
+        user32.SetWinEventHook.restype = wt.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wt.DWORD, wt.DWORD, wt.HMODULE, WinEventProc, wt.DWORD, wt.DWORD, wt.DWORD
+        ]
+
+        def callback(hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+            if id_object == OBJID_WINDOW and id_child == CHILDID_SELF and hwnd:
+                self._emit(event, hwnd)
+
+        self._proc = WinEventProc(callback)
+        hooks = []
+        for event_min, event_max in self.EVENT_RANGES:
+            hook = user32.SetWinEventHook(event_min, event_max, None, self._proc, 0, 0,
+                                          WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+            if hook:
+                hooks.append(hook)
+
+        self._thread_id = kernel32.GetCurrentThreadId()
+        self._hooked = len(hooks) == len(self.EVENT_RANGES)
+        self._ready.set()
+
+        if not self._hooked:
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+            return
+
+        # Out-of-context hooks are delivered through this thread's message queue
+        msg = wt.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+        self._thread_id = None
@@ -0,0 +1,75 @@
+# core/window_history.py
+"""Per-window undo/redo history of geometries in fixed-size ring buffers"""
+
+from array import array
+from typing import Optional, Tuple
+
+Rect = Tuple[int, int, int, int]  # (x, y, width, height)
+
+
+class WindowHistory:
+    """
+    Bounded undo/redo history of one window's geometry.
+
+    Entries are (x, y, w, h) packed into a single array('i') of depth * 4
+    ints, allocated once, so memory per window is fixed. The ring keeps the
+    newest `depth` entries; cursor is the entry the window is at while
+    undoing (== count when at the tip, i.e. current geometry not recorded).
+    record(), undo() and redo() are all O(1).
+    """
+
+    __slots__ = ('depth', 'rects', 'start', 'count', 'cursor')
+
+    def __init__(self, depth: int):
+        if depth < 2:
+            # Undoing needs a slot for the current geometry besides the entry to go back to
+            raise ValueError(f"History depth must be at least 2 (got {depth})")
+        self.depth = depth
+        self.rects = array('i', bytes(4 * 4 * depth))  # zero-filled, 4 ints per entry
+        self.start = 0  # ring index of the oldest entry
+        self.count = 0
+        self.cursor = 0
+
+    def _get(self, idx: int) -> Rect:
+        base = ((self.start + idx) % self.depth) * 4
+        return tuple(self.rects[base:base + 4])
+
+    def _append(self, rect: Rect) -> None:
+        if self.count == self.depth:
+            # Full - overwrite the oldest entry
+            self.start = (self.start + 1) % self.depth
+            self.count -= 1
+            self.cursor = max(self.cursor - 1, 0)
+        base = ((self.start + self.count) % self.depth) * 4
+        self.rects[base:base + 4] = array('i', rect)
+        self.count += 1
+
+    def record(self, rect: Rect) -> None:
+        """Record the geometry a window had before a snap/restore (drops any redo entries)"""
+        self.count = self.cursor
+        self._append(rect)
+        self.cursor = self.count
+
+    def undo(self, current: Rect) -> Optional[Rect]:
+        """Step back. Returns the geometry to apply, or None if there is nothing to undo."""
+        if self.cursor == self.count:
+            # Leaving the tip - remember where we are so redo can come back
+            if self.count and self._get(self.count - 1) == current:
+                self.cursor = self.count - 1
+            else:
+                self._append(current)
+                self.cursor = self.count - 1
+        if self.cursor == 0:
+            return None
+        self.cursor -= 1
+        return self._get(self.cursor)
+
+    def redo(self) -> Optional[Rect]:
+        """Step forward again. Returns the geometry to apply, or None at the newest entry."""
+        if self.cursor + 1 >= self.count:
+            return None
+        self.cursor += 1
+        return self._get(self.cursor)
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,174 @@
+# core/window_ops.py
+"""Batched window moves - one DeferWindowPos batch (one DWM recomposition) per transaction"""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+# SetWindowPos flags (mirrors win32con so fakes don't need pywin32)
+SWP_NOSIZE = 0x0001
+SWP_NOMOVE = 0x0002
+SWP_NOZORDER = 0x0004
+SWP_NOACTIVATE = 0x0010
+SWP_SHOWWINDOW = 0x0040
+
+HWND_TOP = 0
+
+
+class Win32WindowBackend:
+    """The Win32 calls used to position windows"""
+
+    def __init__(self):
+        import win32gui
+        self._gui = win32gui
+
+    def begin_defer(self, count: int):
+        return self._gui.BeginDeferWindowPos(count)
+
+    def defer(self, hdwp, hwnd: int, insert_after: Optional[int], x: int, y: int,
+              width: int, height: int, flags: int):
+        return self._gui.DeferWindowPos(hdwp, hwnd, insert_after or 0, x, y, width, height, flags)
+
+    def end_defer(self, hdwp) -> None:
+        self._gui.EndDeferWindowPos(hdwp)
+
+    def set_window_pos(self, hwnd: int, insert_after: Optional[int], x: int, y: int,
+                       width: int, height: int, flags: int) -> None:
+        self._gui.SetWindowPos(hwnd, insert_after, x, y, width, height, flags)
+
+
+class RecordingWindowBackend:
+    """
+    Fake backend that records calls and tracks resulting rects instead of
+    moving real windows. Lets transaction logic run on any OS.
+    """
+
+    def __init__(self, failing_hwnds=(), fail_end_defer: bool = False):
+        self.calls: List[Tuple] = []
+        self.rects = {}  # hwnd -> (x, y, width, height) after the last applied move
+        self.failing_hwnds = set(failing_hwnds)  # defer() raises for these
+        self.fail_end_defer = fail_end_defer  # end_defer() raises and applies nothing
+        self._next_hdwp = 1
+        self._pending = []
+
+    def begin_defer(self, count: int):
+        self.calls.append(('begin', count))
+        self._pending = []
+        hdwp = self._next_hdwp
+        self._next_hdwp += 1
+        return hdwp
+
+    def defer(self, hdwp, hwnd, insert_after, x, y, width, height, flags):
+        self.calls.append(('defer', hwnd, x, y, width, height, flags))
+        if hwnd in self.failing_hwnds:
+            raise OSError(f"DeferWindowPos failed for {hwnd}")
+        self._pending.append((hwnd, x, y, width, height, flags))
+        return hdwp
+
+    def end_defer(self, hdwp) -> None:
+        self.calls.append(('end',))
+        pending, self._pending = self._pending, []
+        if self.fail_end_defer:
+            raise OSError("EndDeferWindowPos failed")
+        for move in pending:
+            self._apply(*move)
+
+    def set_window_pos(self, hwnd, insert_after, x, y, width, height, flags) -> None:
+        self.calls.append(('set', hwnd, x, y, width, height, flags))
+        self._apply(hwnd, x, y, width, height, flags)
+
+    def _apply(self, hwnd, x, y, width, height, flags):
+        old = self.rects.get(hwnd, (0, 0, 0, 0))
+        if flags & SWP_NOMOVE:
+            x, y = old[0], old[1]
+        if flags & SWP_NOSIZE:
+            width, height = old[2], old[3]
+        self.rects[hwnd] = (x, y, width, height)
+
+
+_backend = None
+_local = threading.local()
+
+
+def get_window_backend():
+    """Get the process-wide window backend (Win32 unless replaced)"""
+    global _backend
+    if _backend is None:
+        _backend = Win32WindowBackend()
+    return _backend
+
+
+def set_window_backend(backend) -> None:
+    """Replace the window backend (e.g. with RecordingWindowBackend)"""
+    global _backend
+    _backend = backend
+
+
+class WindowMoveTransaction:
+    """Collects window moves and commits them as one deferred batch"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or get_window_backend()
+        self.moves = {}  # hwnd -> (insert_after, x, y, width, height, flags); last move wins
+        self._after_commit: List[Callable[[], None]] = []
+
+    def move(self, hwnd: int, x: int, y: int, width: int, height: int,
+             flags: int = SWP_SHOWWINDOW, insert_after: Optional[int] = HWND_TOP) -> None:
+        """Queue a move/resize of hwnd"""
+        self.moves[hwnd] = (insert_after, x, y, width, height, flags)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the batch has been applied (e.g. to read back final rects)"""
+        self._after_commit.append(callback)
+
+    def commit(self) -> int:
+        """Apply all queued moves. Returns how many windows were moved."""
+        moves, self.moves = self.moves, {}
+        moved = 0
+
+        if moves:
+            try:
+                hdwp = self.backend.begin_defer(len(moves))
+                for hwnd, args in moves.items():
+                    hdwp = self.backend.defer(hdwp, hwnd, *args)
+                self.backend.end_defer(hdwp)
+                moved = len(moves)
+            except Exception as e:
+                # A failed DeferWindowPos aborts the whole batch - move windows one by one
+                print(f"Batched move failed ({e}), falling back to per-window moves")
+                for hwnd, args in moves.items():
+                    try:
+                        self.backend.set_window_pos(hwnd, *args)
+                        moved += 1
+                    except Exception as e:
+                        print(f"Error moving window {hwnd}: {e}")
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in post-move callback: {e}")
+
+        return moved
+
+
+@contextmanager
+def window_move_transaction(backend=None):
+    """
+    Collect moves made inside the block and commit them in one batch.
+    Nested blocks on the same thread join the outermost transaction, so a
+    multi-window operation built from single-window helpers repaints once.
+    """
+    outer = getattr(_local, 'transaction', None)
+    if outer is not None:
+        yield outer
+        return
+
+    transaction = WindowMoveTransaction(backend)
+    _local.transaction = transaction
+    try:
+        yield transaction
+    finally:
+        _local.transaction = None
+    transaction.commit()
@@ -0,0 +1,327 @@
+# core/window_state_store.py
+"""Bounded per-window state storage with LRU/TTL eviction and background sweeping"""
+
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .scheduling import get_scheduler
+
+_NIL = -1  # no slot (end of the LRU list)
+
+
+class SavedWindowState:
+    """Pre-snap window geometry"""
+
+    __slots__ = ('x', 'y', 'width', 'height', 'timestamp')
+
+    def __init__(self, x: int, y: int, width: int, height: int, timestamp: float):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.timestamp = timestamp
+
+    def __repr__(self) -> str:
+        return f"SavedWindowState({self.width}x{self.height} at ({self.x}, {self.y}))"
+
+
+class WindowStateStore:
+    """
+    hwnd -> value map with a size cap, TTL and liveness sweeping.
+
+    Entries are kept in least-recently-used order: reads and writes move an
+    entry to the back, inserts past max_size evict from the front, and the
+    TTL sweep only has to look at the front. Supports the dict operations
+    the trackers use (in, [], get, pop, del, keys, len).
+
+    Each entry is a slot in parallel columns (hwnd, value, last access time,
+    prev/next links of the LRU list); only hwnd -> slot is a dict. Times and
+    links are C arrays, so an entry costs no objects beyond its value and
+    slot number, and freed slots are reused.
+    """
+
+    def __init__(self, name: str, max_size: Optional[int] = None, ttl: Optional[float] = None,
+                 is_alive: Optional[Callable[[int], bool]] = None,
+                 on_evict: Optional[Callable[[int], None]] = None,
+                 is_pinned: Optional[Callable[[int], bool]] = None):
+        """
+        Args:
+            name: Label for log output
+            max_size: Max entries (None = unbounded)
+            ttl: Seconds since last access before an entry expires (None = never)
+            is_alive: hwnd -> bool; dead windows are dropped by sweep()
+            on_evict: Called with the hwnd of every entry dropped by eviction or sweeping
+            is_pinned: hwnd -> bool; pinned entries never expire (the TTL sweep
+                refreshes them instead), but still count towards max_size
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.is_alive = is_alive
+        self.is_pinned = is_pinned
+        self.on_evict = on_evict
+        self.evictions = 0
+        self.version = 0  # bumped on every insert/update/removal (not on reads)
+        self._lock = threading.RLock()
+        self._sweep_interval = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._slots: Dict[int, int] = {}  # hwnd -> slot
+        self._hwnds = array('q')  # slot -> hwnd
+        self._values: List[Any] = []  # slot -> value
+        self._touched = array('d')  # slot -> monotonic time of last access
+        self._prev = array('q')  # LRU links (_NIL at the ends)
+        self._next = array('q')
+        self._head = _NIL  # least recently used
+        self._tail = _NIL
+        self._free: List[int] = []
+
+    def configure(self, max_size: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Update limits, evicting immediately if now over size"""
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            evicted = self._evict_overflow()
+        self._notify_evicted(evicted)
+
+    # ===== dict-like access =====
+
+    def __contains__(self, hwnd: int) -> bool:
+        return hwnd in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, hwnd: int) -> Any:
+        with self._lock:
+            slot = self._slots[hwnd]
+            self._touch(slot)
+            return self._values[slot]
+
+    def get(self, hwnd: int, default: Any = None) -> Any:
+        with self._lock:
+            slot = self._slots.get(hwnd)
+            if slot is None:
+                return default
+            self._touch(slot)
+            return self._values[slot]
+
+    def __setitem__(self, hwnd: int, value: Any) -> None:
+        with self._lock:
+            slot = self._slots.get(hwnd)
+            if slot is None:
+                self._insert(hwnd, value)
+            else:
+                self._values[slot] = value
+                self._touch(slot)
+            self.version += 1
+            evicted = self._evict_overflow()
+        self._notify_evicted(evicted)
+
+    def __delitem__(self, hwnd: int) -> None:
+        with self._lock:
+            self._remove(hwnd)
+            self.version += 1
+
+    def pop(self, hwnd: int, default: Any = None) -> Any:
+        with self._lock:
+            if hwnd not in self._slots:
+                return default
+            self.version += 1
+            return self._remove(hwnd)
+
+    def keys(self) -> List[int]:
+        """Snapshot of tracked hwnds (safe to iterate while mutating)"""
+        with self._lock:
+            return list(self._slots)
+
+    def items(self) -> List[tuple]:
+        """Snapshot of (hwnd, value) pairs"""
+        with self._lock:
+            values = self._values
+            return [(hwnd, values[slot]) for hwnd, slot in self._slots.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self.version += 1
+
+    # ===== slots =====
+
+    def _insert(self, hwnd: int, value: Any) -> None:
+        if self._free:
+            slot = self._free.pop()
+            self._hwnds[slot] = hwnd
+            self._values[slot] = value
+        else:
+            slot = len(self._values)
+            self._hwnds.append(hwnd)
+            self._values.append(value)
+            self._touched.append(0.0)
+            self._prev.append(_NIL)
+            self._next.append(_NIL)
+        self._slots[hwnd] = slot
+        self._link_tail(slot)
+        self._touched[slot] = time.monotonic()
+
+    def _remove(self, hwnd: int) -> Any:
+        """Drop hwnd's entry (KeyError if absent) and return its value"""
+        slot = self._slots.pop(hwnd)
+        self._unlink(slot)
+        value = self._values[slot]
+        self._values[slot] = None
+        self._free.append(slot)
+        return value
+
+    def _link_tail(self, slot: int) -> None:
+        tail = self._tail
+        self._prev[slot] = tail
+        self._next[slot] = _NIL
+        if tail == _NIL:
+            self._head = slot
+        else:
+            self._next[tail] = slot
+        self._tail = slot
+
+    def _unlink(self, slot: int) -> None:
+        prev, nxt = self._prev[slot], self._next[slot]
+        if prev == _NIL:
+            self._head = nxt
+        else:
+            self._next[prev] = nxt
+        if nxt == _NIL:
+            self._tail = prev
+        else:
+            self._prev[nxt] = prev
+
+    # ===== eviction =====
+
+    def _touch(self, slot: int) -> None:
+        if slot != self._tail:
+            self._unlink(slot)
+            self._link_tail(slot)
+        self._touched[slot] = time.monotonic()
+
+    def _evict_overflow(self) -> List[int]:
+        evicted = []
+        if self.max_size is not None:
+            while len(self._slots) > self.max_size:
+                hwnd = self._hwnds[self._head]
+                self._remove(hwnd)
+                evicted.append(hwnd)
+                self.version += 1
+        return evicted
+
+    def _notify_evicted(self, evicted: List[int]) -> None:
+        if not evicted:
+            return
+        self.evictions += len(evicted)
+        if self.on_evict:
+            for hwnd in evicted:
+                try:
+                    self.on_evict(hwnd)
+                except Exception as e:
+                    print(f"[STATE] Error in {self.name} eviction callback: {e}")
+
+    def sweep(self) -> int:
+        """Drop expired entries and entries for destroyed windows. Returns count dropped."""
+        now = time.monotonic()
+        with self._lock:
+            evicted = []
+
+            # Expired entries sit at the front (least recently used)
+            if self.ttl is not None:
+                while self._head != _NIL:
+                    slot = self._head
+                    if now - self._touched[slot] <= self.ttl:
+                        break
+                    hwnd = self._hwnds[slot]
+                    if self.is_pinned and self.is_pinned(hwnd):
+                        self._touch(slot)  # still in use - move it behind the live entries
+                        continue
+                    self._remove(hwnd)
+                    evicted.append(hwnd)
+                    self.version += 1
+
+            hwnds = list(self._slots)
+
+        # Liveness checks run outside the lock (one Win32 call per entry)
+        if self.is_alive:
+            dead = []
+            for hwnd in hwnds:
+                try:
+                    if not self.is_alive(hwnd):
+                        dead.append(hwnd)
+                except Exception:
+                    dead.append(hwnd)
+            with self._lock:
+                for hwnd in dead:
+                    if hwnd in self._slots:
+                        self._remove(hwnd)
+                        evicted.append(hwnd)
+                        self.version += 1
+
+        self._notify_evicted(evicted)
+        return len(evicted)
+
+    def start_sweeping(self, interval: float) -> None:
+        """Sweep every `interval` seconds on the shared deadline scheduler"""
+        self._sweep_interval = interval
+        get_scheduler().schedule(('state_store_sweep', id(self)), interval, self._scheduled_sweep)
+
+    def stop_sweeping(self) -> None:
+        """Stop background sweeping"""
+        self._sweep_interval = None
+        get_scheduler().cancel(('state_store_sweep', id(self)))
+
+    def _scheduled_sweep(self) -> None:
+        try:
+            dropped = self.sweep()
+            if dropped:
+                print(f"[STATE] Swept {dropped} stale {self.name} entries")
+        finally:
+            if self._sweep_interval:
+                self.start_sweeping(self._sweep_interval)
+
+
+class RectMatrix:
+    """
+    The (x, y, w, h) values of a WindowStateStore as NumPy arrays, rebuilt
+    only when the store's version changes, so a polling pass can compare
+    every tracked window with one vectorized operation.
+    """
+
+    def __init__(self, store: WindowStateStore):
+        self.store = store
+        self.hwnds = np.empty(0, dtype=np.int64)
+        self.rects = np.empty((0, 4), dtype=np.int64)
+        self._version = None
+
+    def refresh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (hwnds, rects) matching the store's current contents"""
+        version = self.store.version  # read before items() so a racing change forces another rebuild
+        if version != self._version:
+            items = self.store.items()
+            self.hwnds = np.fromiter((hwnd for hwnd, _ in items), dtype=np.int64, count=len(items))
+            self.rects = np.array([rect for _, rect in items], dtype=np.int64).reshape(-1, 4)
+            self._version = version
+        return self.hwnds, self.rects
+
+
+def compare_rects(current: np.ndarray, stored: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compare (N, 4) arrays of (x, y, w, h) row by row.
+
+    Returns (moved, changed): moved marks rows where any field differs by
+    more than threshold, changed marks rows that differ at all.
+    """
+    delta = np.abs(current - stored)
+    return (delta > threshold).any(axis=1), delta.any(axis=1)
@@ -5,15 +5,109 @@ import win32api
 import threading
 import time
 
+import numpy as np
+
+from .window_ops import window_move_transaction
+from .zone_occupancy import ZoneOccupancy
+from .window_state_store import SavedWindowState, WindowStateStore, RectMatrix, compare_rects
+from .window_history import WindowHistory
+from .state_persistence import WindowStatePersistence
+from .scheduling import AdaptivePollScheduler, get_scheduler
+from .window_dispatcher import get_dispatcher
+from .window_events import (
+    EVENT_SYSTEM_MOVESIZESTART,
+    EVENT_SYSTEM_MOVESIZEEND,
+    EVENT_OBJECT_DESTROY,
+    EVENT_OBJECT_LOCATIONCHANGE,
+)
+
 class WindowStateTracker:
     """Track window states to restore original size and position"""
     def __init__(self):
-        self.window_states = {}  # hwnd -> {'x', 'y', 'width', 'height', 'timestamp'}
-        self.snapped_windows = {}  # hwnd -> last snapped position (x,y,w,h)
+        self.occupancy = ZoneOccupancy()  # (monitor_id, zone_name) <-> snapped hwnds
+        # Bounded stores: least recently used entries are evicted past max size,
+        # and expired/destroyed windows are swept in the background. Snapped
+        # windows never expire, however long they sit untouched - nor do their
+        # saved states and history, which auto-restore and undo need.
+        self.snapped_windows = WindowStateStore('snapped window', is_alive=win32gui.IsWindow,
+                                                on_evict=self.occupancy.remove)  # hwnd -> last snapped position (x,y,w,h)
+        self.window_states = WindowStateStore('window state', is_alive=win32gui.IsWindow,
+                                              on_evict=self._on_state_evicted,
+                                              is_pinned=self._is_snapped)  # hwnd -> SavedWindowState
+        self.history = WindowStateStore('window history', is_alive=win32gui.IsWindow,
+                                        is_pinned=self._is_snapped)  # hwnd -> WindowHistory
+        self.history_depth = 16
+        self.snapped_rects = RectMatrix(self.snapped_windows)  # cached arrays for the polling pass
         self.monitoring = False
         self.monitor_thread = None
         self.drag_exempt_hwnds = set()  # Windows currently being dragged - DON'T auto-restore these
         self.operation_exempt_hwnds = set()  # Windows being moved by hotkey operations - DON'T auto-restore these
+        self.event_source = None  # Set when monitoring is event-driven
+        self.move_size_hwnds = set()  # Windows inside a user move/size loop (event mode)
+        self.auto_restore_enabled = True
+        self.movement_threshold = 10
+        self.operation_exempt_delay = 2.0
+        self.poll_scheduler = AdaptivePollScheduler()
+        self.persistence = None  # WindowStatePersistence when saved states are persisted
+    
+    def configure(self, tracking_config):
+        """Apply state tracking settings (see ConfigManager.get_state_tracking_config)"""
+        self.auto_restore_enabled = tracking_config['enabled']
+        self.movement_threshold = tracking_config['threshold']
+        self.operation_exempt_delay = tracking_config['exempt_delay']
+        self.poll_scheduler.configure(tracking_config['interval'], tracking_config['max_interval'])
+        
+        self.history_depth = tracking_config['history_depth']
+        for store in (self.window_states, self.snapped_windows, self.history):
+            ttl = tracking_config['ttl'] if store is not self.snapped_windows else None
+            store.configure(tracking_config['max_windows'], ttl)
+            store.start_sweeping(tracking_config['sweep_interval'])
+        
+        self._configure_persistence(tracking_config)
+    
+    def _configure_persistence(self, tracking_config):
+        """Open, reopen or close the saved-state database to match config"""
+        path = tracking_config['db_path'] if tracking_config['persist'] else None
+        if self.persistence is not None:
+            if self.persistence.path == path:
+                self.persistence.flush_interval = tracking_config['flush_interval']
+                return
+            self.persistence.close()
+            self.persistence = None
+        
+        if path:
+            self.persistence = WindowStatePersistence(path, tracking_config['flush_interval'])
+            # Loads in the background; states from before the restart show up shortly after start
+            self.persistence.open(self._on_state_loaded)
+    
+    def _is_snapped(self, hwnd):
+        return hwnd in self.snapped_windows
+    
+    def _on_state_loaded(self, hwnd, state):
+        """Saved state restored from disk (persistence thread) - adopted on the dispatcher thread"""
+        get_dispatcher().submit(('state_loaded', hwnd), self._adopt_loaded_state, hwnd, state)
+    
+    def _adopt_loaded_state(self, hwnd, state):
+        """Keep a state from disk unless one was saved since start (dispatcher thread)"""
+        if hwnd not in self.window_states:
+            self.window_states[hwnd] = state
+    
+    def _on_state_evicted(self, hwnd):
+        """Saved state dropped by the store (LRU, TTL or closed window)"""
+        if self.persistence is not None:
+            self.persistence.delete(hwnd)
+    
+    def _drop_state(self, hwnd):
+        """Forget a window's saved state (memory and disk)"""
+        if self.window_states.pop(hwnd, None) is not None and self.persistence is not None:
+            self.persistence.delete(hwnd)
+    
+    def close(self):
+        """Stop monitoring and write out pending saved states"""
+        self.stop_monitoring()
+        if self.persistence is not None:
+            self.persistence.close()
+            self.persistence = None
     
     def save_state(self, hwnd, force=False):
         """Save the current window state before snapping to zone
@@ -28,25 +122,69 @@ class WindowStateTracker:
                 return
                 
             rect = win32gui.GetWindowRect(hwnd)
-            self.window_states[hwnd] = {
-                'x': rect[0],
-                'y': rect[1],
-                'width': rect[2] - rect[0],
-                'height': rect[3] - rect[1],
-                'timestamp': time.time()
-            }
+            state = SavedWindowState(
+                rect[0],
+                rect[1],
+                rect[2] - rect[0],
+                rect[3] - rect[1],
+                time.time()
+            )
+            self.window_states[hwnd] = state
+            if self.persistence is not None:
+                self.persistence.put(hwnd, state)  # written behind, never blocks the snap
             print(f"Saved window state: {rect[2] - rect[0]}x{rect[3] - rect[1]} at ({rect[0]}, {rect[1]})")
         except Exception as e:
             print(f"Error saving state: {e}")
     
-    def mark_as_snapped(self, hwnd):
-        """Mark a window as snapped, store its current position"""
+    def record_geometry(self, hwnd):
+        """Push the window's current geometry onto its undo history (before snapping/restoring it)"""
+        try:
+            rect = win32gui.GetWindowRect(hwnd)
+        except Exception:
+            return
+        
+        history = self.history.get(hwnd)
+        if history is None:
+            history = self.history[hwnd] = WindowHistory(self.history_depth)
+        history.record((rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1]))
+    
+    def undo_geometry(self, hwnd):
+        """Step the window's history back. Returns (x, y, w, h) to apply, or None."""
+        history = self.history.get(hwnd)
+        if history is None:
+            return None
+        try:
+            rect = win32gui.GetWindowRect(hwnd)
+        except Exception:
+            return None
+        return history.undo((rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1]))
+    
+    def redo_geometry(self, hwnd):
+        """Step the window's history forward. Returns (x, y, w, h) to apply, or None."""
+        history = self.history.get(hwnd)
+        return history.redo() if history is not None else None
+    
+    def mark_as_snapped(self, hwnd, zone_key=None):
+        """Mark a window as snapped, store its current position
+        
+        Args:
+            hwnd: Window handle
+            zone_key: (monitor_id, zone_name) the window was snapped to, for the occupancy index
+        """
         try:
             rect = win32gui.GetWindowRect(hwnd)
             self.snapped_windows[hwnd] = (rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1])
+            if zone_key is not None:
+                self.occupancy.place(hwnd, zone_key)
+            self.poll_scheduler.poke()
         except:
             pass
     
+    def forget_snapped(self, hwnd):
+        """Drop a window's snapped position and take it out of its zone"""
+        self.snapped_windows.pop(hwnd, None)
+        self.occupancy.remove(hwnd)
+    
     def mark_as_dragging(self, hwnd):
         """Mark a window as being actively dragged - exempt from auto-restore"""
         if hwnd:
@@ -55,6 +193,7 @@ class WindowStateTracker:
     def unmark_as_dragging(self, hwnd):
         """Remove drag exemption"""
         self.drag_exempt_hwnds.discard(hwnd)
+        self.poll_scheduler.poke()
     
     def mark_operation_in_progress(self, hwnd):
         """Mark a window as being moved by a hotkey operation - exempt from auto-restore temporarily"""
@@ -64,11 +203,19 @@ class WindowStateTracker:
     def unmark_operation_in_progress(self, hwnd):
         """Remove operation exemption after a short delay"""
         if hwnd:
-            # Use a thread to remove after delay (allows animation to complete)
-            def delayed_unmark():
-                time.sleep(2.0)  # Wait 2 seconds - enough time for user to release mouse after number snap
-                self.operation_exempt_hwnds.discard(hwnd)
-            threading.Thread(target=delayed_unmark, daemon=True).start()
+            # Remove after delay (allows animation to complete, and gives the user time
+            # to release the mouse after a number snap). Re-snapping the same window
+            # re-arms its deadline instead of adding another timer.
+            get_scheduler().schedule(
+                ('operation_exempt', hwnd),
+                self.operation_exempt_delay,
+                lambda: get_dispatcher().submit(('operation_exempt', hwnd), self._release_operation_exempt, hwnd)
+            )
+    
+    def _release_operation_exempt(self, hwnd):
+        """Deadline reached - window is subject to auto-restore again"""
+        self.operation_exempt_hwnds.discard(hwnd)
+        self.poll_scheduler.poke()
     
     def restore_state(self, hwnd):
         """Restore window to its saved state"""
@@ -78,6 +225,7 @@ class WindowStateTracker:
         
         try:
             state = self.window_states[hwnd]
+            self.record_geometry(hwnd)
             
             # Check if window is maximized, restore it first
             placement = win32gui.GetWindowPlacement(hwnd)
@@ -85,22 +233,22 @@ class WindowStateTracker:
                 win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
             
             # Restore to original position and size
-            win32gui.SetWindowPos(
-                hwnd,
-                win32con.HWND_TOP,
-                state['x'],
-                state['y'],
-                state['width'],
-                state['height'],
-                win32con.SWP_SHOWWINDOW
-            )
+            with window_move_transaction() as txn:
+                txn.move(
+                    hwnd,
+                    state.x,
+                    state.y,
+                    state.width,
+                    state.height,
+                    win32con.SWP_SHOWWINDOW,
+                    insert_after=win32con.HWND_TOP
+                )
             
-            print(f"Restored window to: {state['width']}x{state['height']} at ({state['x']}, {state['y']})")
+            print(f"Restored window to: {state.width}x{state.height} at ({state.x}, {state.y})")
             
             # Clear the saved state after restoration
-            del self.window_states[hwnd]
-            if hwnd in self.snapped_windows:
-                del self.snapped_windows[hwnd]
+            self._drop_state(hwnd)
+            self.forget_snapped(hwnd)
             return True
             
         except Exception as e:
@@ -125,21 +273,21 @@ class WindowStateTracker:
                 win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
             
             # Restore ONLY the size, keep current position
-            win32gui.SetWindowPos(
-                hwnd,
-                win32con.HWND_TOP,
-                current_x,
-                current_y,
-                state['width'],
-                state['height'],
-                win32con.SWP_SHOWWINDOW | win32con.SWP_NOMOVE  # Don't move, just resize
-            )
+            with window_move_transaction() as txn:
+                txn.move(
+                    hwnd,
+                    current_x,
+                    current_y,
+                    state.width,
+                    state.height,
+                    win32con.SWP_SHOWWINDOW | win32con.SWP_NOMOVE,  # Don't move, just resize
+                    insert_after=win32con.HWND_TOP
+                )
             
-            print(f"Restored window SIZE to: {state['width']}x{state['height']} (kept position)")
+            print(f"Restored window SIZE to: {state.width}x{state.height} (kept position)")
             
             # Clear from snapped list but KEEP the saved state for later full restore
-            if hwnd in self.snapped_windows:
-                del self.snapped_windows[hwnd]
+            self.forget_snapped(hwnd)
             
             return True
             
@@ -147,83 +295,223 @@ class WindowStateTracker:
             print(f"Error restoring size: {e}")
             return False
     
-    def start_monitoring(self):
-        """Start monitoring for manual moves"""
+    def start_monitoring(self, event_source=None):
+        """Start monitoring for manual moves
+        
+        Args:
+            event_source: WindowEventSource to react to window events. Falls back
+                to the polling loop if None or if the source can't start.
+        """
         if self.monitoring:
             return
         self.monitoring = True
+        
+        if event_source is not None:
+            event_source.subscribe(self._on_window_event)
+            if event_source.start():
+                self.event_source = event_source
+                print("Window movement monitoring started (event-driven)")
+                return
+            event_source.unsubscribe(self._on_window_event)
+        
+        self.poll_scheduler.start()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
-        print("Window movement monitoring started")
+        print("Window movement monitoring started (polling)")
+    
+    def stop_monitoring(self):
+        """Stop monitoring for manual moves"""
+        self.monitoring = False
+        self.poll_scheduler.stop()
+        if self.event_source is not None:
+            self.event_source.unsubscribe(self._on_window_event)
+            self.event_source = None
+    
+    def _on_window_event(self, event, hwnd):
+        """Handle a window event (event-driven monitoring)"""
+        if event == EVENT_OBJECT_DESTROY:
+            self.move_size_hwnds.discard(hwnd)
+            if hwnd in self.snapped_windows or hwnd in self.window_states or hwnd in self.history:
+                get_dispatcher().submit(('destroyed', hwnd), self._forget_window, hwnd)
+            return
+        
+        if event == EVENT_SYSTEM_MOVESIZEEND:
+            # Always close the move/size loop - a drag forgets the window's snapped
+            # state before this arrives, and a stale entry would mute its later moves
+            self.move_size_hwnds.discard(hwnd)
+        
+        # Everything else only matters for snapped windows
+        if hwnd not in self.snapped_windows:
+            return
+        
+        self.poll_scheduler.record_wakeup()
+        
+        if event == EVENT_SYSTEM_MOVESIZESTART:
+            self.move_size_hwnds.add(hwnd)
+        elif event == EVENT_SYSTEM_MOVESIZEEND:
+            # User finished moving/resizing - check once at the end
+            self._check_snapped_window(hwnd)
+        elif event == EVENT_OBJECT_LOCATIONCHANGE:
+            # Moves outside a move/size loop (keyboard shortcuts, apps moving themselves)
+            if hwnd not in self.move_size_hwnds:
+                self._check_snapped_window(hwnd)
+    
+    def _forget_window(self, hwnd):
+        """Window was destroyed - drop everything tracked for it (dispatcher thread)"""
+        self.forget_snapped(hwnd)
+        self._drop_state(hwnd)
+        self.history.pop(hwnd, None)
     
     def _is_being_dragged(self, hwnd):
         """Check if a window is currently being dragged by the user"""
+        return hwnd in self._get_dragged_hwnds()
+    
+    def _check_snapped_window(self, hwnd, check_drag=False):
+        """Auto-restore a snapped window if it was moved away from its zone.
+        
+        Returns True if the window is moving or being operated on (keeps the
+        polling scheduler fast), False if it is sitting still.
+        """
+        if not self.auto_restore_enabled:
+            return False
+        
+        # Skip if window is in drag-exempt list
+        if hwnd in self.drag_exempt_hwnds:
+            return True
+        
+        # Skip if window is being moved by a hotkey operation
+        if hwnd in self.operation_exempt_hwnds:
+            return True
+        
+        if not win32gui.IsWindow(hwnd):
+            get_dispatcher().submit(('destroyed', hwnd), self._forget_window, hwnd)
+            return False
+        
+        # Skip if actively being dragged
+        if check_drag and self._is_being_dragged(hwnd):
+            return True
+        
+        snapped = self.snapped_windows.get(hwnd)
+        if snapped is None:
+            return False
+        
+        rect = win32gui.GetWindowRect(hwnd)
+        current = (rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1])
+        threshold = self.movement_threshold
+        
+        # If moved significantly (more than the configured threshold)
+        if (abs(current[0] - snapped[0]) > threshold or 
+            abs(current[1] - snapped[1]) > threshold or
+            abs(current[2] - snapped[2]) > threshold or
+            abs(current[3] - snapped[3]) > threshold):
+            
+            # Restore on the dispatcher thread, after any snap/drag already queued for it
+            get_dispatcher().submit(('restore', hwnd), self._auto_restore, hwnd)
+            return True
+        
+        return current != snapped
+    
+    def _get_dragged_hwnds(self):
+        """Windows that may be under a user drag right now (left button down: capture/foreground)"""
         try:
-            # Check if left mouse button is down
             if win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000:
-                # Check if this window has capture (being dragged)
-                captured = win32gui.GetCapture()
-                if captured == hwnd:
-                    return True
-                
-                # Also check if the window is the foreground window and mouse is down
-                if win32gui.GetForegroundWindow() == hwnd:
-                    return True
-            
+                return {win32gui.GetCapture(), win32gui.GetForegroundWindow()}
+        except Exception:
+            pass
+        return set()
+    
+    def _check_all_snapped(self):
+        """Check every snapped window in one pass (polling).
+        
+        Current rects are gathered into an array (one GetWindowRect per
+        window; a failure means the window is gone) and compared with the
+        cached snapped rects in one vectorized operation. Only windows past
+        the threshold get per-window work.
+        
+        Returns True if anything is moving or being operated on.
+        """
+        if not self.auto_restore_enabled:
             return False
-        except:
+        
+        hwnds, snapped = self.snapped_rects.refresh()
+        count = len(hwnds)
+        if not count:
             return False
+        
+        current = np.empty((count, 4), dtype=np.int64)
+        alive = np.ones(count, dtype=bool)
+        get_rect = win32gui.GetWindowRect
+        for i, hwnd in enumerate(hwnds.tolist()):
+            try:
+                current[i] = get_rect(hwnd)
+            except Exception:
+                alive[i] = False
+        
+        # (L, T, R, B) -> (x, y, w, h); a dead window compares as unchanged
+        current[:, 2:] -= current[:, :2]
+        if not alive.all():
+            current[~alive] = snapped[~alive]
+        moved, changed = compare_rects(current, snapped, self.movement_threshold)
+        
+        # Dragged / hotkey-operated windows are skipped but keep the poll fast.
+        # (Set unions are atomic, so no lock is needed against the dispatcher.)
+        exempt = self.drag_exempt_hwnds | self.operation_exempt_hwnds | self._get_dragged_hwnds()
+        if exempt:
+            exempt_mask = np.isin(hwnds, np.fromiter(exempt, dtype=np.int64, count=len(exempt)))
+            moved &= ~exempt_mask
+            changed &= ~exempt_mask
+            active = bool(exempt_mask.any())
+        else:
+            active = False
+        
+        for hwnd in hwnds[~alive].tolist():
+            get_dispatcher().submit(('destroyed', hwnd), self._forget_window, hwnd)
+        
+        # Restore on the dispatcher thread, after any snap/drag already queued for it
+        for hwnd in hwnds[moved & alive].tolist():
+            get_dispatcher().submit(('restore', hwnd), self._auto_restore, hwnd)
+        
+        return active or bool(changed.any())
+    
+    def _auto_restore(self, hwnd):
+        """Restore a window that was moved off its zone (dispatcher thread)"""
+        # A drag or hotkey operation may have started since the move was seen
+        if (hwnd not in self.snapped_windows or hwnd in self.drag_exempt_hwnds
+                or hwnd in self.operation_exempt_hwnds):
+            return
+        
+        print(f"Window {hwnd} moved manually, auto-restoring...")
+        if self.restore_state(hwnd):
+            self.forget_snapped(hwnd)
     
     def _monitor_loop(self):
-        """Check snapped windows for movement"""
-        while self.monitoring:
-            for hwnd in list(self.snapped_windows.keys()):
-                try:
-                    # Skip if window is in drag-exempt list
-                    if hwnd in self.drag_exempt_hwnds:
-                        continue
-                    
-                    # Skip if window is being moved by a hotkey operation
-                    if hwnd in self.operation_exempt_hwnds:
-                        continue
-                    
-                    if not win32gui.IsWindow(hwnd):
-                        del self.snapped_windows[hwnd]
-                        continue
-                    
-                    # Skip if actively being dragged
-                    if self._is_being_dragged(hwnd):
-                        continue
-                    
-                    rect = win32gui.GetWindowRect(hwnd)
-                    current = (rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1])
-                    snapped = self.snapped_windows[hwnd]
-                    
-                    # If moved significantly (more than 10 pixels)
-                    if (abs(current[0] - snapped[0]) > 10 or 
-                        abs(current[1] - snapped[1]) > 10 or
-                        abs(current[2] - snapped[2]) > 10 or
-                        abs(current[3] - snapped[3]) > 10):
-                        
-                        print(f"Window {hwnd} moved manually, auto-restoring...")
-                        if self.restore_state(hwnd):
-                            if hwnd in self.snapped_windows:
-                                del self.snapped_windows[hwnd]
-                
-                except Exception:
-                    pass
+        """Check snapped windows for movement (polling fallback)"""
+        # Sleeps without waking while nothing is snapped; polls fast after a
+        # snap/drag and backs off while windows sit still
+        while self.poll_scheduler.wait(lambda: bool(self.snapped_windows)):
+            if not self.monitoring:
+                break
             
-            time.sleep(0.1)
+            try:
+                active = self._check_all_snapped()
+            except Exception as e:
+                print(f"Error checking snapped windows: {e}")
+                active = False
+            
+            self.poll_scheduler.report(active)
+    
+    def get_monitoring_stats(self):
+        """Get monitoring mode, current poll interval and wakeups in the last minute"""
+        return {
+            'mode': 'events' if self.event_source is not None else 'polling',
+            'interval': self.poll_scheduler.interval,
+            'wakeups_per_minute': self.poll_scheduler.wakeups_per_minute(),
+            'snapped_windows': len(self.snapped_windows),
+            'saved_states': len(self.window_states),
+            'evictions': self.window_states.evictions + self.snapped_windows.evictions,
+        }
     
     def cleanup_old_states(self):
-        """Remove states for windows that no longer exist"""
-        to_remove = []
-        for hwnd in list(self.window_states.keys()):
-            try:
-                if not win32gui.IsWindow(hwnd):
-                    to_remove.append(hwnd)
-            except:
-                to_remove.append(hwnd)
-        
-        for hwnd in to_remove:
-            del self.window_states[hwnd]
\ No newline at end of file
+        """Remove states for windows that no longer exist (also runs periodically in the background)"""
+        self.window_states.sweep()
+        self.snapped_windows.sweep()
\ No newline at end of file
@@ -0,0 +1,303 @@
+# core/zone_geometry.py
+"""Precompiled zone geometry - pixel rects for every (layout, monitor) pair"""
+
+from types import MappingProxyType
+from typing import Dict, Any, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .spatial_index import RectIndex
+from .zone_numbering import number_zones
+
+
+class CompiledZones:
+    """Pixel geometry of one layout on one monitor, computed once at load time"""
+
+    __slots__ = ('layout_name', 'monitor_id', 'zones', 'hit_index', 'ring', 'rect_index')
+
+    def __init__(self, layout_name: str, monitor_id: int, zones: Dict[str, Dict[str, Any]],
+                 hit_index: RectIndex):
+        self.layout_name = layout_name
+        self.monitor_id = monitor_id
+        self.zones = zones  # zone_name -> {'x', 'y', 'width', 'height', ['key']}
+        self.hit_index = hit_index  # (x, y) -> zone_name for drag hover
+        self.ring = ZoneRing(list(zones.keys()))  # cycle order on this monitor
+        self.rect_index = RectMatchIndex()  # window rect -> zone_name it sits in
+        for zone_name, z in zones.items():
+            self.rect_index.add((z['x'], z['y'], z['width'], z['height']), zone_name)
+
+
+class ZoneRing:
+    """Fixed cycle order with precomputed next/prev links"""
+
+    __slots__ = ('items', '_position', '_next', '_prev')
+
+    def __init__(self, items: Sequence[Hashable]):
+        self.items = tuple(items)
+        count = len(self.items)
+        self._position = {item: idx for idx, item in enumerate(self.items)}
+        self._next = {item: self.items[(idx + 1) % count] for idx, item in enumerate(self.items)}
+        self._prev = {item: self.items[(idx - 1) % count] for idx, item in enumerate(self.items)}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._position
+
+    def position(self, item: Hashable) -> int:
+        """Index of item in the ring"""
+        return self._position[item]
+
+    def step(self, item: Hashable, direction: str = 'next') -> Hashable:
+        """Get the item after ('next') or before ('prev') item, wrapping around"""
+        return (self._next if direction == 'next' else self._prev)[item]
+
+
+class RectMatchIndex:
+    """
+    Quantized (x, y, w, h) -> value hash for "which zone is this window in".
+    Each rect is filed under every bucket a rect within the tolerance could
+    quantize to, so a lookup is one dict get plus an exact check of the few
+    candidates in that bucket. First-added match wins.
+    """
+
+    __slots__ = ('tolerance', '_buckets')
+
+    def __init__(self, tolerance: int = 10):
+        self.tolerance = tolerance
+        self._buckets: Dict[Tuple[int, int, int, int], List[Tuple[Tuple[int, int, int, int], Any]]] = {}
+
+    def _spread(self, v: int) -> range:
+        """Buckets holding values u with |u - v| < tolerance"""
+        q = self.tolerance
+        return range((v - q + 1) // q, (v + q - 1) // q + 1)
+
+    def add(self, rect: Tuple[int, int, int, int], value: Any) -> None:
+        """File a rect (x, y, width, height) under every bucket it can match from"""
+        x, y, w, h = rect
+        for bx in self._spread(x):
+            for by in self._spread(y):
+                for bw in self._spread(w):
+                    for bh in self._spread(h):
+                        self._buckets.setdefault((bx, by, bw, bh), []).append((rect, value))
+
+    def lookup(self, rect: Tuple[int, int, int, int]) -> Optional[Any]:
+        """Get the value whose rect is within tolerance on all four fields, or None"""
+        q = self.tolerance
+        x, y, w, h = rect
+        for (zx, zy, zw, zh), value in self._buckets.get((x // q, y // q, w // q, h // q), ()):
+            if abs(x - zx) < q and abs(y - zy) < q and abs(w - zw) < q and abs(h - zh) < q:
+                return value
+        return None
+
+
+def monitor_bounds(mon: Dict[str, Any]):
+    """Full (left, top, right, bottom) rect of a detected monitor"""
+    return (mon['x'], mon['y'], mon['x'] + mon['width'], mon['y'] + mon['height'])
+
+
+def build_monitor_index(detected_monitors: List[Dict[str, Any]]) -> RectIndex:
+    """Index (x, y) -> monitor id over the whole virtual desktop"""
+    rects = [(mon['id'],) + monitor_bounds(mon) for mon in detected_monitors]
+    if not rects:
+        return RectIndex([], (0, 0, 0, 0))
+    bounds = (min(r[1] for r in rects), min(r[2] for r in rects),
+              max(r[3] for r in rects), max(r[4] for r in rects))
+    return RectIndex(rects, bounds)
+
+
+def build_zone_hit_index(zones: Dict[str, Dict[str, Any]], detected_mon: Dict[str, Any],
+                         hover_margin: int, ignore_names: Iterable[str]) -> RectIndex:
+    """
+    Index (x, y) -> zone name for drag hover on one monitor.
+    Zones are shrunk by hover_margin (edges inclusive) and ignored zones are
+    left out, so lookups need no further arithmetic.
+    """
+    ignore_set = set(ignore_names)
+    rects = []
+    for zone_name, z in zones.items():
+        if zone_name in ignore_set:
+            continue
+        rects.append((
+            zone_name,
+            z['x'] + hover_margin,
+            z['y'] + hover_margin,
+            z['x'] + z['width'] - hover_margin + 1,
+            z['y'] + z['height'] - hover_margin + 1,
+        ))
+    return RectIndex(rects, monitor_bounds(detected_mon))
+
+
+def build_compiled_zones(layout_name: str, detected_mon: Dict[str, Any],
+                         zones: Dict[str, Dict[str, Any]], hover_margin: int = 0,
+                         ignore_names: Iterable[str] = ()) -> CompiledZones:
+    """Wrap one monitor's pixel zones with their hover index"""
+    hit_index = build_zone_hit_index(zones, detected_mon, hover_margin, ignore_names)
+    return CompiledZones(layout_name, detected_mon['id'], zones, hit_index)
+
+
+class GeometrySnapshot:
+    """
+    Immutable view of all zone geometry: monitors, compiled layouts, the
+    zones active on each monitor, cycle rings and zone numbers/labels.
+
+    Never modified after construction - changes build a new snapshot (see
+    evolve()) which ZoneManager publishes with a single attribute swap.
+    Readers grab one reference per frame/operation and use it throughout,
+    without locks or copies.
+    """
+
+    # Inputs; everything else is derived from them
+    BASE_FIELDS = ('generation', 'detected_monitors', 'monitor_index', 'compiled_layouts',
+                   'layout_order', 'active_layout', 'per_monitor_layouts')
+
+    # Fields a layout switch changes; evolve() shares the table fields as they are
+    SELECTION_FIELDS = frozenset(('active_layout', 'per_monitor_layouts'))
+    TABLE_FIELDS = ('detected_monitors', 'monitor_index', 'compiled_layouts', 'layout_order',
+                    'monitors_by_id', 'layout_index')
+
+    __slots__ = BASE_FIELDS + ('monitors_by_id', 'layout_index', 'active_compiled', 'monitors',
+                               'zone_lists', 'global_ring', 'zone_numbers', 'zone_labels',
+                               'zone_by_number', '_views')
+
+    def __init__(self, generation: int, detected_monitors: Sequence[Dict[str, Any]],
+                 monitor_index: RectIndex, compiled_layouts: Mapping[Tuple[str, int], CompiledZones],
+                 layout_order: Sequence[str], active_layout: str,
+                 per_monitor_layouts: Mapping[int, str], views: Optional[Dict[Hashable, tuple]] = None):
+        """
+        Args:
+            generation: Increases with every published snapshot
+            detected_monitors: Monitor dicts from MonitorDetector
+            monitor_index: (x, y) -> monitor id
+            compiled_layouts: (layout_name, monitor_id) -> CompiledZones for every pair
+            layout_order: Layout names in cycling order
+            active_layout: Default layout
+            per_monitor_layouts: monitor_id -> layout overriding the default
+            views: Derived views by active (monitor, layout) selection, shared by
+                snapshots evolved from the same compiled_layouts (evolve() passes it on)
+        """
+        init = object.__setattr__
+        init(self, 'generation', generation)
+        init(self, 'detected_monitors', tuple(detected_monitors))
+        init(self, 'monitor_index', monitor_index)
+        init(self, 'compiled_layouts', MappingProxyType(dict(compiled_layouts)))
+        init(self, 'layout_order', tuple(layout_order))
+        init(self, 'monitors_by_id', MappingProxyType({mon['id']: mon for mon in detected_monitors}))
+        init(self, 'layout_index', MappingProxyType({name: idx for idx, name in enumerate(layout_order)}))
+        self._activate(active_layout, per_monitor_layouts, {} if views is None else views)
+
+    def _activate(self, active_layout: str, per_monitor_layouts: Mapping[int, str],
+                  views: Dict[Hashable, tuple]) -> None:
+        """Set the layout selection and everything derived from it (the table fields are already set)"""
+        layout_index = self.layout_index
+        compiled_layouts = self.compiled_layouts
+
+        # Pick the active compiled zones for each monitor
+        active = {}
+        for mon in self.detected_monitors:
+            mon_id = mon['id']
+            layout_name = per_monitor_layouts.get(mon_id, active_layout)
+
+            if layout_name not in layout_index:
+                print(f"Warning: Layout '{layout_name}' not found. Using default.")
+                layout_name = active_layout
+
+            compiled = compiled_layouts.get((layout_name, mon_id))
+            if compiled is None:
+                print(f"Warning: No zones found for Monitor {mon_id} in layout '{layout_name}'. Skipping.")
+                continue
+
+            active[mon_id] = compiled
+
+        # Switching back to a selection seen before reuses its views
+        selection = tuple((mon_id, compiled.layout_name) for mon_id, compiled in active.items())
+        derived = views.get(selection)
+        if derived is None:
+            derived = views[selection] = self._derive(active)
+        monitors, zone_lists, global_ring, zone_numbers, zone_labels, zone_by_number = derived
+
+        init = object.__setattr__
+        init(self, 'active_layout', active_layout)
+        init(self, 'per_monitor_layouts', MappingProxyType(dict(per_monitor_layouts)))
+        init(self, 'active_compiled', MappingProxyType(active))
+        init(self, 'monitors', monitors)
+        init(self, 'zone_lists', zone_lists)
+        init(self, 'global_ring', global_ring)
+        init(self, 'zone_numbers', zone_numbers)
+        init(self, 'zone_labels', zone_labels)
+        init(self, 'zone_by_number', zone_by_number)
+        init(self, '_views', views)
+
+    @staticmethod
+    def _derive(active: Dict[int, CompiledZones]) -> tuple:
+        """Zone maps, overlay zone lists, global ring and numbering for one active selection"""
+        monitors = {mon_id: compiled.zones for mon_id, compiled in active.items()}
+        zone_numbers, zone_labels = number_zones(monitors)
+
+        # Zones as the overlay paints them (name included)
+        zone_lists = {
+            mon_id: tuple(dict(z, name=zone_name) for zone_name, z in zones.items())
+            for mon_id, zones in monitors.items()
+        }
+
+        # Cross-monitor cycle order: monitors sorted, zones in layout order
+        global_ring = ZoneRing([
+            (mon_id, zone_name)
+            for mon_id in sorted(active.keys())
+            for zone_name in active[mon_id].ring.items
+        ])
+
+        return (MappingProxyType(monitors), MappingProxyType(zone_lists), global_ring,
+                MappingProxyType(zone_numbers), MappingProxyType(zone_labels),
+                MappingProxyType({num: key for key, num in zone_numbers.items()}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GeometrySnapshot is immutable - use evolve()")
+
+    def evolve(self, **changes) -> 'GeometrySnapshot':
+        """
+        New snapshot (next generation) with some base fields replaced.
+
+        Layout switches only change the selection (active_layout,
+        per_monitor_layouts): the frozen table, layout order and monitor
+        maps are shared with this snapshot and only the active zones are
+        picked again, so the cost does not grow with the number of layouts.
+        """
+        if changes.keys() <= self.SELECTION_FIELDS:
+            snapshot = object.__new__(GeometrySnapshot)
+            init = object.__setattr__
+            init(snapshot, 'generation', self.generation + 1)
+            for name in self.TABLE_FIELDS:
+                init(snapshot, name, getattr(self, name))
+            snapshot._activate(changes.get('active_layout', self.active_layout),
+                               changes.get('per_monitor_layouts', self.per_monitor_layouts),
+                               self._views)
+            return snapshot
+
+        fields = {name: getattr(self, name) for name in self.BASE_FIELDS}
+        fields.update(changes)
+        fields['generation'] = self.generation + 1
+        if 'compiled_layouts' not in changes:
+            fields['views'] = self._views
+        return GeometrySnapshot(**fields)
+
+    def layout_for_monitor(self, monitor_id: int) -> str:
+        """Name of the layout applied to a monitor"""
+        return self.per_monitor_layouts.get(monitor_id, self.active_layout)
+
+    def adjacent_layout(self, layout_name: str, step: int) -> str:
+        """Layout `step` positions away from layout_name (wrapping)"""
+        idx = self.layout_index.get(layout_name, 0)
+        return self.layout_order[(idx + step) % len(self.layout_order)]
+
+    def zone_at_point(self, x: int, y: int) -> Optional[Tuple[int, str]]:
+        """(monitor_id, zone_name) under screen coordinates for drag hover, or None"""
+        mon_id = self.monitor_index.lookup(x, y)
+        if mon_id is None:
+            return None
+
+        compiled = self.active_compiled.get(mon_id)
+        if compiled is None:
+            return None
+
+        zone_name = compiled.hit_index.lookup(x, y)
+        return (mon_id, zone_name) if zone_name is not None else None
@@ -1,28 +1,60 @@
 # zone_manager.py (Refactored to use ConfigManager)
+import threading
 import win32gui
 import win32con
 from .monitor_detection import MonitorDetector
 from .window_state_tracker import WindowStateTracker
 from .config_manager import ConfigManager
+from .window_ops import window_move_transaction
+from .window_dispatcher import get_dispatcher
+from .window_events import WinEventSource
+from .latency import latency
+from .zone_geometry import build_compiled_zones, build_monitor_index, GeometrySnapshot
+from .layout_compiler import prepare_layouts, compile_layouts, packed_to_zones
 
 
 class ZoneManager:
-    def __init__(self, config_dir='config'):
+    def __init__(self, config_dir='config', config_manager=None):
         self.config_dir = config_dir
         
-        # Initialize config manager
-        self.config_manager = ConfigManager(config_dir)
+        # Initialize config manager (callers may pass their own, e.g. with overrides)
+        self.config_manager = config_manager or ConfigManager(config_dir)
         self.config_manager.load_all()
         
         # Initialize state tracker
         self.state_tracker = WindowStateTracker()
         
-        # Detect monitors FIRST (required by overlay)
-        self.detected_monitors = MonitorDetector.get_monitors()
+        # All window operations run on the dispatcher thread (one writer)
+        self.dispatcher = get_dispatcher()
         
-        # Load configuration
+        # Shared window event source (WinEvent hooks)
+        self.window_events = WinEventSource()
+        
+        # Current zone geometry (GeometrySnapshot). Replaced as a whole, never
+        # modified; writers serialize on the lock, readers just take a reference.
+        self.geometry = None
+        self._geometry_lock = threading.Lock()
+        
+        # Load configuration (detects monitors - required by overlay)
         self.load_config()
     
+    # Views of the current snapshot (readers needing several should grab self.geometry once)
+    
+    @property
+    def monitors(self):
+        """{monitor_id: {zone_name: zone}} for the active layouts"""
+        return self.geometry.monitors
+    
+    @property
+    def detected_monitors(self):
+        """Detected monitor dicts"""
+        return self.geometry.detected_monitors
+    
+    @property
+    def active_layout(self):
+        """Default layout name"""
+        return self.geometry.active_layout
+    
     def load_config(self):
         """Load configuration from config manager"""
         # Reload config files
@@ -30,24 +62,25 @@ class ZoneManager:
         
         # Get layouts
         self.layouts = self.config_manager.layouts
-        self.active_layout = self.config_manager.active_layout
-        self.per_monitor_layouts = {}
+        active_layout = self.config_manager.active_layout
         
         print(f"\nLoaded {len(self.layouts)} layouts: {', '.join(self.layouts.keys())}")
         
         # Re-detect monitors (in case hardware changed)
-        self.detected_monitors = MonitorDetector.get_monitors()
+        detected_monitors = MonitorDetector.get_monitors()
         
-        print(f"\nDetected {len(self.detected_monitors)} monitor(s):")
-        for mon in self.detected_monitors:
+        print(f"\nDetected {len(detected_monitors)} monitor(s):")
+        for mon in detected_monitors:
             primary = " (PRIMARY)" if mon['is_primary'] else ""
             print(f"  Monitor {mon['id']}: {mon['width']}x{mon['height']} at ({mon['x']}, {mon['y']}){primary}")
             print(f"    Work area: {mon['work_width']}x{mon['work_height']} at ({mon['work_x']}, {mon['work_y']})")
         
-        print(f"\nDefault layout: {self.active_layout}")
+        print(f"\nDefault layout: {active_layout}")
         
         # Get config values
         self.overlay_config = self.config_manager.get_overlay_config()
+        self.state_tracker.configure(self.config_manager.get_state_tracking_config())
+        latency.enabled = bool(self.config_manager.get_diagnostics_config()['latency'])
         wm_config = self.config_manager.get_window_management_config()
         
         self.restore_hotkey = wm_config['restore']
@@ -59,6 +92,10 @@ class ZoneManager:
             'cycle_prev_hotkey': wm_config['cycle_prev'],
             'cycle_all_next_hotkey': wm_config['cycle_all_next'],
             'cycle_all_prev_hotkey': wm_config['cycle_all_prev'],
+            'zone_windows_next_hotkey': wm_config['zone_windows_next'],
+            'zone_windows_prev_hotkey': wm_config['zone_windows_prev'],
+            'undo_hotkey': wm_config['undo'],
+            'redo_hotkey': wm_config['redo'],
             'drag_show_zones_key': self.config_manager.get_drag_config()['show_zones_key']
         }
         
@@ -66,81 +103,59 @@ class ZoneManager:
         self.hotkeys = self.config_manager.get_zone_hotkeys()
         self.layout_hotkeys = self.config_manager.get_layout_switches()
         
-        # Load zone data
-        self.monitors = self._load_monitors()
+        # Compile all layouts against all monitors once (outside the lock - this
+        # is the slow part), then publish a fresh snapshot in one step
+        monitor_index = build_monitor_index(detected_monitors)
+        compiled_layouts = self._compile_layouts(detected_monitors)
+        
+        with self._geometry_lock:
+            generation = self.geometry.generation + 1 if self.geometry else 0
+            self.geometry = GeometrySnapshot(
+                generation,
+                detected_monitors,
+                monitor_index,
+                compiled_layouts,
+                layout_order=list(self.layouts.keys()),  # scroll-to-switch cycling order
+                active_layout=active_layout,
+                per_monitor_layouts={}
+            )
     
-    def _load_monitors(self):
-        """Parse monitor zones from layouts and calculate actual pixel values"""
-        monitors = {}
-        
-        for detected_mon in self.detected_monitors:
-            mon_id = detected_mon['id']
-            
-            # Get layout for this specific monitor
-            layout_name = self.per_monitor_layouts.get(mon_id, self.active_layout)
-            
-            if layout_name not in self.layouts:
-                print(f"Warning: Layout '{layout_name}' not found. Using default.")
-                layout_name = self.active_layout
-            
-            layout_data = self.layouts[layout_name]
-            
-            # NEW: Check for simplified format (zones at root level)
-            zone_list = layout_data.get('zones', [])
-            
-            # LEGACY: Fall back to old monitor-specific format
-            if not zone_list:
-                monitor_configs = layout_data.get('monitors', [])
-                for mc in monitor_configs:
-                    if mc['id'] == mon_id:
-                        zone_list = mc.get('zones', [])
-                        break
-            
-            if not zone_list:
-                print(f"Warning: No zones found for Monitor {mon_id} in layout '{layout_name}'. Skipping.")
-                continue
-            
-            monitors[mon_id] = {}
+    def _compile_layouts(self, detected_monitors):
+        """Compile every layout against every detected monitor once.
+
+        Returns {(layout_name, monitor_id): CompiledZones}. Layout switches only
+        pick entries out of this table, so no pixel math happens after load.
+        """
+        compiled = {}
+        
+        # Hover hit-testing settings are baked into each compiled entry
+        drag_cfg = self.config_manager.get_drag_config()
+        hover_margin = drag_cfg['hover_margin']
+        ignore_names = ("full",) if drag_cfg['ignore_fullscreen'] else ()
+        
+        # Percent -> pixel conversion for all layouts and monitors in one vectorized pass
+        detected_by_id = {mon['id']: mon for mon in detected_monitors}
+        packed_table = compile_layouts(prepare_layouts(self.layouts), detected_monitors)
+        
+        for (layout_name, mon_id), (table, packed) in packed_table.items():
+            zones = packed_to_zones(table, packed)
+            compiled[(layout_name, mon_id)] = build_compiled_zones(
+                layout_name, detected_by_id[mon_id], zones, hover_margin, ignore_names
+            )
             
-            for zone in zone_list:
-                # Default respect_taskbar to True (only need to specify if False)
-                respect_taskbar = zone.get('respect_taskbar', True)
-                
-                # Use work area if respecting taskbar
-                if respect_taskbar:
-                    base_x = detected_mon['work_x']
-                    base_y = detected_mon['work_y']
-                    base_width = detected_mon['work_width']
-                    base_height = detected_mon['work_height']
-                else:
-                    base_x = detected_mon['x']
-                    base_y = detected_mon['y']
-                    base_width = detected_mon['width']
-                    base_height = detected_mon['height']
-                
-                # Calculate actual pixel values from percentages
-                zone_x = base_x + int(base_width * zone['x_percent'] / 100)
-                zone_y = base_y + int(base_height * zone['y_percent'] / 100)
-                zone_width = int(base_width * zone['width_percent'] / 100)
-                zone_height = int(base_height * zone['height_percent'] / 100)
-                
-                entry = {
-                    'x': zone_x,
-                    'y': zone_y,
-                    'width': zone_width,
-                    'height': zone_height
-                }
-                
-                # Carry optional YAML fields through (e.g., key)
-                if 'key' in zone:
-                    entry['key'] = zone['key']
-                
-                monitors[mon_id][zone['name']] = entry
-                                
-                print(f"  Zone '{zone['name']}' on Monitor {mon_id} ({layout_name}): "
-                      f"{zone_width}x{zone_height} at ({zone_x}, {zone_y})")
+            for zone_name, z in zones.items():
+                print(f"  Zone '{zone_name}' on Monitor {mon_id} ({layout_name}): "
+                      f"{z['width']}x{z['height']} at ({z['x']}, {z['y']})")
         
-        return monitors
+        return compiled
+    
+    def get_layout_for_monitor(self, monitor_id):
+        """Get the name of the layout currently applied to a monitor"""
+        return self.geometry.layout_for_monitor(monitor_id)
+    
+    def get_adjacent_layout(self, layout_name, step):
+        """Get the layout `step` positions away from layout_name (wrapping)"""
+        return self.geometry.adjacent_layout(layout_name, step)
     
     def switch_layout_for_monitor(self, monitor_id, layout_name):
         """Switch layout for a specific monitor"""
@@ -148,8 +163,12 @@ class ZoneManager:
             print(f"Layout '{layout_name}' not found")
             return
         
-        self.per_monitor_layouts[monitor_id] = layout_name
-        self.monitors = self._load_monitors()
+        # Derive a new snapshot from the precompiled table and swap it in;
+        # readers holding the old one never see it change underneath them
+        with self._geometry_lock:
+            per_monitor = dict(self.geometry.per_monitor_layouts)
+            per_monitor[monitor_id] = layout_name
+            self.geometry = self.geometry.evolve(per_monitor_layouts=per_monitor)
         print(f"Switched Monitor {monitor_id} to layout: {layout_name}")
     
     def switch_layout(self, layout_name):
@@ -158,33 +177,65 @@ class ZoneManager:
             print(f"Layout '{layout_name}' not found")
             return
         
-        self.active_layout = layout_name
+        with self._geometry_lock:
+            self.geometry = self.geometry.evolve(active_layout=layout_name)
         self.config_manager.active_layout = layout_name
-        self.monitors = self._load_monitors()
         print(f"Switched default layout to: {layout_name}")
     
+    def start_monitoring(self):
+        """Start auto-restore monitoring (event-driven unless configured for polling)"""
+        tracking_cfg = self.config_manager.get_state_tracking_config()
+        event_source = self.window_events if tracking_cfg['mode'] == 'events' else None
+        self.state_tracker.start_monitoring(event_source)
+    
     def get_active_window(self):
         """Get the currently active window handle"""
         return win32gui.GetForegroundWindow()
     
-    def move_window_to_zone(self, monitor_id, zone_name):
-        """Move active window to specified zone"""
-        hwnd = self.get_active_window()
+    def move_window_to_zone(self, monitor_id, zone_name, hwnd=None, trace=None):
+        """Move a window (default: the active window) to specified zone
+        
+        Args:
+            trace: LatencyTrace to time the snap's stages with (None when not tracing)
+        """
+        hwnd = hwnd or self.get_active_window()
         
         if not hwnd:
             print("No active window")
             return
         
-        if monitor_id not in self.monitors:
+        monitors = self.geometry.monitors
+        if monitor_id not in monitors:
             print(f"Monitor {monitor_id} not found")
             return
         
-        if zone_name not in self.monitors[monitor_id]:
+        if zone_name not in monitors[monitor_id]:
+            print(f"Zone {zone_name} not found on monitor {monitor_id}")
+            return
+        
+        if trace is not None:
+            trace.mark('matched')
+        
+        # Supersedes any move of this window that hasn't run yet
+        self.dispatcher.submit(('move', hwnd), self._move_window_to_zone, hwnd, monitor_id, zone_name, trace)
+    
+    def _move_window_to_zone(self, hwnd, monitor_id, zone_name, trace=None):
+        """Snap hwnd to a zone (dispatcher thread)"""
+        if trace is not None:
+            trace.mark('dispatch')
+        
+        zone = self.monitors.get(monitor_id, {}).get(zone_name)
+        if zone is None:
             print(f"Zone {zone_name} not found on monitor {monitor_id}")
             return
         
         # Mark operation in progress to prevent auto-restore during snap
         self.state_tracker.mark_operation_in_progress(hwnd)
+        if trace is not None:
+            trace.mark('exempt')
+        
+        # Remember where the window was, for undo
+        self.state_tracker.record_geometry(hwnd)
         
         # Check if window is currently snapped
         is_currently_snapped = hwnd in self.state_tracker.snapped_windows
@@ -209,26 +260,28 @@ class ZoneManager:
             except Exception as e:
                 print(f"Error checking window size: {e}")
         
-        zone = self.monitors[monitor_id][zone_name]
-        
         # Restore if maximized
         placement = win32gui.GetWindowPlacement(hwnd)
         if placement[1] == win32con.SW_SHOWMAXIMIZED:
             win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
         
-        # Move and resize
-        win32gui.SetWindowPos(
-            hwnd,
-            win32con.HWND_TOP,
-            zone['x'],
-            zone['y'],
-            zone['width'],
-            zone['height'],
-            win32con.SWP_SHOWWINDOW
-        )
-        
-        # Mark as snapped
-        self.state_tracker.mark_as_snapped(hwnd)
+        # Move and resize (batched with any other moves in the same transaction),
+        # then mark as snapped once the final rect is in place
+        with window_move_transaction() as txn:
+            txn.move(
+                hwnd,
+                zone['x'],
+                zone['y'],
+                zone['width'],
+                zone['height'],
+                win32con.SWP_SHOWWINDOW,
+                insert_after=win32con.HWND_TOP
+            )
+            txn.after_commit(lambda: self.state_tracker.mark_as_snapped(hwnd, (monitor_id, zone_name)))
+            if trace is not None:
+                trace.mark('prepare')
+                # The move lands when the (possibly outer) transaction commits
+                txn.after_commit(lambda: trace.finish('moved'))
         
         print(f"Moved window to {zone_name} on monitor {monitor_id}")
         self.state_tracker.cleanup_old_states()
@@ -236,7 +289,7 @@ class ZoneManager:
         # Unmark operation (with delay to allow animation to complete)
         self.state_tracker.unmark_operation_in_progress(hwnd)
     
-    def restore_window(self):
+    def restore_window(self, trace=None):
         """Restore the active window to its original size and position"""
         hwnd = self.get_active_window()
         
@@ -244,25 +297,104 @@ class ZoneManager:
             print("No active window")
             return
         
+        if trace is not None:
+            trace.mark('matched')
+        self.dispatcher.submit(('restore', hwnd), self._restore_window, hwnd, trace)
+    
+    def _restore_window(self, hwnd, trace=None):
+        """Restore hwnd to its saved state (dispatcher thread)"""
+        if trace is not None:
+            trace.mark('dispatch')
         success = self.state_tracker.restore_state(hwnd)
         if not success:
             print("Could not restore window - no saved state found")
+        elif trace is not None:
+            trace.finish('restored')
             
+    def step_window_history(self, direction='undo'):
+        """Undo/redo the active window's last geometry change"""
+        hwnd = self.get_active_window()
+        
+        if not hwnd:
+            print("No active window")
+            return
+        
+        # Not coalesced: each press is one step
+        self.dispatcher.submit(None, self._step_window_history, hwnd, direction)
+    
+    def _step_window_history(self, hwnd, direction):
+        """Move hwnd to the previous/next geometry in its history (dispatcher thread)"""
+        if direction == 'undo':
+            rect = self.state_tracker.undo_geometry(hwnd)
+        else:
+            rect = self.state_tracker.redo_geometry(hwnd)
+        
+        if rect is None:
+            print(f"Nothing to {direction} for this window")
+            return
+        
+        self.state_tracker.mark_operation_in_progress(hwnd)
+        
+        placement = win32gui.GetWindowPlacement(hwnd)
+        if placement[1] == win32con.SW_SHOWMAXIMIZED:
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        
+        with window_move_transaction() as txn:
+            txn.move(hwnd, *rect, win32con.SWP_SHOWWINDOW, insert_after=win32con.HWND_TOP)
+            txn.after_commit(lambda: self._track_zone_of_window(hwnd))
+        
+        print(f"{direction.capitalize()}: window at {rect[2]}x{rect[3]} ({rect[0]}, {rect[1]})")
+        self.state_tracker.unmark_operation_in_progress(hwnd)
+    
+    def _track_zone_of_window(self, hwnd):
+        """Mark hwnd snapped if it now sits in a zone, otherwise stop tracking it as snapped"""
+        geometry = self.geometry
+        rect = self._get_window_rect(hwnd)
+        if rect:
+            monitor_id = self._get_monitor_for_rect(rect, geometry)
+            zone_name = self._find_zone_for_rect(rect, monitor_id, geometry)
+            if zone_name is not None:
+                self.state_tracker.mark_as_snapped(hwnd, (monitor_id, zone_name))
+                return
+        self.state_tracker.forget_snapped(hwnd)
+    
     def get_monitor_for_window(self, hwnd):
         """Determine which monitor a window is on"""
+        rect = self._get_window_rect(hwnd)
+        return self._get_monitor_for_rect(rect) if rect else 0
+    
+    def get_monitor_at_point(self, x, y):
+        """Get monitor ID at screen coordinates, or None"""
+        return self.geometry.monitor_index.lookup(x, y)
+    
+    def get_zone_at_point(self, x, y):
+        """Get (monitor_id, zone_name) under screen coordinates for drag hover, or None"""
+        return self.geometry.zone_at_point(x, y)
+
+    def _get_monitor_for_rect(self, rect, geometry=None):
+        """Determine which monitor a window rect (L, T, R, B) is on"""
+        geometry = geometry or self.geometry
+        mon_id = geometry.monitor_index.lookup((rect[0] + rect[2]) // 2, (rect[1] + rect[3]) // 2)
+        return mon_id if mon_id is not None else 0
+    
+    def _get_window_rect(self, hwnd):
+        """GetWindowRect that returns None instead of raising"""
         try:
-            rect = win32gui.GetWindowRect(hwnd)
-            window_center_x = (rect[0] + rect[2]) // 2
-            window_center_y = (rect[1] + rect[3]) // 2
-            
-            for monitor in self.detected_monitors:
-                if (monitor['x'] <= window_center_x < monitor['x'] + monitor['width'] and
-                    monitor['y'] <= window_center_y < monitor['y'] + monitor['height']):
-                    return monitor['id']
-            
-            return 0
-        except:
-            return 0
+            return win32gui.GetWindowRect(hwnd)
+        except Exception:
+            return None
+    
+    def _find_zone_for_rect(self, rect, monitor_id, geometry=None):
+        """Get the zone name on monitor_id a window rect sits in (10px tolerance), or None"""
+        compiled = (geometry or self.geometry).active_compiled.get(monitor_id)
+        if compiled is None or rect is None:
+            return None
+        return compiled.rect_index.lookup((rect[0], rect[1], rect[2] - rect[0], rect[3] - rect[1]))
+    
+    def _get_pending_zone(self, hwnd):
+        """(monitor_id, zone_name) of a queued move for hwnd, so repeated cycling steps from its target"""
+        pending = self.dispatcher.pending(('move', hwnd))
+        return (pending[1], pending[2]) if pending else None
 
     def cycle_zone(self, direction='next'):
         """Cycle the active window through zones on its current monitor"""
@@ -272,48 +404,37 @@ class ZoneManager:
             print("No active window")
             return
         
-        monitor_id = self.get_monitor_for_window(hwnd)
+        geometry = self.geometry
         
-        if monitor_id not in self.monitors:
+        # Step from the target of a move that hasn't run yet, else from where the window is
+        pending = self._get_pending_zone(hwnd)
+        if pending:
+            monitor_id, current_zone = pending
+        else:
+            rect = self._get_window_rect(hwnd)
+            monitor_id = self._get_monitor_for_rect(rect, geometry) if rect else 0
+            current_zone = self._find_zone_for_rect(rect, monitor_id, geometry)
+        
+        if monitor_id not in geometry.active_compiled:
             print(f"Monitor {monitor_id} not found")
             return
         
-        zones = list(self.monitors[monitor_id].keys())
+        ring = geometry.active_compiled[monitor_id].ring
         
-        if not zones:
+        if not ring:
             print(f"No zones defined for monitor {monitor_id}")
             return
         
-        # Find current zone
-        current_zone_idx = 0
-        try:
-            rect = win32gui.GetWindowRect(hwnd)
-            current_x, current_y = rect[0], rect[1]
-            current_width = rect[2] - rect[0]
-            current_height = rect[3] - rect[1]
-            
-            tolerance = 10
-            for idx, zone_name in enumerate(zones):
-                zone = self.monitors[monitor_id][zone_name]
-                if (abs(current_x - zone['x']) < tolerance and
-                    abs(current_y - zone['y']) < tolerance and
-                    abs(current_width - zone['width']) < tolerance and
-                    abs(current_height - zone['height']) < tolerance):
-                    current_zone_idx = idx
-                    break
-        except:
-            pass
-        
-        # Calculate next zone (wrapping around)
-        if direction == 'next':
-            next_zone_idx = (current_zone_idx + 1) % len(zones)
-        else:  # prev
-            next_zone_idx = (current_zone_idx - 1) % len(zones)
-        
-        next_zone_name = zones[next_zone_idx]
-        
-        print(f"Cycling {direction}: zone {current_zone_idx} -> {next_zone_idx} ({next_zone_name})")
-        self.move_window_to_zone(monitor_id, next_zone_name)
+        # Unknown current zone falls back to the first zone
+        if current_zone not in ring:
+            current_zone = ring.items[0]
+        
+        # Next zone comes straight from the precomputed ring (wrapping around)
+        next_zone_name = ring.step(current_zone, direction)
+        
+        print(f"Cycling {direction}: zone {ring.position(current_zone)} -> "
+              f"{ring.position(next_zone_name)} ({next_zone_name})")
+        self.move_window_to_zone(monitor_id, next_zone_name, hwnd)
         
     def cycle_zone_all_monitors(self, direction='next'):
         """Cycle through all zones across all monitors"""
@@ -323,39 +444,62 @@ class ZoneManager:
             print("No active window")
             return
         
-        all_zones = []
-        for mon_id in sorted(self.monitors.keys()):
-            for zone_name in self.monitors[mon_id].keys():
-                all_zones.append((mon_id, zone_name))
+        geometry = self.geometry
+        ring = geometry.global_ring
         
-        if not all_zones:
+        if not ring:
             print("No zones defined")
             return
         
-        current_idx = 0
-        try:
-            rect = win32gui.GetWindowRect(hwnd)
-            current_x, current_y = rect[0], rect[1]
-            current_width = rect[2] - rect[0]
-            current_height = rect[3] - rect[1]
-            
-            tolerance = 10
-            for idx, (mon_id, zone_name) in enumerate(all_zones):
-                zone = self.monitors[mon_id][zone_name]
-                if (abs(current_x - zone['x']) < tolerance and
-                    abs(current_y - zone['y']) < tolerance and
-                    abs(current_width - zone['width']) < tolerance and
-                    abs(current_height - zone['height']) < tolerance):
-                    current_idx = idx
-                    break
-        except:
-            pass
-        
-        if direction == 'next':
-            next_idx = (current_idx + 1) % len(all_zones)
-        else:
-            next_idx = (current_idx - 1) % len(all_zones)
-        
-        next_mon, next_zone = all_zones[next_idx]
+        # Step from a queued move's target if there is one
+        current = self._get_pending_zone(hwnd)
+        rect = self._get_window_rect(hwnd) if current is None else None
+        if rect:
+            monitor_id = self._get_monitor_for_rect(rect, geometry)
+            zone_name = self._find_zone_for_rect(rect, monitor_id, geometry)
+            if zone_name is not None:
+                current = (monitor_id, zone_name)
+        if current not in ring:
+            current = ring.items[0]
+        
+        next_mon, next_zone = ring.step(current, direction)
         print(f"Cycling {direction} to Monitor {next_mon}, Zone {next_zone}")
-        self.move_window_to_zone(next_mon, next_zone)
\ No newline at end of file
+        self.move_window_to_zone(next_mon, next_zone, hwnd)
+    
+    def cycle_zone_windows(self, direction='next'):
+        """Cycle focus through the windows stacked in the active window's zone"""
+        # Not coalesced: each step starts from the window the previous step focused
+        self.dispatcher.submit(None, self._cycle_zone_windows, direction)
+    
+    def _cycle_zone_windows(self, direction):
+        """Focus the next/previous window in the active window's zone (dispatcher thread)"""
+        hwnd = self.get_active_window()
+        
+        if not hwnd:
+            print("No active window")
+            return
+        
+        occupancy = self.state_tracker.occupancy
+        zone_key = occupancy.zone_of(hwnd)
+        
+        if zone_key is None:
+            print("Active window is not snapped to a zone")
+            return
+        
+        # Step through the zone's stack, dropping windows that have since closed
+        target = occupancy.neighbor(hwnd, direction)
+        while target is not None and target != hwnd and not win32gui.IsWindow(target):
+            next_target = occupancy.neighbor(target, direction)
+            self.state_tracker.forget_snapped(target)
+            target = next_target
+        
+        if target is None or target == hwnd:
+            print(f"No other windows in zone {zone_key[1]} on monitor {zone_key[0]}")
+            return
+        
+        try:
+            win32gui.SetForegroundWindow(target)
+            print(f"Focused window {target} in zone {zone_key[1]} on monitor {zone_key[0]} "
+                  f"({occupancy.count(zone_key)} windows)")
+        except Exception as e:
+            print(f"Error focusing window: {e}")
@@ -0,0 +1,116 @@
+# core/zone_occupancy.py
+"""Which windows are in which zone - O(1) index in both directions"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ZoneKey = Tuple[int, str]  # (monitor_id, zone_name)
+
+
+class ZoneOccupancy:
+    """
+    Maps (monitor_id, zone_name) to an ordered stack of hwnds and back.
+
+    Each zone's stack is a circular doubly-linked list threaded through
+    per-hwnd next/prev links, so placing, removing, finding a window's zone
+    and stepping to its neighbour are all O(1). The most recently snapped
+    window is on top.
+    """
+
+    def __init__(self):
+        self._zone_of: Dict[int, ZoneKey] = {}  # hwnd -> zone it's in
+        self._next: Dict[int, int] = {}  # hwnd -> window below it (wraps to top)
+        self._prev: Dict[int, int] = {}  # hwnd -> window above it (wraps to bottom)
+        self._top: Dict[ZoneKey, int] = {}  # zone -> top window
+        self._count: Dict[ZoneKey, int] = {}  # zone -> number of windows
+        self._lock = threading.Lock()
+
+    def place(self, hwnd: int, zone_key: ZoneKey) -> None:
+        """Put hwnd on top of zone_key's stack (moving it out of any previous zone)"""
+        with self._lock:
+            self._remove(hwnd)
+
+            top = self._top.get(zone_key)
+            if top is None:
+                self._next[hwnd] = hwnd
+                self._prev[hwnd] = hwnd
+                self._count[zone_key] = 1
+            else:
+                bottom = self._prev[top]
+                self._next[hwnd] = top
+                self._prev[hwnd] = bottom
+                self._next[bottom] = hwnd
+                self._prev[top] = hwnd
+                self._count[zone_key] += 1
+
+            self._top[zone_key] = hwnd
+            self._zone_of[hwnd] = zone_key
+
+    def remove(self, hwnd: int) -> Optional[ZoneKey]:
+        """Take hwnd out of its zone. Returns the zone it was in, if any."""
+        with self._lock:
+            return self._remove(hwnd)
+
+    def _remove(self, hwnd: int) -> Optional[ZoneKey]:
+        zone_key = self._zone_of.pop(hwnd, None)
+        if zone_key is None:
+            return None
+
+        next_hwnd = self._next.pop(hwnd)
+        prev_hwnd = self._prev.pop(hwnd)
+
+        if self._count[zone_key] == 1:
+            del self._count[zone_key]
+            del self._top[zone_key]
+        else:
+            self._next[prev_hwnd] = next_hwnd
+            self._prev[next_hwnd] = prev_hwnd
+            self._count[zone_key] -= 1
+            if self._top[zone_key] == hwnd:
+                self._top[zone_key] = next_hwnd
+
+        return zone_key
+
+    def zone_of(self, hwnd: int) -> Optional[ZoneKey]:
+        """Get the zone hwnd is in, or None"""
+        return self._zone_of.get(hwnd)
+
+    def top(self, zone_key: ZoneKey) -> Optional[int]:
+        """Get the most recently snapped window in a zone, or None"""
+        return self._top.get(zone_key)
+
+    def count(self, zone_key: ZoneKey) -> int:
+        """Get the number of windows in a zone"""
+        return self._count.get(zone_key, 0)
+
+    def neighbor(self, hwnd: int, direction: str = 'next') -> Optional[int]:
+        """Get the window below ('next') or above ('prev') hwnd in its zone, wrapping"""
+        with self._lock:
+            links = self._next if direction == 'next' else self._prev
+            return links.get(hwnd)
+
+    def windows_in(self, zone_key: ZoneKey) -> List[int]:
+        """Get a zone's windows, top first"""
+        with self._lock:
+            top = self._top.get(zone_key)
+            if top is None:
+                return []
+            windows = [top]
+            hwnd = self._next[top]
+            while hwnd != top:
+                windows.append(hwnd)
+                hwnd = self._next[hwnd]
+            return windows
+
+    def occupied_zones(self) -> List[ZoneKey]:
+        """Get all zones that currently hold at least one window"""
+        return list(self._top.keys())
+
+    def clear(self) -> None:
+        """Forget all windows"""
+        with self._lock:
+            self._zone_of.clear()
+            self._next.clear()
+            self._prev.clear()
+            self._top.clear()
+            self._count.clear()
@@ -50,7 +50,7 @@ def main():
         overlay_manager = overlay  # Store globally for cleanup
 
         # Start auto-restore monitoring
-        zone_manager.state_tracker.start_monitoring()
+        zone_manager.start_monitoring()
 
         # Start hotkey listener
         hotkey_listener = HotkeyListener(zone_manager, overlay)
@@ -0,0 +1,65 @@
+# tests/conftest.py
+"""Shared fixtures - core.input_replay's fake desktop stands in for Win32, so the tests run on any OS"""
+
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.input_replay import FakeDesktop, parse_monitors  # noqa: E402
+
+# The fakes must be in place before any test module imports the app modules
+FakeDesktop(parse_monitors('1920x1080')).install()
+
+
+class QueuedDispatcher:
+    """Dispatcher stand-in that queues keyed commands (same coalescing as WindowOpDispatcher) until drain()"""
+
+    def __init__(self):
+        self.queue = OrderedDict()
+        self.submitted = 0
+        self.executed = 0
+        self.keys = []  # every submitted key, in order
+
+    def submit(self, key, fn, *args):
+        self.submitted += 1
+        self.keys.append(key)
+        if key is None:
+            key = ('anonymous', self.executed + len(self.queue))
+        self.queue.pop(key, None)
+        self.queue[key] = (fn, args)
+
+    def pending(self, key):
+        entry = self.queue.get(key)
+        return entry[1] if entry else None
+
+    def queue_depth(self):
+        return len(self.queue)
+
+    def drain(self):
+        """Run queued commands (and anything they queue) until the queue is empty"""
+        while self.queue:
+            _, (fn, args) = self.queue.popitem(last=False)
+            fn(*args)
+            self.executed += 1
+
+
+@pytest.fixture
+def desktop():
+    """Two 1920x1080 monitors with two app windows each; window moves emit LOCATIONCHANGE"""
+    desktop = FakeDesktop(parse_monitors('1920x1080,1920x1080'))
+    desktop.install()
+    return desktop
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """QueuedDispatcher in place of the app-wide window operation dispatcher"""
+    from core import window_state_tracker
+
+    dispatcher = QueuedDispatcher()
+    monkeypatch.setattr(window_state_tracker, 'get_dispatcher', lambda: dispatcher)
+    return dispatcher
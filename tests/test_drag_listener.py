@@ -0,0 +1,173 @@
+# tests/test_drag_listener.py
+"""Event-driven drag state machine in DragZoneListener, fed through SimulatedInputSource"""
+
+import os
+
+import pytest
+
+from core import drag_listener
+from core.input_events import BUTTON_DOWN, BUTTON_UP, KEY_DOWN, KEY_UP, MOVE, InputEvent
+from core.input_replay import TITLE_BAR_HEIGHT, VK_LSHIFT, InputReplay
+from core.window_ops import window_move_transaction
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+
+
+@pytest.fixture
+def replay(desktop, dispatcher, monkeypatch):
+    # InputReplay swaps in its virtual clock; put the real one back afterwards
+    monkeypatch.setattr(drag_listener, 'time', drag_listener.time)
+    replay = InputReplay(CONFIG_DIR, desktop)
+    replay.zone_manager.dispatcher = dispatcher
+    replay.clock.advance_to(10_000_000)  # well past the post-snap cooldown
+    replay.drag.start(worker=False)
+    yield replay
+    replay.drag.stop()
+
+
+def feed(replay, kind, x=0, y=0, button=None, vk=None):
+    """Deliver one event the way the hooks would, then run the state machine. Returns events handled."""
+    event = InputEvent(kind, x, y, button, vk)
+    replay.desktop.apply_input(event)
+    replay.source.emit(kind, x, y, button, vk)
+    return replay.drag.process_pending()
+
+
+def title_bar(desktop, hwnd):
+    L, T, R, B = desktop.window_rect(hwnd)
+    return (L + R) // 2, T + TITLE_BAR_HEIGHT // 2
+
+
+def move_submits(dispatcher, hwnd):
+    return sum(1 for key in dispatcher.keys if key == ('move', hwnd))
+
+
+def test_drag_with_show_key_snaps_on_release(desktop, dispatcher, replay):
+    hwnd = desktop.app_windows[0]
+    x, y = title_bar(desktop, hwnd)
+
+    feed(replay, BUTTON_DOWN, x, y, button='left')
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    assert replay.overlay.visible
+
+    # Sweep onto the second monitor; the hover zone follows the cursor
+    target = (1920 + 300, 500)
+    feed(replay, MOVE, *target)
+    hovered = replay.zone_manager.get_zone_at_point(*target)
+    assert hovered is not None and replay.drag.current_zone == hovered
+
+    feed(replay, BUTTON_UP, *target, button='left')
+    assert not replay.overlay.visible
+    assert move_submits(dispatcher, hwnd) == 1
+
+    dispatcher.drain()
+    assert replay.snaps[-1][1:3] == (hwnd, hovered)
+
+
+def test_moves_are_dropped_while_overlay_hidden(desktop, dispatcher, replay):
+    hwnd = desktop.app_windows[0]
+    x, y = title_bar(desktop, hwnd)
+    feed(replay, BUTTON_DOWN, x, y, button='left')
+
+    for step in range(1, 50):
+        assert feed(replay, MOVE, x + step * 10, y) == 0
+    assert replay.overlay.highlights == 0
+    assert replay.drag.current_zone is None
+
+    # Released without the overlay: the drag ends, nothing snaps
+    feed(replay, BUTTON_UP, x + 500, y, button='left')
+    assert move_submits(dispatcher, hwnd) == 0
+    assert ('drag_end', hwnd) in dispatcher.keys
+
+
+def test_show_key_is_edge_triggered(desktop, dispatcher, replay):
+    hwnd = desktop.app_windows[0]
+    x, y = title_bar(desktop, hwnd)
+    feed(replay, BUTTON_DOWN, x, y, button='left')
+
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    assert replay.overlay.shows == 1
+
+    # Auto-repeat while held does not show the overlay again
+    for _ in range(5):
+        feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    assert replay.overlay.shows == 1
+
+    # Right-click hides it; holding the key does not bring it back, a fresh press does
+    feed(replay, BUTTON_DOWN, x, y, button='right')
+    feed(replay, BUTTON_UP, x, y, button='right')
+    assert not replay.overlay.visible
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    assert not replay.overlay.visible
+
+    feed(replay, KEY_UP, x, y, vk=VK_LSHIFT)
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    assert replay.overlay.visible and replay.overlay.shows == 2
+
+
+def test_show_key_needs_a_moving_window(desktop, dispatcher, replay):
+    hwnd = desktop.app_windows[0]
+    L, T, R, B = desktop.window_rect(hwnd)
+    body = ((L + R) // 2, (T + B) // 2)
+
+    # Show key held before the drag starts: pressing the button is not a show-key edge
+    feed(replay, KEY_DOWN, *body, vk=VK_LSHIFT)
+    feed(replay, BUTTON_DOWN, *body, button='left')
+    assert not replay.overlay.visible
+
+    # Pressed in the client area, the window is not moving - the key does not show the overlay
+    feed(replay, KEY_UP, *body, vk=VK_LSHIFT)
+    feed(replay, KEY_DOWN, *body, vk=VK_LSHIFT)
+    assert not replay.overlay.visible
+
+    feed(replay, BUTTON_UP, *body, button='left')
+    assert move_submits(dispatcher, hwnd) == 0
+
+
+def test_release_snap_records_the_final_rect_inside_a_batch(desktop, dispatcher, replay):
+    """The dispatcher runs a drain inside one move transaction; the snapped rect must be the committed one"""
+    hwnd = desktop.app_windows[0]
+    x, y = title_bar(desktop, hwnd)
+    feed(replay, BUTTON_DOWN, x, y, button='left')
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    target = (1920 + 300, 500)
+    feed(replay, MOVE, *target)
+    feed(replay, BUTTON_UP, *target, button='left')
+
+    with window_move_transaction():
+        dispatcher.drain()
+
+    x, y, w, h = desktop.rects[hwnd]
+    assert replay.zone_manager.state_tracker.snapped_windows[hwnd] == (x, y, w, h)
+    assert replay.snaps[-1][3] == (x, y, w, h)
+
+
+def test_number_snap_settles_off_the_dispatcher(desktop, dispatcher, replay):
+    """The settle before a number snap moves the window is a scheduler deadline, not a dispatcher stall"""
+    hwnd = desktop.app_windows[0]
+    x, y = title_bar(desktop, hwnd)
+    feed(replay, BUTTON_DOWN, x, y, button='left')
+    feed(replay, KEY_DOWN, x, y, vk=VK_LSHIFT)
+    before = desktop.rects[hwnd]
+
+    feed(replay, KEY_DOWN, x, y, vk=0x51)  # Q - a zone key
+    # The cooldown starts on the event thread, as the snap is submitted
+    assert replay.drag.number_snap_occurred
+    assert replay.drag.last_number_snap_time == replay.clock.time()
+    assert move_submits(dispatcher, hwnd) == 1
+
+    # The dispatcher ends the drag and moves on; the move waits for the settle deadline
+    dispatcher.drain()
+    assert dispatcher.queue_depth() == 0
+    assert desktop.rects[hwnd] == before and not desktop.capture
+    assert replay.scheduler.is_pending(('drag_settle', hwnd))
+    assert replay.clock.now_us == 10_000_000
+
+    replay.clock.advance_to(10_000_000 + int(drag_listener.DRAG_SETTLE_DELAY * 1e6))
+    assert replay.scheduler.run_due() == 1
+    assert move_submits(dispatcher, hwnd) == 2
+    dispatcher.drain()
+
+    assert desktop.rects[hwnd] != before
+    assert replay.snaps[-1][1] == hwnd
+    assert replay.zone_manager.state_tracker.snapped_windows[hwnd] == desktop.rects[hwnd]
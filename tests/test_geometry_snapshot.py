@@ -0,0 +1,166 @@
+# tests/test_geometry_snapshot.py
+"""GeometrySnapshot publication - layout switches racing drag hit-testing and zone cycling"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+from core.input_replay import ReplayConfigManager
+from core.zone_manager import ZoneManager
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+SWITCHES = 3000
+
+
+class RecordingDispatcher:
+    """Records submitted moves without running them, so windows stay where they are"""
+
+    def __init__(self):
+        self.moves = []
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args):
+        with self._lock:
+            self.moves.append(args[1:3])  # (monitor_id, zone_name)
+
+    def pending(self, key):
+        return None
+
+
+@pytest.fixture
+def zone_manager(desktop):
+    zm = ZoneManager(CONFIG_DIR, config_manager=ReplayConfigManager(CONFIG_DIR))
+    zm.dispatcher = RecordingDispatcher()
+    return zm
+
+
+@pytest.fixture
+def fast_thread_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def check_snapshot(geometry):
+    """Every derived view must come from the snapshot's own layout selection"""
+    for mon_id, compiled in geometry.active_compiled.items():
+        assert compiled.layout_name == geometry.layout_for_monitor(mon_id)
+        assert geometry.monitors[mon_id] is compiled.zones
+        assert [z['name'] for z in geometry.zone_lists[mon_id]] == list(compiled.zones)
+    assert geometry.global_ring.items == tuple(
+        (mon_id, zone_name)
+        for mon_id in sorted(geometry.active_compiled)
+        for zone_name in geometry.active_compiled[mon_id].ring.items
+    )
+    assert set(geometry.zone_numbers) == set(geometry.global_ring.items)
+
+
+def run_concurrently(switcher, readers):
+    """Run switcher() alongside reader(done) threads until it finishes; re-raise the first failure"""
+    done = threading.Event()
+    errors = []
+
+    def guarded(fn, *args):
+        try:
+            fn(*args)
+        except BaseException as e:  # surface assertion failures from worker threads
+            errors.append(e)
+            done.set()
+
+    def switch_then_stop():
+        guarded(switcher)
+        done.set()
+
+    threads = [threading.Thread(target=switch_then_stop)]
+    threads += [threading.Thread(target=guarded, args=(reader, done)) for reader in readers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    if errors:
+        raise errors[0]
+
+
+def test_switches_racing_readers_see_consistent_snapshots(zone_manager, desktop, fast_thread_switching):
+    zm = zone_manager
+    layouts = list(zm.layouts)
+    mon_ids = [mon['id'] for mon in desktop.monitors]
+    points = [(mon['x'] + mon['width'] * fx // 8, mon['y'] + mon['height'] * fy // 8)
+              for mon in desktop.monitors for fx in (1, 3, 5, 7) for fy in (1, 5)]
+
+    # Every answer a single layout can give for each point / first cycle step per monitor
+    compiled = zm.geometry.compiled_layouts
+
+    def hit_in(name, x, y):
+        mon_id = zm.get_monitor_at_point(x, y)
+        zone_name = compiled[(name, mon_id)].hit_index.lookup(x, y)
+        return (mon_id, zone_name) if zone_name is not None else None
+
+    valid_hits = {(x, y): {hit_in(name, x, y) for name in layouts} for x, y in points}
+    valid_cycles = {mon_id: {(mon_id, compiled[(name, mon_id)].ring.items[1]) for name in layouts}
+                    for mon_id in mon_ids}
+
+    generations = {}
+
+    def switcher():
+        for i in range(SWITCHES):
+            if i % 5 == 4:
+                zm.switch_layout(layouts[i % len(layouts)])
+            else:
+                zm.switch_layout_for_monitor(mon_ids[i % len(mon_ids)], layouts[(i // 2) % len(layouts)])
+
+    def hover_reader(done):
+        last = -1
+        seen = set()
+        while not done.is_set():
+            geometry = zm.geometry
+            assert geometry.generation >= last
+            last = geometry.generation
+            seen.add(last)
+            check_snapshot(geometry)
+            for x, y in points:
+                hit = zm.get_zone_at_point(x, y)
+                assert hit in valid_hits[(x, y)]
+        generations['hover'] = seen
+
+    def cycle_reader(done):
+        while not done.is_set():
+            for hwnd in desktop.app_windows:
+                desktop.foreground = hwnd
+                zm.cycle_zone('next')
+
+    run_concurrently(switcher, [hover_reader, hover_reader, cycle_reader])
+
+    assert zm.geometry.generation == SWITCHES
+    assert len(generations['hover']) > 1, "readers never overlapped the switches"
+    moves = zm.dispatcher.moves
+    assert moves
+    for mon_id, zone_name in moves:
+        assert (mon_id, zone_name) in valid_cycles[mon_id]
+
+
+def test_layout_switch_shares_the_compiled_table(zone_manager, desktop):
+    zm = zone_manager
+    before = zm.geometry
+    layouts = list(zm.layouts)
+    mon_id = desktop.monitors[1]['id']
+
+    zm.switch_layout_for_monitor(mon_id, layouts[1])
+    zm.switch_layout(layouts[2])
+    after = zm.geometry
+
+    for name in ('compiled_layouts', 'layout_index', 'monitors_by_id', 'detected_monitors', 'monitor_index'):
+        assert getattr(after, name) is getattr(before, name), name
+    check_snapshot(after)
+
+    # Same selection built from scratch gives the same views
+    fresh = type(after)(after.generation, after.detected_monitors, after.monitor_index,
+                        dict(after.compiled_layouts), after.layout_order, after.active_layout,
+                        dict(after.per_monitor_layouts))
+    assert dict(fresh.active_compiled) == dict(after.active_compiled)
+    assert dict(fresh.zone_numbers) == dict(after.zone_numbers)
+    assert after.layout_for_monitor(mon_id) == layouts[1]
+    assert after.layout_for_monitor(desktop.monitors[0]['id']) == layouts[2]
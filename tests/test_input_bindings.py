@@ -0,0 +1,54 @@
+# tests/test_input_bindings.py
+"""Snap-key binding table compiled from a geometry snapshot"""
+
+from core import input_bindings
+from core.input_bindings import compile_snap_bindings
+from core.keycodes import parse_key_to_vk
+
+
+class Geometry:
+    """Just the parts of GeometrySnapshot the compiler reads"""
+
+    def __init__(self, monitors):
+        self.monitors = monitors
+        self.detected_monitors = [{'id': mon_id, 'is_primary': mon_id == 0} for mon_id in monitors]
+
+
+def vk(name):
+    return parse_key_to_vk(name)[0]
+
+
+def test_zone_keys_map_to_candidates_in_monitor_order():
+    geometry = Geometry({
+        0: {'left': {'key': 'Q'}, 'right': {'key': 'W'}},
+        1: {'left': {'key': 'q'}, 'right': {'key': 'W'}},
+    })
+    bindings = compile_snap_bindings(geometry, {0: '`', 1: '1'}, 'primary')
+
+    assert bindings.zone_keys[vk('Q')] == ((0, 'left', 'Q'), (1, 'left', 'Q'))
+    assert bindings.zone_keys[vk('W')] == ((0, 'right', 'W'), (1, 'right', 'W'))
+    assert bindings.fallback_monitor == 0
+    # '1' selects a monitor, so it is not a zone-number key
+    assert vk('1') not in bindings.number_keys and bindings.number_keys[vk('2')] == 2
+
+
+def test_zones_without_a_key_are_unbound(monkeypatch):
+    parsed = []
+
+    def recording_parse(key_str):
+        parsed.append(key_str)
+        return parse_key_to_vk(key_str)
+    monkeypatch.setattr(input_bindings, 'parse_key_to_vk', recording_parse)
+
+    geometry = Geometry({0: {
+        'none': {'key': None},
+        'empty': {'key': ''},
+        'missing': {},
+        'unknown': {'key': 'NOT_A_KEY'},
+        'bound': {'key': ' E '},
+    }})
+    bindings = compile_snap_bindings(geometry, {}, 'context_aware')
+
+    assert bindings.zone_keys == {vk('E'): ((0, 'bound', 'E'),)}
+    # A null key is skipped, not looked up as the key name "None"
+    assert parsed == ['NOT_A_KEY', 'E']
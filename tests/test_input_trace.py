@@ -0,0 +1,87 @@
+# tests/test_input_trace.py
+"""Input trace files - write_input_trace / read_input_trace round trip"""
+
+import pytest
+
+from core.input_events import BUTTON_DOWN, BUTTON_UP, KEY_DOWN, KEY_UP, MOVE, SCROLL, InputEvent
+from core.input_trace import HEADER, MAX_DELTA_US, RECORD, InputTraceRecorder, read_input_trace, write_input_trace
+
+EVENTS = [
+    (0, InputEvent(MOVE, 10, 20)),
+    (1_500, InputEvent(BUTTON_DOWN, 10, 20, button='left')),
+    (9_000, InputEvent(MOVE, -1920, 1079)),  # monitor left of the primary
+    (12_000, InputEvent(KEY_DOWN, -1920, 1079, vk=0xA0)),
+    (12_000, InputEvent(KEY_UP, -1920, 1079, vk=0xA0)),  # same timestamp
+    (20_000, InputEvent(SCROLL, 5, 6, dy=-3)),
+    (21_000, InputEvent(BUTTON_UP, 5, 6, button='right')),
+    (30_000, InputEvent(BUTTON_DOWN, 7, 8, button='middle')),
+]
+
+
+def fields(event):
+    return (event.kind, event.x, event.y, event.button, event.vk, event.dy)
+
+
+def roundtrip(tmp_path, events):
+    path = str(tmp_path / 'input.czit')
+    assert write_input_trace(path, events) == len(events)
+    return path, list(read_input_trace(path))
+
+
+def test_every_event_kind_round_trips(tmp_path):
+    _, read = roundtrip(tmp_path, EVENTS)
+    assert [(t, fields(e)) for t, e in read] == [(t, fields(e)) for t, e in EVENTS]
+    assert (tmp_path / 'input.czit').stat().st_size == HEADER.size + len(EVENTS) * RECORD.size
+
+
+def test_long_idle_gap_is_clamped(tmp_path):
+    gap = MAX_DELTA_US + 5_000_000
+    events = [(0, InputEvent(MOVE, 1, 1)), (gap, InputEvent(MOVE, 2, 2)), (gap + 250, InputEvent(MOVE, 3, 3))]
+    _, read = roundtrip(tmp_path, events)
+
+    # The gap shrinks to the largest delta a record holds; later deltas are unaffected
+    assert [t for t, _ in read] == [0, MAX_DELTA_US, MAX_DELTA_US + 250]
+    assert [e.x for _, e in read] == [1, 2, 3]
+
+
+def test_out_of_range_scroll_is_clamped(tmp_path):
+    _, read = roundtrip(tmp_path, [(0, InputEvent(SCROLL, dy=100_000)), (1, InputEvent(SCROLL, dy=-100_000))])
+    assert [e.dy for _, e in read] == [32767, -32768]
+
+
+def test_truncated_file_ends_at_the_last_whole_record(tmp_path):
+    path, _ = roundtrip(tmp_path, EVENTS)
+    with open(path, 'r+b') as f:
+        f.truncate(HEADER.size + 3 * RECORD.size + RECORD.size // 2)
+
+    read = list(read_input_trace(path))
+    assert [(t, fields(e)) for t, e in read] == [(t, fields(e)) for t, e in EVENTS[:3]]
+
+
+def test_bad_header_is_rejected(tmp_path):
+    short = tmp_path / 'short.czit'
+    short.write_bytes(b'CZ')
+    foreign = tmp_path / 'foreign.czit'
+    foreign.write_bytes(b'NOPE' + bytes(HEADER.size - 4))
+
+    for path in (short, foreign):
+        with pytest.raises(ValueError):
+            list(read_input_trace(str(path)))
+
+
+def test_recorder_stamps_keys_with_the_cursor(tmp_path):
+    path = str(tmp_path / 'recorded.czit')
+    now = [0]
+    recorder = InputTraceRecorder(path, clock=lambda: now[0])
+    assert recorder.open()
+    for delta_ns, event in ((1_000, InputEvent(MOVE, 40, 50)), (2_500, InputEvent(KEY_DOWN, vk=0x31)),
+                            (999, InputEvent(KEY_UP, vk=0x31))):
+        now[0] += delta_ns
+        recorder.record(event)
+    recorder.close()
+
+    read = list(read_input_trace(path))
+    # Sub-microsecond remainders carry over instead of being dropped per event
+    assert [t for t, _ in read] == [1, 3, 4]
+    assert [(e.kind, e.x, e.y, e.vk) for _, e in read] == [
+        (MOVE, 40, 50, None), (KEY_DOWN, 40, 50, 0x31), (KEY_UP, 40, 50, 0x31)]
@@ -0,0 +1,36 @@
+# tests/test_latency.py
+"""Bucket layout of LatencyHistogram"""
+
+from core.latency import LatencyHistogram
+
+
+def bucket_of(us):
+    hist = LatencyHistogram()
+    hist.record(us)
+    return next(iter(hist.buckets))
+
+
+def test_exact_below_16us():
+    assert [bucket_of(us) for us in range(16)] == list(range(16))
+    assert all(LatencyHistogram._upper_bound(idx) == idx for idx in range(16))
+
+
+def test_eight_buckets_per_power_of_two_above():
+    assert bucket_of(16) == bucket_of(17) != bucket_of(18)
+    for power in range(4, 24):
+        lo = 1 << power
+        assert len({bucket_of(us) for us in range(lo, 2 * lo, max(1, lo // 64))}) == 8
+
+    for us in list(range(16, 5000)) + [10 ** 6, 10 ** 7 + 3]:
+        upper = LatencyHistogram._upper_bound(bucket_of(us))
+        assert us <= upper < us + max(1, us // 8)
+
+
+def test_percentile_is_bucket_upper_bound_capped_at_max():
+    hist = LatencyHistogram()
+    for us in (3, 12, 100, 1000):
+        hist.record(us)
+    assert hist.percentile(25) == 3
+    assert hist.percentile(50) == 12
+    assert 100 <= hist.percentile(75) < 100 + 100 // 8
+    assert hist.percentile(100) == 1000
@@ -0,0 +1,69 @@
+# tests/test_scheduling.py
+"""DeadlineScheduler re-arming and thread use"""
+
+import threading
+import time
+
+from core.scheduling import DeadlineScheduler, get_scheduler
+from core.window_state_tracker import WindowStateTracker
+
+HWND = 0x1234
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_rearming_keeps_one_thread_and_fires_last_callback():
+    scheduler = DeadlineScheduler()
+    fired = []
+    scheduler.schedule(('operation_exempt', HWND), 0.1, lambda: fired.append('first'))
+    threads = threading.active_count()
+
+    for i in range(5000):
+        scheduler.schedule(('operation_exempt', HWND), 0.1, lambda i=i: fired.append(i))
+        assert threading.active_count() == threads
+
+    assert scheduler.pending() == 1
+    assert wait_for(lambda: fired)
+    time.sleep(0.15)
+    assert fired == [4999]
+    assert scheduler.pending() == 0
+    assert len(scheduler._heap) <= 64 + 2  # stale slots are compacted while re-arming
+
+
+def test_keys_fire_in_deadline_order_and_cancel():
+    scheduler = DeadlineScheduler()
+    fired = []
+    scheduler.schedule('late', 0.08, lambda: fired.append('late'))
+    scheduler.schedule('early', 0.02, lambda: fired.append('early'))
+    scheduler.schedule('cancelled', 0.04, lambda: fired.append('cancelled'))
+    assert scheduler.cancel('cancelled')
+
+    assert wait_for(lambda: len(fired) == 2)
+    time.sleep(0.05)
+    assert fired == ['early', 'late']
+
+
+def test_hotkey_repeat_rearms_operation_exemption(dispatcher):
+    tracker = WindowStateTracker()
+    tracker.operation_exempt_delay = 0.1
+    tracker.mark_operation_in_progress(HWND)
+    tracker.unmark_operation_in_progress(HWND)
+    threads = threading.active_count()
+
+    for _ in range(2000):
+        tracker.mark_operation_in_progress(HWND)
+        tracker.unmark_operation_in_progress(HWND)
+    assert threading.active_count() == threads
+    assert get_scheduler().is_pending(('operation_exempt', HWND))
+
+    assert wait_for(lambda: dispatcher.queue_depth() == 1)
+    time.sleep(0.15)
+    assert dispatcher.submitted == 1
+    assert list(dispatcher.queue) == [('operation_exempt', HWND)]
+    dispatcher.drain()
+    assert HWND not in tracker.operation_exempt_hwnds
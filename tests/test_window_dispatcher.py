@@ -0,0 +1,128 @@
+# tests/test_window_dispatcher.py
+"""WindowOpDispatcher: keyed coalescing, pending(), inline submits and stats"""
+
+import threading
+import time
+
+import pytest
+
+from core.window_dispatcher import WindowOpDispatcher
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = WindowOpDispatcher()
+    yield dispatcher
+    dispatcher.stop()
+
+
+def park(dispatcher, key=('hold', 0)):
+    """Block the dispatcher thread in a command so later submits queue up. Set the returned event to release it."""
+    holding, gate = threading.Event(), threading.Event()
+
+    def hold(*args):
+        holding.set()
+        gate.wait()
+
+    dispatcher.submit(key, hold, 'held')
+    assert holding.wait(5)
+    return gate
+
+
+def settle(dispatcher):
+    """Wait until everything submitted so far has run"""
+    done = threading.Event()
+    dispatcher.submit(None, done.set)
+    assert done.wait(5)
+
+
+def test_queued_key_is_superseded(dispatcher):
+    ran = []
+    gate = park(dispatcher)
+    dispatcher.submit(('move', 1), ran.append, 'first')
+    dispatcher.submit(('move', 2), ran.append, 'other')
+    dispatcher.submit(('move', 1), ran.append, 'last')
+    assert dispatcher.queue_depth() == 2
+    assert dispatcher.pending(('move', 1)) == ('last',)
+
+    gate.set()
+    settle(dispatcher)
+    # The replacement goes to the back of the queue; the superseded command never runs
+    assert ran == ['other', 'last']
+    assert dispatcher.coalesced == 1
+    assert dispatcher.pending(('move', 1)) is None
+
+
+def test_anonymous_commands_never_coalesce(dispatcher):
+    ran = []
+    gate = park(dispatcher)
+    for i in range(3):
+        dispatcher.submit(None, ran.append, i)
+    assert dispatcher.queue_depth() == 3
+
+    gate.set()
+    settle(dispatcher)
+    assert ran == [0, 1, 2]
+    assert dispatcher.coalesced == 0
+
+
+def test_pending_reports_the_running_command(dispatcher):
+    gate = park(dispatcher, ('restore', 7))
+    assert dispatcher.pending(('restore', 7)) == ('held',)
+    assert dispatcher.queue_depth() == 0
+
+    gate.set()
+    settle(dispatcher)
+    assert dispatcher.pending(('restore', 7)) is None
+
+
+def test_submit_from_the_dispatcher_thread_runs_inline(dispatcher):
+    ran = []
+
+    def outer():
+        ran.append('outer')
+        dispatcher.submit(('move', 1), inner)
+        ran.append('outer done')
+
+    def inner():
+        ran.append(('inner', threading.current_thread().name))
+
+    dispatcher.submit(('cycle', 1), outer)
+    settle(dispatcher)
+    assert ran == ['outer', ('inner', dispatcher.name), 'outer done']
+    assert dispatcher.get_stats()['latency']['move']['count'] == 1
+
+
+def test_stats_time_queue_wait_per_kind(dispatcher):
+    gate = park(dispatcher)
+    dispatcher.submit(('move', 1), lambda: None)
+    dispatcher.submit(('move', 2), lambda: None)
+    dispatcher.submit(('save', 1), lambda: None)
+    assert dispatcher.get_stats()['queue_depth'] == 3
+    time.sleep(0.05)
+    gate.set()
+    settle(dispatcher)
+
+    stats = dispatcher.get_stats()
+    assert stats['queue_depth'] == 0
+    assert stats['max_depth'] >= 3
+    assert stats['executed'] >= 4  # hold, two moves, save (settle's own count may still be landing)
+    latency = stats['latency']
+    assert latency['move']['count'] == 2 and latency['save']['count'] == 1
+    # Latency counts from submit, so the time spent queued behind the held command is in it
+    assert latency['move']['max_ms'] >= 50
+    assert latency['move']['avg_ms'] <= latency['move']['max_ms']
+
+
+def test_stop_drops_queued_commands(dispatcher):
+    ran = []
+    gate = park(dispatcher)
+    dispatcher.submit(('move', 1), ran.append, 1)
+    dispatcher.stop()
+    assert dispatcher.queue_depth() == 0
+
+    gate.set()
+    dispatcher.submit(('move', 2), ran.append, 2)
+    time.sleep(0.05)
+    assert ran == []
+    assert dispatcher.queue_depth() == 0
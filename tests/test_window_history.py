@@ -0,0 +1,105 @@
+# tests/test_window_history.py
+"""WindowHistory ring buffer - undo/redo semantics and fixed per-window memory"""
+
+import tracemalloc
+
+import pytest
+
+from core.window_history import WindowHistory
+
+A = (0, 0, 800, 600)
+B = (960, 0, 960, 1032)
+C = (0, 0, 960, 1032)
+
+
+def test_undo_redo_walks_back_and_forth():
+    history = WindowHistory(8)
+    history.record(A)  # before snapping to B
+    history.record(B)  # before snapping to C
+
+    assert history.undo(C) == B
+    assert history.undo(B) == A
+    assert history.undo(A) is None
+    assert history.redo() == B
+    assert history.redo() == C
+    assert history.redo() is None
+
+
+def test_record_drops_redo_branch():
+    history = WindowHistory(8)
+    history.record(A)
+    assert history.undo(B) == A
+    history.record(A)  # snapped somewhere else instead of redoing
+    assert history.redo() is None
+
+
+def test_full_ring_keeps_newest_entries():
+    history = WindowHistory(4)
+    rects = [(i, i, 100, 100) for i in range(10)]
+    for rect in rects:
+        history.record(rect)
+    current = (99, 99, 100, 100)
+    undone = []
+    while (rect := history.undo(current)) is not None:
+        undone.append(rect)
+        current = rect
+    assert undone == rects[-3:][::-1]  # one slot holds the geometry redo returns to
+    assert len(history) == 4
+
+
+def test_smallest_depth_still_undoes():
+    history = WindowHistory(2)
+    history.record(A)
+    assert history.undo(B) == A
+    assert history.redo() == B
+
+
+@pytest.mark.parametrize('depth', [0, 1])
+def test_depth_below_two_is_rejected(depth):
+    with pytest.raises(ValueError):
+        WindowHistory(depth)
+
+
+def footprint_per_window(build, windows):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / windows
+
+
+def test_memory_at_full_depth_for_thousands_of_windows():
+    windows, depth = 2000, 32
+
+    def rect(i, j):
+        return (i + j * 7, j * 13 + 1000, 800 + j * 3, 600 + i % 97)
+
+    def ring_histories():
+        histories = []
+        for i in range(windows):
+            history = WindowHistory(depth)
+            for j in range(depth + 8):  # wrapped at least once
+                history.record(rect(i, j))
+            histories.append(history)
+        return histories
+
+    def list_histories():
+        # The list-of-tuples history the ring replaces
+        histories = []
+        for i in range(windows):
+            history = []
+            for j in range(depth + 8):
+                history.append(rect(i, j))
+                if len(history) > depth:
+                    history.pop(0)
+            histories.append(history)
+        return histories
+
+    ring = footprint_per_window(ring_histories, windows)
+    listed = footprint_per_window(list_histories, windows)
+    print(f"\n{windows} windows at depth {depth}: ring {ring:.0f} B/window, list {listed:.0f} B/window")
+
+    assert ring <= depth * 4 * 4 + 256  # the packed ints plus a small fixed overhead
+    assert ring * 5 < listed
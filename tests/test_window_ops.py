@@ -0,0 +1,124 @@
+# tests/test_window_ops.py
+"""WindowMoveTransaction batching against the recording backend"""
+
+import threading
+
+import pytest
+
+from core import window_ops
+from core.window_dispatcher import WindowOpDispatcher
+from core.window_ops import (
+    SWP_NOMOVE, SWP_SHOWWINDOW, RecordingWindowBackend, WindowMoveTransaction, window_move_transaction,
+)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = RecordingWindowBackend()
+    monkeypatch.setattr(window_ops, '_backend', backend)
+    return backend
+
+
+def kinds(backend):
+    return [call[0] for call in backend.calls]
+
+
+def test_multi_window_commit_is_one_batch(backend):
+    with window_move_transaction() as txn:
+        txn.move(1, 0, 0, 100, 100)
+        txn.move(2, 100, 0, 100, 100)
+        txn.move(3, 200, 0, 100, 100)
+        txn.move(1, 10, 10, 50, 50)  # last move of a window wins
+        assert backend.calls == []
+
+    assert kinds(backend) == ['begin', 'defer', 'defer', 'defer', 'end']
+    assert backend.calls[0] == ('begin', 3)
+    assert backend.rects == {1: (10, 10, 50, 50), 2: (100, 0, 100, 100), 3: (200, 0, 100, 100)}
+
+
+def test_nested_transactions_join_the_outermost(backend):
+    committed = []
+    with window_move_transaction() as outer:
+        with window_move_transaction() as inner:
+            assert inner is outer
+            inner.move(1, 0, 0, 100, 100)
+            inner.after_commit(lambda: committed.append(backend.rects.get(1)))
+        # Leaving the inner block does not commit
+        assert backend.calls == [] and committed == []
+        outer.move(2, 0, 0, 10, 10)
+
+    assert kinds(backend) == ['begin', 'defer', 'defer', 'end']
+    assert committed == [(0, 0, 100, 100)]
+
+    # The transaction is closed: the next block starts its own batch
+    with window_move_transaction() as txn:
+        assert txn is not outer
+        txn.move(3, 0, 0, 1, 1)
+    assert kinds(backend)[-3:] == ['begin', 'defer', 'end']
+
+
+def test_transactions_are_per_thread(backend):
+    seen = {}
+    with window_move_transaction() as outer:
+        def other():
+            with window_move_transaction() as txn:
+                seen['txn'] = txn
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+    assert seen['txn'] is not outer
+
+
+def test_end_defer_failure_falls_back_to_per_window_moves():
+    backend = RecordingWindowBackend(fail_end_defer=True)
+    txn = WindowMoveTransaction(backend)
+    txn.move(1, 0, 0, 100, 100)
+    txn.move(2, 5, 5, 0, 0, SWP_SHOWWINDOW | SWP_NOMOVE)
+    after = []
+    txn.after_commit(lambda: after.append(dict(backend.rects)))
+
+    assert txn.commit() == 2
+    assert kinds(backend) == ['begin', 'defer', 'defer', 'end', 'set', 'set']
+    assert backend.rects == {1: (0, 0, 100, 100), 2: (0, 0, 0, 0)}
+    assert after == [backend.rects]
+
+
+def test_defer_failure_falls_back_and_keeps_going():
+    backend = RecordingWindowBackend(failing_hwnds={2})
+    txn = WindowMoveTransaction(backend)
+    for hwnd in (1, 2, 3):
+        txn.move(hwnd, hwnd * 100, 0, 100, 100)
+
+    assert txn.commit() == 3
+    assert [call[1] for call in backend.calls if call[0] == 'set'] == [1, 2, 3]
+    assert set(backend.rects) == {1, 2, 3}
+
+
+def test_dispatcher_drain_commits_once(backend):
+    dispatcher = WindowOpDispatcher()
+    holding, gate = threading.Event(), threading.Event()
+
+    def hold():
+        holding.set()
+        gate.wait()
+
+    def move(hwnd):
+        with window_move_transaction() as txn:
+            txn.move(hwnd, hwnd, 0, 10, 10)
+
+    # Park the dispatcher so the rest queue up and run as one drain
+    dispatcher.submit(('hold', 0), hold)
+    assert holding.wait(5)
+    for hwnd in (1, 2, 3):
+        dispatcher.submit(('restore', hwnd), move, hwnd)
+    read_back = []
+    dispatcher.submit(('save', 2), lambda: read_back.append(backend.rects.get(2)))
+    done = threading.Event()
+    dispatcher.submit(None, done.set)
+    gate.set()
+    assert done.wait(5)
+    dispatcher.stop()
+
+    # Moves of different windows share a batch; a command on a moved window sees it applied
+    assert kinds(backend) == ['begin', 'defer', 'defer', 'defer', 'end']
+    assert read_back == [(2, 0, 10, 10)]
@@ -0,0 +1,132 @@
+# tests/test_window_state_store.py
+"""WindowStateStore LRU/TTL eviction"""
+
+import os
+import random
+from collections import OrderedDict
+
+import pytest
+
+from core import window_state_store
+from core.window_state_store import WindowStateStore
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config')
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(window_state_store.time, 'monotonic', clock.monotonic)
+    return clock
+
+
+def test_lru_eviction_past_max_size():
+    evicted = []
+    store = WindowStateStore('test', max_size=2, on_evict=evicted.append)
+    store[1] = 'a'
+    store[2] = 'b'
+    store.get(1)  # 2 is now least recently used
+    store[3] = 'c'
+    assert evicted == [2]
+    assert store.keys() == [1, 3]
+
+
+def test_matches_an_ordered_dict_lru_under_churn():
+    """Random reads, writes, deletes and evictions against a reference OrderedDict LRU"""
+    rng = random.Random(0)
+    evicted = []
+    store = WindowStateStore('test', max_size=16, on_evict=evicted.append)
+    model = OrderedDict()
+    model_evicted = []
+    for step in range(5000):
+        hwnd = rng.randrange(40)
+        op = rng.random()
+        if op < 0.5:
+            store[hwnd] = step
+            model[hwnd] = step
+            model.move_to_end(hwnd)
+            while len(model) > 16:
+                model_evicted.append(model.popitem(last=False)[0])
+        elif op < 0.8:
+            assert store.get(hwnd) == model.get(hwnd)
+            if hwnd in model:
+                model.move_to_end(hwnd)
+        else:
+            assert store.pop(hwnd) == model.pop(hwnd, None)
+        assert len(store) == len(model)
+
+    assert evicted == model_evicted
+    assert dict(store.items()) == dict(model)
+    # Eviction order from here on is the model's LRU order
+    evicted.clear()
+    store.configure(max_size=0)
+    assert evicted == list(model)
+    # Freed slots are reused: the columns never outgrew the cap plus one insert
+    assert len(store._values) <= 17
+
+
+def test_ttl_expires_untouched_entries(clock):
+    evicted = []
+    store = WindowStateStore('test', ttl=60, on_evict=evicted.append)
+    store[1] = 'a'
+    store[2] = 'b'
+    clock.now += 30
+    store.get(2)
+    clock.now += 45
+    assert store.sweep() == 1
+    assert evicted == [1]
+    assert 2 in store
+
+
+def test_pinned_entries_are_refreshed_not_expired(clock):
+    pinned = {1}
+    store = WindowStateStore('test', ttl=60, is_pinned=lambda hwnd: hwnd in pinned)
+    store[1] = 'snapped'
+    store[2] = 'idle'
+    clock.now += 3 * 86400
+
+    assert store.sweep() == 1
+    assert store.keys() == [1]
+
+    pinned.clear()  # no longer snapped: expires one TTL after the refresh
+    clock.now += 30
+    assert store.sweep() == 0
+    clock.now += 31
+    assert store.sweep() == 1
+    assert len(store) == 0
+
+
+def test_snapped_windows_outlive_ttl(desktop, dispatcher, clock):
+    from core.config_manager import ConfigManager
+    from core.window_state_tracker import WindowStateTracker
+
+    config = ConfigManager(CONFIG_DIR)
+    config.load_all()
+    tracking = dict(config.get_state_tracking_config(), ttl=60, persist=False)
+
+    tracker = WindowStateTracker()
+    tracker.configure(tracking)
+    snapped, restored = desktop.app_windows[:2]
+    for hwnd in (snapped, restored):
+        tracker.save_state(hwnd)
+        tracker.mark_as_snapped(hwnd, (0, 'left'))
+    tracker.restore_state(restored)
+    tracker.save_state(restored)  # saved but no longer snapped
+
+    clock.now += 86400
+    for store in (tracker.window_states, tracker.snapped_windows, tracker.history):
+        store.sweep()
+        store.stop_sweeping()
+
+    assert snapped in tracker.snapped_windows
+    assert snapped in tracker.window_states
+    assert tracker.occupancy.zone_of(snapped) == (0, 'left')
+    assert restored not in tracker.window_states
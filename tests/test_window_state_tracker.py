@@ -0,0 +1,114 @@
+# tests/test_window_state_tracker.py
+"""Event-driven auto-restore in WindowStateTracker"""
+
+import pytest
+
+from core.window_events import EVENT_SYSTEM_MOVESIZEEND, EVENT_SYSTEM_MOVESIZESTART
+from core.window_state_store import SavedWindowState
+from core.window_state_tracker import WindowStateTracker
+
+SWP_NOZORDER = 0x04
+
+
+@pytest.fixture
+def tracker(desktop, dispatcher):
+    tracker = WindowStateTracker()
+    tracker.start_monitoring(desktop.events)
+    yield tracker
+    tracker.close()
+
+
+def snap(desktop, tracker, hwnd, rect):
+    """Save the window's state, move it to rect and mark it snapped, as a zone snap does"""
+    tracker.save_state(hwnd)
+    desktop.set_window_pos(hwnd, 0, *rect, SWP_NOZORDER)
+    tracker.mark_as_snapped(hwnd)
+
+
+def nudge(desktop, hwnd, dx):
+    x, y, w, h = desktop.rects[hwnd]
+    desktop.set_window_pos(hwnd, 0, x + dx, y, w, h, SWP_NOZORDER)
+
+
+def test_moved_snapped_window_is_restored(desktop, dispatcher, tracker):
+    hwnd = desktop.app_windows[0]
+    original = desktop.rects[hwnd]
+    snap(desktop, tracker, hwnd, (0, 0, 960, 1032))
+
+    nudge(desktop, hwnd, 200)
+    dispatcher.drain()
+
+    assert desktop.rects[hwnd] == original
+    assert hwnd not in tracker.snapped_windows
+
+
+def test_moves_inside_move_size_loop_wait_for_its_end(desktop, dispatcher, tracker):
+    hwnd = desktop.app_windows[0]
+    original = desktop.rects[hwnd]
+    snap(desktop, tracker, hwnd, (0, 0, 960, 1032))
+
+    desktop.events.emit(EVENT_SYSTEM_MOVESIZESTART, hwnd)
+    nudge(desktop, hwnd, 200)
+    dispatcher.drain()
+    assert desktop.rects[hwnd] != original
+
+    desktop.events.emit(EVENT_SYSTEM_MOVESIZEEND, hwnd)
+    dispatcher.drain()
+    assert desktop.rects[hwnd] == original
+
+
+def test_move_size_end_after_drag_forgot_window(desktop, dispatcher, tracker):
+    """A drag forgets the snapped window before its MOVESIZEEND arrives; the loop must still close"""
+    hwnd = desktop.app_windows[0]
+    snap(desktop, tracker, hwnd, (0, 0, 960, 1032))
+
+    desktop.events.emit(EVENT_SYSTEM_MOVESIZESTART, hwnd)
+    tracker.forget_snapped(hwnd)  # drag start -> restore_size_only
+    desktop.events.emit(EVENT_SYSTEM_MOVESIZEEND, hwnd)
+    assert hwnd not in tracker.move_size_hwnds
+
+    # Snapped again; a later move outside any move/size loop restores it
+    tracker.save_state(hwnd, force=True)
+    saved = desktop.rects[hwnd]
+    desktop.set_window_pos(hwnd, 0, 960, 0, 960, 1032, SWP_NOZORDER)
+    tracker.mark_as_snapped(hwnd)
+
+    nudge(desktop, hwnd, 200)
+    dispatcher.drain()
+
+    assert desktop.rects[hwnd] == saved
+    assert hwnd not in tracker.snapped_windows
+
+
+def test_state_loaded_from_disk_never_overwrites_a_fresh_save(desktop, dispatcher, tracker):
+    fresh, other = desktop.app_windows[:2]
+    stale = SavedWindowState(1, 2, 300, 200, 0.0)
+
+    # The persistence thread hands over states; nothing touches the store from there
+    tracker._on_state_loaded(fresh, stale)
+    tracker._on_state_loaded(other, stale)
+    assert fresh not in tracker.window_states and other not in tracker.window_states
+
+    # A snap saves the current geometry before the queued load runs
+    tracker.save_state(fresh)
+    dispatcher.drain()
+
+    x, y, w, h = desktop.rects[fresh]
+    state = tracker.window_states[fresh]
+    assert (state.x, state.y, state.width, state.height) == (x, y, w, h)
+    assert tracker.window_states[other] is stale
+
+
+def test_destroyed_snapped_window_is_not_activity(desktop, dispatcher, tracker):
+    gone, kept = desktop.app_windows[:2]
+    snap(desktop, tracker, gone, (100, 50, 860, 1000))
+    snap(desktop, tracker, kept, (1000, 50, 860, 1000))
+    dispatcher.drain()
+
+    # The window disappears between polls: GetWindowRect now fails for it
+    del desktop.windows[gone], desktop.rects[gone]
+    desktop.z_order.remove(gone)
+
+    assert tracker._check_all_snapped() is False
+    assert ('destroyed', gone) in dispatcher.keys
+    assert not any(key[0] == 'restore' for key in dispatcher.keys)